@@ -0,0 +1,70 @@
+"""
+Microbenchmark of the key translation between JSON camelCase keys and snake_case attribute names.
+Every key of a full object model dump is translated, once through the memoized functions of dsf.utils
+and once through the original, uncached implementations.
+
+Run it with asv or directly via `python -m benchmarks.bench_key_translation`
+"""
+import json
+import os
+import timeit
+
+from dsf.utils import camel_to_snake, snake_to_camel
+
+MODEL_FILE = os.path.join(os.path.dirname(__file__), "..", "tests", "object_model", "model_geminiv2.json")
+
+
+def collect_keys(element, keys: list) -> list:
+    """Collect every object key of a JSON element in document order, including duplicates"""
+    if isinstance(element, dict):
+        for key, value in element.items():
+            keys.append(key)
+            collect_keys(value, keys)
+    elif isinstance(element, list):
+        for item in element:
+            collect_keys(item, keys)
+    return keys
+
+
+class KeyTranslation:
+    """Translate all keys of a full object model dump in both directions"""
+
+    def setup(self):
+        with open(MODEL_FILE) as fp:
+            self.json_keys = collect_keys(json.load(fp), [])
+        self.attribute_names = [f"_{camel_to_snake.__wrapped__(key)}" for key in self.json_keys]
+        # Warm up the caches like a long-running connection would
+        self.time_camel_to_snake()
+        self.time_snake_to_camel()
+
+    def time_camel_to_snake_uncached(self):
+        for key in self.json_keys:
+            camel_to_snake.__wrapped__(key)
+
+    def time_camel_to_snake(self):
+        for key in self.json_keys:
+            camel_to_snake(key)
+
+    def time_snake_to_camel_uncached(self):
+        for name in self.attribute_names:
+            snake_to_camel.__wrapped__(name)
+
+    def time_snake_to_camel(self):
+        for name in self.attribute_names:
+            snake_to_camel(name)
+
+
+def main():
+    benchmark = KeyTranslation()
+    benchmark.setup()
+    key_count = len(benchmark.json_keys)
+    print(f"{key_count} keys per full object model dump")
+    for name in ("camel_to_snake", "snake_to_camel"):
+        before = min(timeit.repeat(getattr(benchmark, f"time_{name}_uncached"), number=20, repeat=5)) / 20
+        after = min(timeit.repeat(getattr(benchmark, f"time_{name}"), number=20, repeat=5)) / 20
+        print(f"{name}: {before / key_count * 1e9:8.0f} ns/key before, {after / key_count * 1e9:8.0f} ns/key after"
+              f" ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
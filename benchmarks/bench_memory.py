@@ -0,0 +1,59 @@
+"""
+Memory benchmark of a large object model: 6 boards with a job of 5000 build objects and 10000 layers.
+The retained size of the model is measured with tracemalloc, the peak RSS of building it by asv.
+
+Run it with asv or directly via `python -m benchmarks.bench_memory`
+"""
+import gc
+import json
+import tracemalloc
+
+from dsf.object_model import ObjectModel
+
+from . import traces
+
+BUILD_OBJECT_COUNT = 5000
+LAYER_COUNT = 10000
+
+
+def measure_model_size(model_json: str) -> int:
+    """Get the number of bytes retained by an object model deserialized from the given JSON"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        model = ObjectModel.from_json(model_json)
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del model
+    return size
+
+
+class ModelMemory:
+    """Memory used by the object model of a large job"""
+
+    def setup(self):
+        self.model_json = json.dumps(traces.full_model(BUILD_OBJECT_COUNT, LAYER_COUNT))
+        # Deserialize the model once so that only the model itself is measured and not any caches
+        ObjectModel.from_json(self.model_json)
+
+    def track_model_size(self):
+        return measure_model_size(self.model_json)
+
+    track_model_size.unit = "bytes"
+
+    def peakmem_from_json(self):
+        ObjectModel.from_json(self.model_json)
+
+
+def main():
+    benchmark = ModelMemory()
+    benchmark.setup()
+    print(f"full model with {BUILD_OBJECT_COUNT} build objects and {LAYER_COUNT} layers: "
+          f"{len(benchmark.model_json) / 1024 / 1024:.1f} MiB of JSON")
+    print(f"model size: {benchmark.track_model_size() / 1024 / 1024:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmarks of the object model (de)serialization using the multi-board traces of benchmarks.traces:
+building the model from a full JSON dump, applying the patch stream and serializing the model again.
+
+Run it with asv or directly via `python -m benchmarks.bench_object_model`
+"""
+import json
+import timeit
+
+from dsf.object_model import ObjectModel
+
+from . import traces
+
+PATCH_COUNT = 200
+
+
+class ObjectModelSuite:
+    """(De)serialize the object model of a 6-board machine"""
+
+    def setup(self):
+        model = traces.full_model()
+        self.model_json = json.dumps(model)
+        self.patches_json = [json.dumps(patch) for patch in traces.patch_stream(PATCH_COUNT)]
+        self.model = ObjectModel.from_json(self.model_json)
+        self.subscribed_model = ObjectModel.from_json(self.model_json)
+        self.subscribed_model.subscribe("state.status", lambda path, value: None)
+        self.subscribed_model.subscribe("heat.heaters[*].current", lambda path, value: None)
+
+    def time_from_json(self):
+        ObjectModel.from_json(self.model_json)
+
+    def time_update_from_json(self):
+        for patch in self.patches_json:
+            self.model.update_from_json(patch)
+
+    def time_update_from_json_subscribed(self):
+        for patch in self.patches_json:
+            self.subscribed_model.update_from_json(patch)
+
+    def time_to_json(self):
+        self.model.to_json()
+
+
+def main():
+    benchmark = ObjectModelSuite()
+    benchmark.setup()
+    print(f"full model: {len(benchmark.model_json) / 1024:.0f} KiB, {PATCH_COUNT} patches averaging "
+          f"{sum(len(patch) for patch in benchmark.patches_json) / PATCH_COUNT / 1024:.1f} KiB")
+    for name, number in (("from_json", 10), ("update_from_json", 1), ("update_from_json_subscribed", 1),
+                         ("to_json", 10)):
+        duration = min(timeit.repeat(getattr(benchmark, f"time_{name}"), number=number, repeat=5)) / number
+        if name.startswith("update_from_json"):
+            print(f"{name}: {duration / PATCH_COUNT * 1e6:8.1f} us/patch")
+        else:
+            print(f"{name}: {duration * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark of the receive-and-apply throughput of a SubscribeConnection in Patch mode.
+A mock control server (dsf.testing.MockDcs) on a local UNIX socket sends the full model and the patch stream
+of benchmarks.traces, waiting for the acknowledgement of each update like DCS does.
+
+Run it with asv or directly via `python -m benchmarks.bench_subscribe`
+"""
+import json
+import timeit
+
+from dsf.connections import SubscribeConnection, SubscriptionMode
+from dsf.testing import MockDcs
+
+from . import traces
+
+PATCH_COUNT = 200
+
+
+class SubscribeThroughput:
+    """Receive and apply the patch stream of a 6-board machine"""
+
+    def setup(self):
+        patches = [json.dumps(patch).encode("utf8") for patch in traces.patch_stream(PATCH_COUNT)]
+        self.server = MockDcs(model=json.dumps(traces.full_model()).encode("utf8"), patches=patches).start()
+
+    def teardown(self):
+        self.server.close()
+
+    def time_receive_and_apply(self):
+        connection = SubscribeConnection(SubscriptionMode.PATCH)
+        connection.connect(self.server.socket_file)
+        try:
+            model = connection.get_object_model()
+            for _ in range(PATCH_COUNT):
+                model.update_from_json(connection.get_object_model_patch())
+        finally:
+            connection.close()
+
+    def time_update_object_model(self):
+        connection = SubscribeConnection(SubscriptionMode.PATCH)
+        connection.connect(self.server.socket_file)
+        try:
+            for _ in range(PATCH_COUNT + 1):
+                connection.update_object_model()
+        finally:
+            connection.close()
+
+
+class LargeModelReceive:
+    """Receive the full object model of a job with many build objects and layers"""
+
+    def setup(self):
+        self.model = json.dumps(traces.full_model(5000, 10000)).encode("utf8")
+        self.server = MockDcs(model=self.model).start()
+
+    def teardown(self):
+        self.server.close()
+
+    def receive(self, as_bytes: bool):
+        connection = SubscribeConnection(SubscriptionMode.PATCH)
+        connection.connect(self.server.socket_file)
+        try:
+            return connection.get_serialized_object_model(as_bytes)
+        finally:
+            connection.close()
+
+    def time_receive_bytes(self):
+        self.receive(True)
+
+    def time_receive_str(self):
+        self.receive(False)
+
+
+def main():
+    benchmark = SubscribeThroughput()
+    benchmark.setup()
+    try:
+        for name in ("receive_and_apply", "update_object_model"):
+            duration = min(timeit.repeat(getattr(benchmark, f"time_{name}"), number=1, repeat=5))
+            print(f"{name}: {PATCH_COUNT / duration:8.0f} patches/s ({duration * 1e3:.1f} ms for {PATCH_COUNT}"
+                  " patches including the full model)")
+    finally:
+        benchmark.teardown()
+
+    benchmark = LargeModelReceive()
+    benchmark.setup()
+    try:
+        for name in ("receive_bytes", "receive_str"):
+            duration = min(timeit.repeat(getattr(benchmark, f"time_{name}"), number=5, repeat=5)) / 5
+            print(f"{name}: {len(benchmark.model) / duration / 1024 / 1024:8.0f} MiB/s ({duration * 1e3:.1f} ms for "
+                  f"{len(benchmark.model) / 1024 / 1024:.1f} MiB)")
+    finally:
+        benchmark.teardown()
+
+
+if __name__ == "__main__":
+    main()
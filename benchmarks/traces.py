@@ -0,0 +1,185 @@
+"""
+Object model traces of a large multi-board Duet 3 setup used by the benchmarks.
+
+The full model is derived from the Duet 3 test model in tests/object_model and extended to
+6 boards with 54 drivers, 20 heaters and analog sensors, 9 axes, 8 extruders and tools as well as a
+running job with 250 build objects and 400 layers. The patch stream mimics what DCS sends in Patch
+subscription mode while such a job is printing: heater and sensor readings, move positions, job
+progress, board readings, new layers and cancelled build objects.
+Both are generated deterministically so results of different runs can be compared.
+
+Run `python -m benchmarks.traces <directory>` to write them to files.
+"""
+import copy
+import json
+import os
+import random
+import sys
+from typing import List
+
+MODEL_FILE = os.path.join(os.path.dirname(__file__), "..", "tests", "object_model", "model_geminiv2.json")
+
+BOARD_COUNT = 6
+DRIVERS_PER_BOARD = 9
+HEATER_COUNT = 20
+AXIS_LETTERS = "XYZUVWABC"
+EXTRUDER_COUNT = 8
+BUILD_OBJECT_COUNT = 250
+LAYER_COUNT = 400
+
+
+def full_model(build_object_count: int = BUILD_OBJECT_COUNT, layer_count: int = LAYER_COUNT) -> dict:
+    """
+    Generate the full object model of the machine as deserialized JSON
+    :param build_object_count: Number of items in job.build.objects
+    :param layer_count: Number of items in job.layers
+    """
+    with open(MODEL_FILE) as fp:
+        model = json.load(fp)
+    rnd = random.Random(1)
+
+    main_board = model["boards"][0]
+    boards = []
+    for can_address in range(BOARD_COUNT):
+        board = copy.deepcopy(main_board)
+        board["canAddress"] = 0 if can_address == 0 else 20 + can_address
+        board["drivers"] = [{"closedLoop": None, "status": 131072} for _ in range(DRIVERS_PER_BOARD)]
+        board["mcuTemp"] = {"current": 40 + rnd.random() * 5, "min": 30.5, "max": 48.1}
+        board["vIn"] = {"current": 24.1, "min": 23.8, "max": 24.3}
+        board["uniqueId"] = f"{board['uniqueId'][:-5]}{can_address:05d}"
+        boards.append(board)
+    model["boards"] = boards
+
+    heater = model["heat"]["heaters"][1]
+    heaters = []
+    for index in range(HEATER_COUNT):
+        item = copy.deepcopy(heater)
+        item["current"] = 20 + rnd.random()
+        item["sensor"] = index
+        item["monitors"][0]["sensor"] = index
+        heaters.append(item)
+    model["heat"]["heaters"] = heaters
+    model["heat"]["bedHeaters"] = [0, 1, 2, 3]
+    model["heat"]["chamberHeaters"] = [4, 5, -1, -1]
+
+    sensor = model["sensors"]["analog"][1]
+    model["sensors"]["analog"] = [dict(copy.deepcopy(sensor), lastReading=20 + rnd.random(), port=f"temp{index}")
+                                  for index in range(HEATER_COUNT)]
+
+    axis = model["move"]["axes"][0]
+    axes = []
+    for index, letter in enumerate(AXIS_LETTERS):
+        item = copy.deepcopy(axis)
+        item["letter"] = letter
+        item["drivers"] = [f"{index // 2 + 1}.{index % 2}", f"{index // 2 + 1}.{index % 2 + 2}"]
+        item["homed"] = True
+        axes.append(item)
+    model["move"]["axes"] = axes
+
+    extruder = model["move"]["extruders"][0]
+    model["move"]["extruders"] = [dict(copy.deepcopy(extruder), driver=f"{index % 5 + 1}.{index // 5 + 6}")
+                                  for index in range(EXTRUDER_COUNT)]
+
+    tool = model["tools"][0]
+    tools = []
+    for index in range(EXTRUDER_COUNT):
+        item = copy.deepcopy(tool)
+        item["number"] = index
+        item["name"] = f"Tool {index}"
+        item["extruders"] = [index]
+        item["heaters"] = [6 + index]
+        item["active"] = [200]
+        item["standby"] = [150]
+        tools.append(item)
+    model["tools"] = tools
+
+    job = model["job"]
+    job["build"] = {
+        "currentObject": 0,
+        "m486Names": True,
+        "m486Numbers": True,
+        "objects": [{"cancelled": False, "name": f"part_{index}.stl",
+                     "x": [10 + index % 25 * 12, 20 + index % 25 * 12],
+                     "y": [10 + index // 25 * 12, 20 + index // 25 * 12]} for index in range(build_object_count)],
+    }
+    job["file"].update({
+        "filament": [12345.6] * EXTRUDER_COUNT,
+        "fileName": "0:/gcodes/plate_of_parts.gcode",
+        "generatedBy": "PrusaSlicer 2.6.1+linux-x64-GTK3",
+        "height": layer_count * 0.2 + 0.1,
+        "lastModified": "2023-12-20T10:11:12",
+        "layerHeight": 0.2,
+        "numLayers": layer_count * 2,
+        "printTime": 123456,
+        "size": 987654321,
+    })
+    job["layers"] = [layer_item(index, rnd) for index in range(layer_count)]
+    job["layer"] = layer_count
+    job["filePosition"] = 123456789
+    job["duration"] = 45678
+    model["state"]["status"] = "processing"
+    return model
+
+
+def layer_item(index: int, rnd: random.Random) -> dict:
+    """Generate a job.layers item"""
+    return {
+        "duration": 60 + rnd.random() * 60,
+        "filament": [rnd.random() * 100 for _ in range(EXTRUDER_COUNT)],
+        "fractionPrinted": index / (LAYER_COUNT * 2),
+        "height": 0.3 + index * 0.2,
+        "temperatures": [60 + rnd.random() for _ in range(HEATER_COUNT)],
+    }
+
+
+def patch_stream(count: int = 1000) -> List[dict]:
+    """Generate a stream of object model patches as deserialized JSON"""
+    rnd = random.Random(2)
+    patches = []
+    file_position = 123456789
+    layer_count = LAYER_COUNT
+    for index in range(count):
+        file_position += rnd.randint(200, 5000)
+        # Heater and sensor readings change in nearly every update
+        patch = {
+            "heat": {"heaters": [{"current": round(200 + rnd.random() * 2, 2), "avgPwm": round(rnd.random(), 3)}
+                                 for _ in range(HEATER_COUNT)]},
+            "sensors": {"analog": [{"lastReading": round(200 + rnd.random() * 2, 2)} for _ in range(HEATER_COUNT)]},
+            "move": {
+                "axes": [{"machinePosition": round(rnd.random() * 300, 3), "userPosition": round(rnd.random() * 300, 3)}
+                         for _ in AXIS_LETTERS],
+                "currentMove": {"acceleration": 3000, "deceleration": 3000,
+                                "requestedSpeed": rnd.choice([60, 120, 200]), "topSpeed": round(rnd.random() * 200, 1)},
+                "extruders": [{"position": round(rnd.random() * 1e5, 1)} for _ in range(EXTRUDER_COUNT)],
+            },
+            "job": {"filePosition": file_position, "duration": 45678 + index},
+        }
+        if index % 5 == 0:
+            patch["boards"] = [{"mcuTemp": {"current": round(40 + rnd.random() * 5, 1)},
+                                "vIn": {"current": round(24 + rnd.random() / 10, 1)}} for _ in range(BOARD_COUNT)]
+            patch["job"]["timesLeft"] = {"filament": 5000 - index, "file": 5100 - index, "slicer": 5200 - index}
+        if index % 50 == 0:
+            # New layer: DCS sends the whole list with empty objects for items that did not change
+            patch["job"]["layers"] = [{} for _ in range(layer_count)] + [layer_item(layer_count, rnd)]
+            patch["job"]["layer"] = layer_count + 1
+            layer_count += 1
+        if index % 200 == 100:
+            objects = [{} for _ in range(BUILD_OBJECT_COUNT)]
+            objects[rnd.randrange(BUILD_OBJECT_COUNT)] = {"cancelled": True}
+            patch["job"]["build"] = {"currentObject": rnd.randrange(BUILD_OBJECT_COUNT), "objects": objects}
+        patches.append(patch)
+    return patches
+
+
+def main(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "full_model.json"), "w") as fp:
+        json.dump(full_model(), fp)
+    with open(os.path.join(directory, "patches.jsonl"), "w") as fp:
+        for patch in patch_stream():
+            fp.write(json.dumps(patch, separators=(",", ":")))
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else ".")
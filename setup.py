@@ -36,6 +36,9 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     python_requires=">=3.7, <4",
     extras_require={
+        "orjson": [
+            "orjson",
+        ],
         "dev": [
             "sphinx",
             "tox",
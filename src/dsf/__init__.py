@@ -4,6 +4,9 @@ SOCKET_FILE = "/run/dsf/dcs.sock"
 # allowed connection per unix server
 DEFAULT_BACKLOG = 4
 
+# maximum number of pipelined commands awaiting their response
+DEFAULT_PIPELINE_WINDOW = 32
+
 # DSF protocol version
 PROTOCOL_VERSION = 12
 
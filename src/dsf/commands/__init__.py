@@ -1,2 +1,2 @@
-from . import base_command, code, code_interception, code_channel, code_parameter, files, generic,\
-    http_endpoints, model_subscription, object_model, packages, plugins, responses, user_sessions
+from . import base_command, code, code_interception, code_channel, code_parameter, code_parser, files, \
+    generic, http_endpoints, model_subscription, object_model, packages, plugins, responses, user_sessions
@@ -1,6 +1,5 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from .base_command import BaseCommand
 from .code_channel import CodeChannel
 from .code_flags import CodeFlags
 from .code_parameter import CodeParameter
@@ -9,8 +8,25 @@ from .condition_type import KeywordType
 from ..object_model.messages import Message
 
 
-class Code(BaseCommand):
-    """A parsed representation of a generic G/M/T-code"""
+# Attributes of a code sent to and received from the control server
+_CODE_ATTRIBUTES = frozenset((
+    "sourceConnection", "result", "type", "channel", "lineNumber", "indent", "keyword", "keywordArgument",
+    "majorNumber", "minorNumber", "flags", "comment", "filePosition", "length", "parameters",
+))
+
+
+class Code:
+    """
+    A parsed representation of a generic G/M/T-code.
+    Codes are created in large numbers when files are streamed or codes are intercepted, so unlike the other
+    commands they keep their attributes in slots and are serialized by to_dict()
+    """
+
+    __slots__ = (
+        "command", "sourceConnection", "result", "type", "channel", "lineNumber", "indent", "keyword",
+        "keywordArgument", "majorNumber", "minorNumber", "flags", "comment", "filePosition", "length", "parameters",
+        "_extra", "_parameter_index", "_indexed_parameters",
+    )
 
     @classmethod
     def from_json(cls, data):
@@ -21,7 +37,10 @@ class Code(BaseCommand):
             data["channel"] = CodeChannel(data["channel"])
         return cls(**data)
 
-    def __init__(self, **kwargs):
+    def __init__(self, command: str = "Code", **kwargs):
+        # Name of the command
+        self.command = command
+
         # The connection ID this code was received from. If this is 0, the code originates from an internal DCS task
         # Usually there is no need to populate this property.
         # It is internally overwritten by the control server on receipt
@@ -38,7 +57,7 @@ class Code(BaseCommand):
         self.channel = CodeChannel.DEFAULT_CHANNEL
 
         # Line number of this code
-        self.lineNumber = None
+        self.lineNumber: Optional[int] = None
 
         # Number of whitespaces prefixing the command content
         self.indent = 0
@@ -47,45 +66,106 @@ class Code(BaseCommand):
         self.keyword = KeywordType.KeywordNone
 
         # Argument of the conditional G-code (if any)
-        self.keywordArgument = None
+        self.keywordArgument: Optional[str] = None
 
         # Major code number (e.g. 28 in G28)
-        self.majorNumber = None
+        self.majorNumber: Optional[int] = None
 
         # Minor code number (e.g. 3 in G54.3)
-        self.minorNumber = None
+        self.minorNumber: Optional[int] = None
 
         # Flags of this code
-        self.flags = CodeFlags.CodeFlagsNone
+        self.flags: int = CodeFlags.CodeFlagsNone
 
         # Comment of the G/M/T-code. May be null if no comment is present
         # The parser combines different comment segments and concatenates them as a single value.
         # So for example a code like 'G28 (Do homing) ; via G28'
         # causes the Comment field to be filled with 'Do homing via G28'
-        self.comment = None
+        self.comment: Optional[str] = None
 
         # File position of this code in bytes (optional)
-        self.filePosition = None
+        self.filePosition: Optional[int] = None
 
         # Length of the original code in bytes (optional)
-        self.length = None
+        self.length: Optional[int] = None
 
         # List of parsed code parameters
         self.parameters: List[CodeParameter] = []
 
-        super().__init__(**kwargs)
+        # Properties unknown to this version (e.g. sent by a newer control server), they are sent back unchanged
+        self._extra: Optional[dict] = None
+
+        # Index of the parameters by upper-case letter, built on the first lookup (see parameter()),
+        # and the parameters and letters it was built from
+        self._parameter_index: Optional[Dict[str, CodeParameter]] = None
+        self._indexed_parameters: Tuple[Tuple[CodeParameter, str], ...] = ()
+
+        for key, value in kwargs.items():
+            if key in _CODE_ATTRIBUTES:
+                setattr(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+
+    def to_dict(self) -> dict:
+        """Convert this code to the dictionary that is sent to the control server"""
+        data = {
+            "command": self.command,
+            "sourceConnection": self.sourceConnection,
+            "result": self.result,
+            "type": self.type,
+            "channel": self.channel,
+            "lineNumber": self.lineNumber,
+            "indent": self.indent,
+            "keyword": self.keyword,
+            "keywordArgument": self.keywordArgument,
+            "majorNumber": self.majorNumber,
+            "minorNumber": self.minorNumber,
+            "flags": self.flags,
+            "comment": self.comment,
+            "filePosition": self.filePosition,
+            "length": self.length,
+            "parameters": [param.to_dict() for param in self.parameters],
+        }
+        if self._extra:
+            data.update(self._extra)
+        return data
 
     @property
     def is_from_file_channel(self) -> bool:
         """Check if this code is from a file channel"""
         return self.channel is CodeChannel.File or self.channel is CodeChannel.File2
 
+    def _index_parameters(self) -> Dict[str, CodeParameter]:
+        """
+        Get the index of the parameters by upper-case letter. It is rebuilt whenever the parameters or their
+        letters have changed, including in-place changes of the parameter list
+        """
+        parameters = self.parameters
+        index = self._parameter_index
+        indexed = self._indexed_parameters
+        if index is not None and len(indexed) == len(parameters):
+            for (indexed_param, letter), param in zip(indexed, parameters):
+                if indexed_param is not param or param.letter != letter:
+                    break
+            else:
+                return index
+
+        index = {}
+        for param in parameters:
+            # Like before the first parameter with a given letter wins
+            index.setdefault(param.letter.upper(), param)
+        self._parameter_index = index
+        self._indexed_parameters = tuple((param, param.letter) for param in parameters)
+        return index
+
     def parameter(self, letter: str, default=None):
         """Retrieve the parameter whose letter equals c or generate a default parameter"""
         letter = letter.upper()
-        param = [param for param in self.parameters if param.letter.upper() == letter]
-        if len(param) > 0:
-            return param[0]
+        param = self._index_parameters().get(letter)
+        if param is not None:
+            return param
         if default is not None:
             return CodeParameter.simple_param(letter, default)
         return None
@@ -135,13 +215,14 @@ class Code(BaseCommand):
             return "(comment)"
 
         prefix = "G53 " if self.flags & CodeFlags.EnforceAbsolutePosition != 0 else ""
+        code_type = self.type.value if isinstance(self.type, CodeType) else self.type
         if self.majorNumber is not None:
             if self.minorNumber is not None:
-                return f"{prefix}{self.type}{self.majorNumber}.{self.minorNumber}"
+                return f"{prefix}{code_type}{self.majorNumber}.{self.minorNumber}"
 
-            return f"{prefix}{self.type}{self.majorNumber}"
+            return f"{prefix}{code_type}{self.majorNumber}"
 
-        return f"{prefix}{self.type}"
+        return f"{prefix}{code_type}"
 
     def keyword_to_str(self):
         """Convert the keyword to a string"""
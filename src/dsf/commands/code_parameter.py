@@ -1,24 +1,19 @@
 """
 codeparameter contains all classes and methods dealing with deserialized code parameters.
 """
-import json
-
 from ..exceptions import CodeParserException
 from ..object_model.move.driver_id import DriverId
 
+# Marks a value that has not been parsed yet
+_UNPARSED = object()
+
 
-class CodeParameter(json.JSONEncoder):
+class CodeParameter:
     """Represents a parsed parameter of a G/M/T-code"""
 
-    LETTER_FOR_UNPRECEDENTED_STRING = "@"
+    __slots__ = ("letter", "string_value", "is_string", "is_driver_id", "is_expression", "__parsed_value")
 
-    def default(self, o):
-        return {
-            "letter": o.letter,
-            "value": o.value,
-            "isString": isinstance(o.value, str),
-            "isDriverId": o.is_driver_id,
-        }
+    LETTER_FOR_UNPRECEDENTED_STRING = "@"
 
     @classmethod
     def from_json(cls, data):
@@ -32,14 +27,16 @@ class CodeParameter(json.JSONEncoder):
 
     def __init__(self, letter: str, value, isString: bool = None, isDriverId: bool = None):
         """
-        Creates a new CodeParameter instance and parses value to a native data type
-        if applicable
+        Creates a new CodeParameter instance. Received values are only parsed to a native data type
+        once the value is accessed, so parameters that are never looked at cost no conversion
         """
 
-        # This is the simple path to create a CodeParameter
-        if isString is None and isDriverId is None:
+        # This is the simple path to create a CodeParameter from a native value
+        if isString is None and isDriverId is None or not isinstance(value, str):
             self.letter = letter
             self.string_value = str(value)
+            self.is_string = isinstance(value, str)
+            self.is_driver_id = bool(isDriverId)
             self.__parsed_value = value
             self.is_expression = self.string_value.startswith("{") and self.string_value.endswith("}")
             return
@@ -47,39 +44,63 @@ class CodeParameter(json.JSONEncoder):
         self.letter = letter
         self.string_value = value
         self.is_string = isString
-        self.is_expression = False
         self.is_driver_id = isDriverId if isDriverId is not None else False
         if self.is_string:
+            self.is_expression = False
             self.__parsed_value = value
             return
-        elif self.is_driver_id:
+
+        stripped = value.strip()
+        self.is_expression = stripped.startswith("{") and stripped.endswith("}")
+        self.__parsed_value = _UNPARSED
+
+    @property
+    def _parsed_value(self):
+        """Native value of this parameter, parsed from the string value on first access"""
+        value = self.__parsed_value
+        if value is _UNPARSED:
+            value = self.__parsed_value = self._parse()
+        return value
+
+    def _parse(self):
+        """Parse the received string value to a native data type if applicable"""
+        if self.is_driver_id:
             drivers = [DriverId(as_str=value) for value in self.string_value.split(":")]
-            self.__parsed_value = drivers[0] if len(drivers) == 1 else drivers
+            return drivers[0] if len(drivers) == 1 else drivers
 
-        value = value.strip()
+        value = self.string_value.strip()
         # Empty parameters are represented as integers with the value 0 (e.g. G92 XY => G92 X0 Y0)
         if not value:
-            self.__parsed_value = 0
-        elif value.startswith("{") and value.endswith("}"):  # It is an expression
-            self.is_expression = True
-            self.__parsed_value = value
-        elif ":" in value:  # It is an array (or a string)
+            return 0
+        if self.is_expression:
+            return value
+        if ":" in value:  # It is an array (or a string)
             split = value.split(":")
             try:
                 if "." in value:  # If there is a dot anywhere, attempt to parse it as a float array
-                    self.__parsed_value = list(map(float, split))
-                else:  # If there is no dot, it could be an integer array
-                    self.__parsed_value = list(map(int, split))
-            except:  # noqa
-                self.__parsed_value = value
-        else:
+                    return list(map(float, split))
+                # If there is no dot, it could be an integer array
+                return list(map(int, split))
+            except ValueError:
+                return value
+        if "." not in value and "e" not in value and "E" not in value:
             try:
-                self.__parsed_value = int(value)
-            except:  # noqa
-                try:
-                    self.__parsed_value = float(value)
-                except:  # noqa
-                    self.__parsed_value = value
+                return int(value)
+            except ValueError:
+                pass
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    def to_dict(self) -> dict:
+        """Convert this parameter to the dictionary that is sent to the control server"""
+        return {
+            "letter": self.letter,
+            "value": self.string_value,
+            "isString": self.is_string,
+            "isDriverId": self.is_driver_id,
+        }
 
     def convert_driver_ids(self):
         """Convert this parameter to driver id(s)"""
@@ -113,28 +134,28 @@ class CodeParameter(json.JSONEncoder):
 
     def as_float(self):
         """Conversion to float"""
-        if isinstance(self.__parsed_value, float):
-            return self.__parsed_value
-        if isinstance(self.__parsed_value, int):
-            return float(self.__parsed_value)
+        if isinstance(self._parsed_value, float):
+            return self._parsed_value
+        if isinstance(self._parsed_value, int):
+            return float(self._parsed_value)
 
         raise Exception(f"Cannot convert {self.letter} parameter to float (value {self.string_value})")
 
     def as_int(self):
         """Conversion to int"""
-        if isinstance(self.__parsed_value, int):
-            return self.__parsed_value
-        if isinstance(self.__parsed_value, DriverId):
-            return self.__parsed_value.as_int()
+        if isinstance(self._parsed_value, int):
+            return self._parsed_value
+        if isinstance(self._parsed_value, DriverId):
+            return self._parsed_value.as_int()
 
         raise Exception(f"Cannot convert {self.letter} parameter to int (value {self.string_value})")
 
     def as_driver_id(self):
-        if isinstance(self.__parsed_value, DriverId):
-            return self.__parsed_value
-        if isinstance(self.__parsed_value, int):
+        if isinstance(self._parsed_value, DriverId):
+            return self._parsed_value
+        if isinstance(self._parsed_value, int):
             try:
-                return DriverId(as_int=self.__parsed_value)
+                return DriverId(as_int=self._parsed_value)
             except:  # noqa
                 pass
         raise Exception(f"Cannot convert {self.letter} parameter to DriverId (value {self.string_value})")
@@ -142,12 +163,12 @@ class CodeParameter(json.JSONEncoder):
     def as_float_array(self):
         """Conversion to float array"""
         try:
-            if isinstance(self.__parsed_value, list):
-                return list(map(float, self.__parsed_value))
-            if isinstance(self.__parsed_value, float):
-                return [self.__parsed_value]
-            if isinstance(self.__parsed_value, int):
-                return [float(self.__parsed_value)]
+            if isinstance(self._parsed_value, list):
+                return list(map(float, self._parsed_value))
+            if isinstance(self._parsed_value, float):
+                return [self._parsed_value]
+            if isinstance(self._parsed_value, int):
+                return [float(self._parsed_value)]
         except:  # noqa
             pass
         raise Exception(f"Cannot convert {self.letter} parameter to float array (value {self.string_value})")
@@ -155,29 +176,29 @@ class CodeParameter(json.JSONEncoder):
     def as_int_array(self):
         """Conversion to int array"""
         try:
-            if isinstance(self.__parsed_value, list):
-                if isinstance(self.__parsed_value[0], DriverId):
-                    return [d.as_int() for d in self.__parsed_value]
-                return list(map(int, self.__parsed_value))
-            if isinstance(self.__parsed_value, int):
-                return [self.__parsed_value]
-            if isinstance(self.__parsed_value, DriverId):
-                return [self.__parsed_value.as_int()]
+            if isinstance(self._parsed_value, list):
+                if isinstance(self._parsed_value[0], DriverId):
+                    return [d.as_int() for d in self._parsed_value]
+                return list(map(int, self._parsed_value))
+            if isinstance(self._parsed_value, int):
+                return [self._parsed_value]
+            if isinstance(self._parsed_value, DriverId):
+                return [self._parsed_value.as_int()]
         except:  # noqa
             pass
         raise Exception(f"Cannot convert {self.letter} parameter to float array (value {self.string_value})")
 
     def as_driver_id_array(self):
         try:
-            if isinstance(self.__parsed_value, list):
-                if isinstance(self.__parsed_value[0], DriverId):
-                    return self.__parsed_value
-                if isinstance(self.__parsed_value[0], int):
-                    return list(map(DriverId, self.__parsed_value))
-            if isinstance(self.__parsed_value, DriverId):
-                return [self.__parsed_value]
-            if isinstance(self.__parsed_value, int):
-                return [DriverId(as_int=self.__parsed_value)]
+            if isinstance(self._parsed_value, list):
+                if isinstance(self._parsed_value[0], DriverId):
+                    return self._parsed_value
+                if isinstance(self._parsed_value[0], int):
+                    return list(map(DriverId, self._parsed_value))
+            if isinstance(self._parsed_value, DriverId):
+                return [self._parsed_value]
+            if isinstance(self._parsed_value, int):
+                return [DriverId(as_int=self._parsed_value)]
         except:  # noqa
             pass
         raise Exception(f"Cannot convert {self.letter} parameter to DriverId array (value {self.string_value})")
@@ -193,8 +214,8 @@ class CodeParameter(json.JSONEncoder):
         if self is None:
             return other is None
         if isinstance(other, CodeParameter):
-            return self.letter == other.letter and self.__parsed_value == other.__parsed_value
-        return self.__parsed_value == other
+            return self.letter == other.letter and self._parsed_value == other._parsed_value
+        return self._parsed_value == other
 
     def __ne__(self, other):
         return not self == other
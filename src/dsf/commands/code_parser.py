@@ -0,0 +1,398 @@
+"""
+code_parser contains a streaming parser that turns G/M/T-codes in text form into Code objects
+without involving the control server, e.g. to analyse or transform job files offline.
+"""
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Union
+
+from .code import Code
+from .code_channel import CodeChannel
+from .code_flags import CodeFlags
+from .code_parameter import CodeParameter
+from .code_type import CodeType
+from .condition_type import KeywordType
+from ..exceptions import CodeParserException
+
+_KEYWORDS = {
+    "if": KeywordType.If,
+    "elif": KeywordType.ElseIf,
+    "else": KeywordType.Else,
+    "while": KeywordType.While,
+    "break": KeywordType.Break,
+    "continue": KeywordType.Continue,
+    "abort": KeywordType.Abort,
+    "var": KeywordType.Var,
+    "set": KeywordType.Set,
+    "echo": KeywordType.Echo,
+    "global": KeywordType.Global,
+}
+
+_CODE_TYPES = {"G": CodeType.GCode, "M": CodeType.MCode, "T": CodeType.TCode}
+
+# M-codes whose argument may be an unquoted string without parameter letter (e.g. M32 file.g or M117 Hello)
+_UNPRECEDENTED_STRING_CODES = frozenset((23, 28, 30, 32, 36, 117))
+
+# Characters of numeric values, parameters without whitespace in between (e.g. X10Y20) are split at other letters
+_NUMERIC_CHARACTERS = frozenset("0123456789.+-:")
+
+# Default maximum length of a line (in bytes) to keep the memory usage bounded
+DEFAULT_MAX_LINE_LENGTH = 64 * 1024
+
+
+def _find_comment_start(text: str) -> int:
+    """Get the index of the ';' starting a comment outside of quotes or the length of the text"""
+    in_quotes = False
+    for index, char in enumerate(text):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ";" and not in_quotes:
+            return index
+    return len(text)
+
+
+class CodeParser:
+    """
+    Streaming G/M/T-code parser producing Code objects like the control server does.
+    Input is processed line by line, so the memory usage only depends on the length of the longest line.
+    It supports comments in parentheses and after semicolons, quoted strings (with "" escaping quotes),
+    expressions in braces, meta G-code keywords, line numbers (N), checksums (*) and multiple codes per line.
+    File positions and lengths are counted in bytes, line numbers start at 1 unless a line has an N number.
+
+    Constructor arguments:
+    :param channel: Code channel assigned to the parsed codes
+    :param file_position: Byte offset of the first line to parse
+    :param line_number: Number of lines preceding the first line to parse
+    :param max_line_length: Maximum length of a line (in bytes) before a CodeParserException is raised
+    """
+
+    def __init__(
+        self,
+        channel: CodeChannel = CodeChannel.File,
+        file_position: int = 0,
+        line_number: int = 0,
+        max_line_length: int = DEFAULT_MAX_LINE_LENGTH,
+    ):
+        self.channel = channel
+        self.file_position = file_position
+        self.line_number = line_number
+        self.max_line_length = max_line_length
+
+    def parse_stream(self, stream: Union[BinaryIO, TextIO]) -> Iterator[Code]:
+        """
+        Parse all codes from a binary or text stream
+        :param stream: Stream to read from, binary streams give exact file positions for non-ASCII content
+        :raises CodeParserException: if a code or line is invalid
+        """
+        while True:
+            line = stream.readline(self.max_line_length + 1)
+            if not line:
+                return
+            if len(line) > self.max_line_length and line[-1:] not in ("\n", b"\n"):
+                raise CodeParserException(f"Line {self.line_number + 1} exceeds {self.max_line_length} bytes")
+            yield from self.parse_line(line)
+
+    def parse_line(self, line: Union[bytes, str]) -> List[Code]:
+        """
+        Parse the codes of a single line and advance the file position and line number
+        :param line: Line including its line terminator (if any)
+        :raises CodeParserException: if a code is invalid
+        """
+        if isinstance(line, (bytes, bytearray)):
+            size = len(line)
+            line = line.decode("utf8", errors="replace")
+        else:
+            size = len(line) if line.isascii() else len(line.encode("utf8"))
+        line_start = self.file_position
+        self.file_position += size
+        self.line_number += 1
+        return _LineParser(self, line, line_start, size).parse()
+
+
+class _LineParser:
+    """State of the parser while processing one line"""
+
+    def __init__(self, parser: CodeParser, line: str, line_start: int, size: int):
+        self.parser = parser
+        self.line = line.rstrip("\r\n")
+        self.line_start = line_start
+        self.size = size
+        self.is_ascii = line.isascii()
+        self.codes: List[Code] = []
+        # Byte offsets of the codes in the line
+        self.offsets: List[int] = []
+        self.line_number: Optional[int] = None
+        self.indent = 0
+
+    def error(self, message: str) -> CodeParserException:
+        return CodeParserException(f"{message} in line {self.parser.line_number}")
+
+    def byte_offset(self, index: int) -> int:
+        return index if self.is_ascii else len(self.line[:index].encode("utf8"))
+
+    def new_code(self, index: int, **kwargs) -> Code:
+        code = Code(channel=self.parser.channel, indent=self.indent, **kwargs)
+        self.codes.append(code)
+        self.offsets.append(0 if not self.offsets else self.byte_offset(index))
+        return code
+
+    def parse(self) -> List[Code]:
+        line = self.line
+        length = len(line)
+        index = 0
+        while index < length and line[index] in " \t":
+            index += 1
+        self.indent = index
+        if index == length:
+            return []
+
+        if not self.parse_keyword(index):
+            self.parse_codes(index)
+        return self.finish()
+
+    def parse_keyword(self, index: int) -> bool:
+        """Parse a meta G-code keyword, returns False if the line does not start with one"""
+        line = self.line
+        end = index
+        while end < len(line) and line[end].isalpha():
+            end += 1
+        keyword = _KEYWORDS.get(line[index:end].lower())
+        if keyword is None or (end < len(line) and line[end] not in ' \t({;"'):
+            return False
+
+        rest = line[end:]
+        comment_start = _find_comment_start(rest)
+        argument = rest[:comment_start].strip()
+        code = self.new_code(index, type=CodeType.Keyword, keyword=keyword, keywordArgument=argument or None)
+        if comment_start < len(rest):
+            code.comment = rest[comment_start + 1:]
+        return True
+
+    def parse_codes(self, index: int):
+        line = self.line
+        length = len(line)
+        code: Optional[Code] = None
+        comment: List[str] = []
+        while index < length:
+            char = line[index]
+            if char in " \t":
+                index += 1
+            elif char == ";":
+                comment.append(line[index + 1:])
+                break
+            elif char == "(":
+                end = line.find(")", index + 1)
+                if end < 0:
+                    end = length
+                comment.append(line[index + 1:end])
+                index = end + 1
+            elif char == "*" and code is not None:
+                # Checksum of the line
+                index += 1
+                while index < length and line[index].isdigit():
+                    index += 1
+            elif char in "Nn" and code is None and index + 1 < length and line[index + 1].isdigit():
+                start = index + 1
+                index = start
+                while index < length and line[index].isdigit():
+                    index += 1
+                self.line_number = int(line[start:index])
+            elif code is None or (char in "GgMm" and index + 1 < length and line[index + 1].isdigit()):
+                code_type = _CODE_TYPES.get(char.upper())
+                if code_type is None:
+                    if code is None and char == '"':
+                        raise self.error("Unexpected string without code")
+                    raise self.error(f"Unexpected character '{char}'")
+                if code is not None:
+                    self.finish_comment(code, comment)
+                    comment = []
+                # Comments preceding the first code are assigned to it
+                code = self.new_code(index, type=code_type)
+                index = self.parse_code_number(code, index + 1)
+                if code.type == CodeType.MCode and code.majorNumber in _UNPRECEDENTED_STRING_CODES:
+                    index = self.parse_unprecedented_string(code, index)
+            elif char == '"':
+                value, index = self.parse_string(index)
+                code.parameters.append(
+                    CodeParameter(CodeParameter.LETTER_FOR_UNPRECEDENTED_STRING, value, isString=True, isDriverId=False)
+                )
+            elif char.isalpha():
+                index = self.parse_parameter(code, char.upper(), index + 1)
+            else:
+                raise self.error(f"Unexpected character '{char}'")
+
+        if code is None:
+            if comment:
+                # Whole-line comment
+                code = self.new_code(self.indent, type=CodeType.Comment)
+                self.finish_comment(code, comment)
+        else:
+            self.finish_comment(code, comment)
+
+    @staticmethod
+    def finish_comment(code: Code, comment: List[str]):
+        if comment:
+            code.comment = "".join(comment) if code.comment is None else code.comment + "".join(comment)
+
+    def parse_code_number(self, code: Code, index: int) -> int:
+        """Parse the major and minor number of a code"""
+        line = self.line
+        start = index
+        if code.type == CodeType.TCode and line[index:index + 1] == "-" and line[index + 1:index + 2].isdigit():
+            # T-1 deselects the current tool
+            index += 1
+        while index < len(line) and line[index].isdigit():
+            index += 1
+        if index == start:
+            if code.type != CodeType.TCode:
+                raise self.error(f"Missing number of {code.type.value} code")
+            if index < len(line) and line[index] in "{":
+                # T{expression} selects the tool returned by the expression
+                return self.parse_parameter(code, "T", index)
+            return index
+        code.majorNumber = int(line[start:index])
+
+        if index + 1 < len(line) and line[index] == "." and line[index + 1].isdigit():
+            start = index = index + 1
+            while index < len(line) and line[index].isdigit():
+                index += 1
+            code.minorNumber = int(line[start:index])
+        return index
+
+    def parse_unprecedented_string(self, code: Code, index: int) -> int:
+        """Parse the argument of a code like M32 file.g or M117 Hello world that may lack a parameter letter"""
+        line = self.line
+        rest = line[index:]
+        stripped = rest.lstrip(" \t")
+        if not stripped or stripped[0] in ';("':
+            # Nothing or a quoted string follows, e.g. M32 "file.g"
+            return index
+        if len(stripped) > 1 and stripped[0].isalpha() and stripped[1] in '"{':
+            # Regular parameters follow, e.g. M117 S"Hello"
+            return index
+        comment_start = _find_comment_start(rest)
+        value = rest[:comment_start].strip()
+        code.parameters.append(
+            CodeParameter(CodeParameter.LETTER_FOR_UNPRECEDENTED_STRING, value, isString=True, isDriverId=False)
+        )
+        return index + comment_start
+
+    def parse_string(self, index: int):
+        """Parse a quoted string starting at the given index, returns the unescaped value and the next index"""
+        line = self.line
+        parts = []
+        index += 1
+        while True:
+            end = line.find('"', index)
+            if end < 0:
+                raise self.error("Unterminated string")
+            parts.append(line[index:end])
+            if end + 1 < len(line) and line[end + 1] == '"':
+                # Escaped quote
+                parts.append('"')
+                index = end + 2
+            else:
+                return "".join(parts), end + 1
+
+    def parse_expression(self, index: int) -> int:
+        """Find the end of an expression in braces starting at the given index"""
+        line = self.line
+        depth = 0
+        in_quotes = False
+        while index < len(line):
+            char = line[index]
+            if char == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                if char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+                    if depth == 0:
+                        return index + 1
+            index += 1
+        raise self.error("Unterminated expression")
+
+    def parse_parameter(self, code: Code, letter: str, index: int) -> int:
+        """Parse the value of a parameter following its letter"""
+        line = self.line
+        length = len(line)
+        if index < length and line[index] == '"':
+            value, end = self.parse_string(index)
+            if end >= length or line[end] in " \t;(":
+                code.parameters.append(CodeParameter(letter, value, isString=True, isDriverId=False))
+                return end
+            # The string is part of an expression, e.g. P"0:/macros/"^{var.name}
+
+        start = index
+        numeric = True
+        while index < length:
+            char = line[index]
+            if char == "{":
+                index = self.parse_expression(index)
+                numeric = False
+                continue
+            if char == '"':
+                index = self.parse_string(index)[1]
+                numeric = False
+                continue
+            if char in " \t;(":
+                break
+            if char not in _NUMERIC_CHARACTERS:
+                if numeric and char.isalpha():
+                    # Next parameter without whitespace in between, e.g. G1X10Y20 or G92 XY
+                    break
+                numeric = False
+            index += 1
+        code.parameters.append(CodeParameter(letter, line[start:index], isString=False, isDriverId=False))
+        return index
+
+    def finish(self) -> List[Code]:
+        codes = self.codes
+        if not codes:
+            return codes
+
+        # G53 applies absolute positioning to the code following it on the same line
+        index = 0
+        while index < len(codes) - 1:
+            code = codes[index]
+            if code.type == CodeType.GCode and code.majorNumber == 53 and code.minorNumber is None \
+                    and not code.parameters:
+                codes[index + 1].flags |= CodeFlags.EnforceAbsolutePosition
+                if code.comment is not None:
+                    codes[index + 1].comment = code.comment + (codes[index + 1].comment or "")
+                del codes[index]
+                del self.offsets[index + 1]
+            else:
+                index += 1
+
+        line_number = self.line_number if self.line_number is not None else self.parser.line_number
+        offsets = self.offsets + [self.size]
+        for index, code in enumerate(codes):
+            code.lineNumber = line_number
+            code.filePosition = self.line_start + offsets[index]
+            code.length = offsets[index + 1] - offsets[index]
+        codes[-1].flags |= CodeFlags.IsLastCode
+        return codes
+
+
+def parse_file(path: str, channel: CodeChannel = CodeChannel.File,
+               max_line_length: int = DEFAULT_MAX_LINE_LENGTH) -> Iterator[Code]:
+    """
+    Parse the codes of a G-code file one after another
+    :param path: Path of the file
+    :param channel: Code channel assigned to the parsed codes
+    :param max_line_length: Maximum length of a line (in bytes)
+    :raises CodeParserException: if a code is invalid
+    """
+    with open(path, "rb") as stream:
+        yield from CodeParser(channel, max_line_length=max_line_length).parse_stream(stream)
+
+
+def parse_codes(text: str, channel: CodeChannel = CodeChannel.DEFAULT_CHANNEL) -> List[Code]:
+    """
+    Parse all codes of the given text
+    :param text: One or more lines of codes
+    :param channel: Code channel assigned to the parsed codes
+    :raises CodeParserException: if a code is invalid
+    """
+    parser = CodeParser(channel)
+    return [code for line in text.splitlines(keepends=True) for code in parser.parse_line(line)]
@@ -44,9 +44,20 @@ class SubscriptionMode(str, Enum):
     PATCH = "Patch"
 
 
+from .async_base_command_connection import AsyncBaseCommandConnection
+from .async_base_connection import AsyncBaseConnection
+from .async_command_connection import AsyncCommandConnection
+from .async_intercept_connection import AsyncInterceptConnection
+from .async_subscribe_connection import AsyncSubscribeConnection
 from .base_command_connection import BaseCommandConnection
 from .base_connection import BaseConnection
+from .code_dispatcher import AsyncCodeDispatcher, CodeDispatcher, CodeOutcome
+from .code_stream import CodeStreamReport
 from .command_connection import CommandConnection
+from .command_pipeline import CommandFuture, CommandPipeline
+from .connection_metrics import ConnectionMetrics, LatencyHistogram
+from .connection_pool import AsyncConnectionPool, ConnectionPool, PoolMetrics
 from .exceptions import InternalServerException, TaskCanceledException
 from .intercept_connection import InterceptConnection
+from .json_framer import JsonFramer
 from .subscribe_connection import SubscribeConnection
@@ -0,0 +1,209 @@
+import asyncio
+from collections import deque
+from time import perf_counter
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from .base_connection import check_init_response, decode_server_init_message, encode_message, \
+    process_command_response
+from .connection_metrics import ConnectionMetrics, ReceiveTimer
+from .init_messages import client_init_messages
+from .json_framer import JsonFramer
+from .. import DEFAULT_PIPELINE_WINDOW
+from ..commands import responses
+from ..utility import json_codec
+
+
+class AsyncBaseConnection:
+    """
+    Base class for asyncio connections that access the control server via the Duet API
+    using a UNIX socket. Framing and JSON handling are shared with BaseConnection
+    """
+
+    # Maximum number of bytes to read from the socket at once
+    RECV_BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, debug: bool = False, timeout: int = 3):
+        self.debug = debug
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.id: Optional[int] = None
+        self._framer = JsonFramer()
+        self._lock: Optional[asyncio.Lock] = None
+        # Optional instrumentation, see enable_metrics()
+        self.metrics: Optional[ConnectionMetrics] = None
+
+    async def connect(self, init_message: client_init_messages.ClientInitMessage, socket_file: str):
+        """Establishes a connection to the given UNIX socket file"""
+        self.reader, self.writer = await asyncio.open_unix_connection(socket_file)
+        self._framer.clear()
+        # Commands may be performed from different tasks, make sure their requests and responses do not interleave
+        self._lock = asyncio.Lock()
+
+        server_init_msg = decode_server_init_message(await self.receive_json())
+        self.id = server_init_msg.id
+        await self.send(init_message)
+        check_init_response(init_message, await self.receive_response())
+
+    async def close(self):
+        """Closes the current connection and disposes it"""
+        if self.writer is not None:
+            writer = self.writer
+            self.reader = None
+            self.writer = None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, BrokenPipeError):
+                pass
+        self._framer.clear()
+
+    def enable_metrics(self, metrics: Optional[ConnectionMetrics] = None) -> ConnectionMetrics:
+        """
+        Start recording latencies, traffic and parse times of this connection
+        :param metrics: Metrics instance to record into, e.g. to share it between connections
+        :returns: Metrics of this connection, call snapshot() to read them
+        """
+        self.metrics = metrics if metrics is not None else ConnectionMetrics()
+        return self.metrics
+
+    def _command_lock(self) -> asyncio.Lock:
+        """Get the lock that serializes the commands of this connection"""
+        if self._lock is None:
+            raise RuntimeError("Connection is not established, call connect() first")
+        return self._lock
+
+    async def perform_command(self, command, cls=None):
+        """Perform an arbitrary command"""
+        async with self._command_lock():
+            started = None if self.metrics is None else perf_counter()
+            await self.send(command)
+            response = await self.receive_response()
+            if started is not None:
+                self.metrics.record_command(command, perf_counter() - started)
+        return process_command_response(command, response, cls)
+
+    async def perform_commands(self, commands: Iterable, window: int = DEFAULT_PIPELINE_WINDOW) -> List:
+        """
+        Perform several commands in a pipeline without waiting for the response of each command
+        :param commands: Commands to perform
+        :param window: Maximum number of commands awaiting their response
+        :returns: List of the responses in the order of the commands. If the server reported an
+        error for a command, the corresponding item is the exception instead
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+
+        results = []
+        pending: Deque[Tuple[object, Optional[float]]] = deque()
+
+        async def receive_next():
+            response = await self.receive_response()
+            command, started = pending.popleft()
+            if started is not None:
+                self.metrics.record_command(command, perf_counter() - started)
+            try:
+                results.append(process_command_response(command, response))
+            except Exception as e:
+                results.append(e)
+
+        async with self._command_lock():
+            for command in commands:
+                while len(pending) >= window:
+                    await receive_next()
+                started = None if self.metrics is None else perf_counter()
+                await self.send(command)
+                pending.append((command, started))
+            while pending:
+                await receive_next()
+        return results
+
+    async def send(self, msg):
+        """Serialize an arbitrary object into JSON and send it to the server"""
+        if self.writer is None:
+            raise RuntimeError("socket is closed or missing")
+
+        json_bytes = encode_message(msg)
+        if self.debug:
+            print(f"send: {json_bytes.decode('utf8')}")
+        self.writer.write(json_bytes)
+        await self.writer.drain()
+        if self.metrics is not None:
+            self.metrics.record_sent(len(json_bytes))
+
+    async def receive(self, cls):
+        """Receive a deserialized object from the server"""
+        return cls.from_json(await self.receive_data())
+
+    async def receive_response(self):
+        """Receive a base response from the server"""
+        return responses.decode_response(await self.receive_data())
+
+    async def receive_data(self):
+        """Receive the next JSON message from the server and deserialize it
+        The message is parsed straight from the receive buffer without decoding it into a string first"""
+        with await self._receive_view() as view:
+            if self.metrics is None:
+                return json_codec.loads(view)
+            started = perf_counter()
+            data = json_codec.loads(view)
+        self.metrics.record_parse(perf_counter() - started)
+        return data
+
+    def poll_data(self):
+        """
+        Deserialize the next JSON message if it has already been read from the stream, without waiting for more data
+        :returns: Deserialized message or None if no complete message is available
+        """
+        timer = None if self.metrics is None else ReceiveTimer(self.metrics)
+        json_object = self._framer.next_view()
+        if json_object is None:
+            return None
+
+        if timer is not None:
+            timer.finish(json_object.nbytes)
+        if self.debug:
+            print("recv:", str(json_object, "utf8"))
+        with json_object:
+            return json_codec.loads(json_object)
+
+    async def receive_json(self) -> str:
+        """Receive the JSON response from the server"""
+        with await self._receive_view() as view:
+            if self.metrics is None:
+                return str(view, "utf8")
+            started = perf_counter()
+            json_string = str(view, "utf8")
+        self.metrics.record_parse(perf_counter() - started)
+        return json_string
+
+    async def receive_json_bytes(self) -> bytes:
+        """Receive the UTF-8 encoded JSON response from the server"""
+        with await self._receive_view() as view:
+            return view.tobytes()
+
+    async def _receive_view(self) -> memoryview:
+        """Receive the next JSON message as view of the receive buffer, it must be released before receiving again"""
+        reader = self.reader
+        if reader is None:
+            raise RuntimeError("socket is closed or missing")
+        timer = None if self.metrics is None else ReceiveTimer(self.metrics)
+
+        # There might be a full object waiting in the buffer
+        json_object = self._framer.next_view()
+        while json_object is None:
+            if timer is not None:
+                timer.framed()
+            data = await reader.read(self.RECV_BUFFER_SIZE)
+            if timer is not None:
+                timer.waited()
+            if not data:
+                raise ConnectionAbortedError("Connection closed by the remote end")
+            self._framer.feed(data)
+            json_object = self._framer.next_view()
+
+        if timer is not None:
+            timer.finish(json_object.nbytes)
+        if self.debug:
+            print("recv:", str(json_object, "utf8"))
+        return json_object
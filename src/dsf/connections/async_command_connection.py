@@ -0,0 +1,11 @@
+from .async_base_command_connection import AsyncBaseCommandConnection
+from .init_messages import client_init_messages
+from .. import SOCKET_FILE
+
+
+class AsyncCommandConnection(AsyncBaseCommandConnection):
+    """Asyncio connection class for sending commands to the control server"""
+
+    async def connect(self, socket_file: str = SOCKET_FILE, **kwargs):  # type: ignore[override]
+        """Establishes a connection to the given UNIX socket file"""
+        return await super().connect(client_init_messages.command_init_message(), socket_file)
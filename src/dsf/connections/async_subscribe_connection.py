@@ -0,0 +1,121 @@
+from time import perf_counter
+from typing import Set, Tuple, Union
+
+from .async_base_connection import AsyncBaseConnection
+from .init_messages import client_init_messages
+from .. import commands, SOCKET_FILE
+from ..object_model import ObjectModel
+from ..object_model.model_patch import get_changed_paths, merge_patch
+
+
+class AsyncSubscribeConnection(AsyncBaseConnection):
+    """
+    Asyncio connection class for subscribing to model updates
+
+    Constructor arguments:
+    :param subscription_mode: Mode of the subscription
+    :param filter_str: Delimited filter expression. Obsolete: Use filter_list instead.
+    :param filter_list: Filter expressions
+    :param debug: Whether debugging output is turned on for this connection
+    """
+
+    def __init__(
+        self,
+        subscription_mode: client_init_messages.SubscriptionMode,
+        filter_str: str = "",
+        filter_list=None,
+        debug: bool = False,
+    ):
+        super().__init__(debug)
+        self.subscription_mode = subscription_mode
+        self.filter_str = filter_str
+        self.filter_list = filter_list
+        # Live object model maintained by update_object_model()
+        self.model = ObjectModel()
+
+    async def connect(self, socket_file: str = SOCKET_FILE, **kwargs):  # type: ignore[override]
+        """Establishes a connection to the given UNIX socket file"""
+        sim = client_init_messages.subscribe_init_message(
+            self.subscription_mode, self.filter_str, self.filter_list
+        )
+        # Start over with an empty model but keep the callbacks subscribed to the previous one
+        self.model = ObjectModel(self.model.subscriptions)
+        return await super().connect(sim, socket_file)
+
+    async def get_object_model(self) -> ObjectModel:
+        """
+        Retrieves the full object model of the machine
+        In subscription mode this is the first command that has to be called once a
+        ConnectionAbortedError has been established.
+        """
+        object_model = await self.receive(ObjectModel)
+        await self.send(commands.model_subscription.acknowledge())
+        return object_model
+
+    async def get_serialized_object_model(self, as_bytes: bool = False) -> Union[str, bytes]:
+        """
+        Optimized method to query the object model UTF-8 JSON in any mode.
+        May be used to get object model patches as well.
+        :param as_bytes: Return the UTF-8 encoded JSON as received instead of decoding it into a string
+        """
+        object_model_json = await (self.receive_json_bytes() if as_bytes else self.receive_json())
+        await self.send(commands.model_subscription.acknowledge())
+        return object_model_json
+
+    async def get_object_model_patch(self) -> str:
+        """
+        Receive a (partial) object model update.
+        If the subscription mode is set to SubscriptionMode.PATCH new update patches of
+        the object model need to be applied manually. This method is intended to receive
+        such fragments.
+        """
+        patch_json = await self.receive_json()
+        await self.send(commands.model_subscription.acknowledge())
+        return patch_json
+
+    async def get_coalesced_object_model_patch(self) -> Tuple[dict, int]:
+        """
+        Receive the next object model patch and merge the patches that have already been received completely
+        into it. Later values win (see merge_patch()), so applying the merged patch is equivalent to applying the
+        received patches one after another. Only a single acknowledgement is sent.
+        DCS sends the next update only after the previous one has been acknowledged and accumulates the changes
+        made in the meantime, so against DCS the patch count is normally 1. Merging only applies to servers
+        that send patches without waiting for acknowledgements.
+        :returns: Merged deserialized patch and the number of patches it consists of
+        """
+        patch = await self.receive_data()
+        count = 1
+        update = self.poll_data()
+        while update is not None:
+            merge_patch(patch, update)
+            count += 1
+            update = self.poll_data()
+        await self.send(commands.model_subscription.acknowledge())
+        return patch, count
+
+    async def update_object_model(self, coalesce: bool = False) -> Set[str]:
+        """
+        Receive the next object model update and apply it in place to the live object model in self.model.
+        The first call after connecting receives the full object model, subsequent calls apply the
+        received patches incrementally so that only the objects contained in a patch are updated.
+        Callbacks subscribed to self.model are invoked for the touched paths (see ObjectModel.subscribe()).
+        :param coalesce: Merge the patches that have already been received into a single update
+        (see get_coalesced_object_model_patch())
+        :returns: Paths of the changed values, e.g. heat.heaters[0].current (see get_changed_paths)
+        """
+        if coalesce:
+            update, _ = await self.get_coalesced_object_model_patch()
+        else:
+            update = await self.receive_data()
+            # Acknowledge the update first so that the next one can be prepared while this one is applied
+            await self.send(commands.model_subscription.acknowledge())
+        if self.metrics is None:
+            changed_paths = get_changed_paths(update)
+            self.model.update_from_json(update)
+            return changed_paths
+
+        started = perf_counter()
+        changed_paths = get_changed_paths(update)
+        self.model.update_from_json(update)
+        self.metrics.record_patch(perf_counter() - started, len(changed_paths))
+        return changed_paths
@@ -1,7 +1,10 @@
+import asyncio
 import os
+from typing import Callable, Iterable, Optional, Union
 
 from .base_connection import BaseConnection
-from .. import commands, DEFAULT_BACKLOG
+from .code_stream import CodeStreamReport, stream_codes
+from .. import commands, DEFAULT_BACKLOG, DEFAULT_PIPELINE_WINDOW
 from ..commands import code
 from ..commands.code_channel import CodeChannel
 from ..http import HttpEndpointUnixSocket
@@ -21,13 +24,17 @@ class BaseCommandConnection(BaseConnection):
         path: str,
         is_upload_request: bool = False,
         backlog: int = DEFAULT_BACKLOG,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
     ):
-        """Add a new third-party HTTP endpoint in the format /machine/{ns}/{path}"""
+        """
+        Add a new third-party HTTP endpoint in the format /machine/{ns}/{path}
+        :param loop: Event loop to serve the endpoint on, see HttpEndpointUnixSocket
+        """
         res = self.perform_command(
             commands.http_endpoints.add_http_endpoint(endpoint_type, namespace, path, is_upload_request)
         )
         socket_file = res.result
-        return HttpEndpointUnixSocket(endpoint_type, namespace, path, socket_file, backlog, self.debug)
+        return HttpEndpointUnixSocket(endpoint_type, namespace, path, socket_file, backlog, self.debug, loop)
 
     def add_user_session(
         self,
@@ -75,10 +82,16 @@ class BaseCommandConnection(BaseConnection):
         res = self.perform_command(commands.object_model.get_object_model(), ObjectModel)
         return res.result
 
-    def get_serialized_object_model(self):
-        """Optimized method to directly query the machine model UTF-8 JSON"""
+    def get_serialized_object_model(self, as_bytes: bool = False):
+        """
+        Optimized method to directly query the machine model UTF-8 JSON
+        :param as_bytes: Return the UTF-8 encoded JSON as received instead of decoding it into a string
+        """
+        if self._pipeline is not None:
+            # Responses of pipelined commands must be received first
+            self._pipeline.flush()
         self.send(commands.object_model.get_object_model())
-        return self.receive_json()
+        return self.receive_json_bytes() if as_bytes else self.receive_json()
 
     def install_plugin(self, plugin_file: str):
         """Install or upgrade a plugin"""
@@ -133,6 +146,30 @@ class BaseCommandConnection(BaseConnection):
         res = self.perform_command(commands.generic.simple_code(cde, channel, async_exec))
         return res.result
 
+    def stream_codes(
+        self,
+        codes: Iterable[Union[str, code.Code]],
+        channel: CodeChannel = CodeChannel.DEFAULT_CHANNEL,
+        window: int = DEFAULT_PIPELINE_WINDOW,
+        on_result: Optional[Callable[[int, object], None]] = None,
+        stop_on_error: bool = True,
+    ) -> CodeStreamReport:
+        """
+        Execute codes on a channel one after another while keeping up to `window` codes in flight.
+        Unlike perform_simple_code() this does not wait a full round trip per code, and unlike async_exec
+        the window limits how far the sender runs ahead of the machine.
+        Streaming stops once the control server reports an error or cancels a code (TaskCanceledException).
+        The codes that are already in flight at that point are still awaited.
+        :param codes: Codes in text form (e.g. lines of a file) or parsed codes (see dsf.commands.code_parser)
+        :param channel: Code channel to execute the codes on
+        :param window: Maximum number of codes awaiting their result
+        :param on_result: Optional callable invoked with the line number and the result (or exception) of each code.
+        Line numbers of text codes count from 1, parsed codes keep their lineNumber
+        :param stop_on_error: Also stop if the reply of a code is an error message
+        :returns: Report with the number of completed codes, the throughput and the error that stopped the stream
+        """
+        return stream_codes(self, codes, channel, window, on_result, stop_on_error)
+
     def reload_plugin(self, plugin: str):
         """
         Reload the manifest of a given plugin. Useful for packaged plugins
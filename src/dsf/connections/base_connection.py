@@ -1,10 +1,93 @@
-import json
 import socket
-from typing import Optional
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, TYPE_CHECKING, cast
 
+from .connection_metrics import ConnectionMetrics, ReceiveTimer
 from .exceptions import IncompatibleVersionException, InternalServerException, TaskCanceledException
 from .init_messages import client_init_messages, server_init_message
+from .json_framer import JsonFramer
+from .. import DEFAULT_PIPELINE_WINDOW
 from ..commands import responses
+from ..utility import json_codec
+from ..utils import deprecated
+
+if TYPE_CHECKING:
+    from .command_pipeline import CommandPipeline
+
+
+def _attribute_encoder(cls) -> Callable[[object], dict]:
+    """
+    Create the function serializing instances of a class. Classes providing to_dict() (e.g. Code) are
+    serialized by it, others by their attributes including the ones stored in slots.
+    Attributes starting with an underscore are internal state and not serialized
+    """
+    to_dict = getattr(cls, "to_dict", None)
+    if to_dict is not None:
+        return to_dict
+
+    slots = tuple(name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ())
+                  if not name.startswith("_"))
+    if cls.__dictoffset__ == 0:
+        return lambda o: {name: getattr(o, name) for name in slots if hasattr(o, name)}
+
+    def encode(o) -> dict:
+        data = {name: getattr(o, name) for name in slots if hasattr(o, name)}
+        data.update((key, value) for key, value in o.__dict__.items() if not key.startswith("_"))
+        return data
+    return encode
+
+
+# Serialization functions by class, created on first use
+_encoders: Dict[type, Callable[[object], dict]] = {}
+
+
+def _encode_object(o) -> dict:
+    """Serialize an object the JSON codec cannot serialize itself"""
+    encoder = _encoders.get(o.__class__)
+    if encoder is None:
+        encoder = _encoders[o.__class__] = _attribute_encoder(o.__class__)
+    return encoder(o)
+
+
+def encode_message(msg) -> bytes:
+    """Serialize an arbitrary object into JSON"""
+    return json_codec.dumps(msg, default=_encode_object)
+
+
+def decode_server_init_message(json_string) -> server_init_message.ServerInitMessage:
+    """Deserialize the message sent by the server once a connection has been established
+    and make sure it is compatible with this client"""
+    server_init_msg = server_init_message.ServerInitMessage.from_json(json_codec.loads(json_string))
+    if not server_init_msg.is_compatible():
+        raise IncompatibleVersionException(
+            f"Incompatible API version (need {server_init_msg.PROTOCOL_VERSION}, got {server_init_msg.version})"
+        )
+    return server_init_msg
+
+
+def check_init_response(init_message: client_init_messages.ClientInitMessage, response: responses.BaseResponse):
+    """Make sure the server accepted the requested connection mode"""
+    if isinstance(response, responses.ErrorResponse):
+        raise Exception(
+            f"Could not set connection type {init_message.mode} ({response.error_type}: {response.error_message})"
+        )
+
+
+def process_command_response(command, response: responses.BaseResponse, cls=None):
+    """Deserialize the result of a successful command or raise the exception reported by the server"""
+    if isinstance(response, responses.Response):
+        if cls is not None and response.result is not None:
+            response.result = cls.from_json(response.result)
+        return response
+    # decode_response() only creates Response and ErrorResponse instances
+    response = cast(responses.ErrorResponse, response)
+
+    if response.error_type == "TaskCanceledException":
+        raise TaskCanceledException(response.error_message)
+
+    raise InternalServerException(
+        command, response.error_type, response.error_message
+    )
 
 
 class BaseConnection:
@@ -13,12 +96,19 @@ class BaseConnection:
     using a UNIX socket
     """
 
+    # Maximum number of bytes to read from the socket at once
+    RECV_BUFFER_SIZE = 64 * 1024
+
     def __init__(self, debug: bool = False, timeout: int = 3):
         self.debug = debug
         self.timeout = timeout
         self.socket: Optional[socket.socket] = None
-        self.id = None
-        self.input = ""
+        self.id: Optional[int] = None
+        self._framer = JsonFramer()
+        # Pipeline of the commands sent without waiting for their responses
+        self._pipeline: Optional['CommandPipeline'] = None
+        # Optional instrumentation, see enable_metrics()
+        self.metrics: Optional[ConnectionMetrics] = None
 
     def connect(self, init_message: client_init_messages.ClientInitMessage, socket_file: str):
         """Establishes a connection to the given UNIX socket file"""
@@ -26,110 +116,178 @@ class BaseConnection:
         self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self.socket.connect(socket_file)
         self.socket.setblocking(True)
-        server_init_msg = server_init_message.ServerInitMessage.from_json(
-            json.loads(self.socket.recv(50).decode("utf8"))
-        )
-        if not server_init_msg.is_compatible():
-            raise IncompatibleVersionException(
-                f"Incompatible API version (need {server_init_msg.PROTOCOL_VERSION}, got {server_init_msg.version})"
-            )
+        self._framer.clear()
+        server_init_msg = decode_server_init_message(self.receive_json())
         self.id = server_init_msg.id
         self.send(init_message)
-
-        response = self.receive_response()
-        if not response.success:
-            raise Exception(
-                f"Could not set connection type {init_message.mode} ({response.error_type}: {response.error_message})"
-            )
+        check_init_response(init_message, self.receive_response())
 
     def close(self):
         """Closes the current connection and disposes it"""
         if self.socket is not None:
             self.socket.close()
             self.socket = None
+        self._framer.clear()
+        self._pipeline = None
+
+    def enable_metrics(self, metrics: Optional[ConnectionMetrics] = None) -> ConnectionMetrics:
+        """
+        Start recording latencies, traffic and parse times of this connection
+        :param metrics: Metrics instance to record into, e.g. to share it between connections
+        :returns: Metrics of this connection, call snapshot() to read them
+        """
+        self.metrics = metrics if metrics is not None else ConnectionMetrics()
+        return self.metrics
 
     def perform_command(self, command, cls=None):
         """Perform an arbitrary command"""
-        self.send(command)
+        if self._pipeline is not None:
+            # Responses of pipelined commands must be received first
+            self._pipeline.flush()
+        if self.metrics is None:
+            self.send(command)
+            return process_command_response(command, self.receive_response(), cls)
 
+        started = perf_counter()
+        self.send(command)
         response = self.receive_response()
-        if response.success:
-            if cls is not None and response.result is not None:
-                response.result = cls.from_json(response.result)
-            return response
+        self.metrics.record_command(command, perf_counter() - started)
+        return process_command_response(command, response, cls)
 
-        if response.error_type == "TaskCanceledException":
-            raise TaskCanceledException(response.error_message)
+    def pipeline(self, window: int = DEFAULT_PIPELINE_WINDOW):
+        """
+        Create a pipeline to send several commands without waiting for the response of each one
+        Use it as context manager to wait for all responses when leaving the block, e.g.
+            with connection.pipeline() as pipeline:
+                futures = [pipeline.submit(command) for command in batch]
+        :param window: Maximum number of commands awaiting their response
+        :returns: CommandPipeline bound to this connection
+        """
+        from .command_pipeline import CommandPipeline
 
-        raise InternalServerException(
-            command, response.error_type, response.error_message
-        )
+        if self._pipeline is not None:
+            self._pipeline.flush()
+        self._pipeline = CommandPipeline(self, window)
+        return self._pipeline
+
+    def perform_commands(self, commands: Iterable, window: int = DEFAULT_PIPELINE_WINDOW) -> List:
+        """
+        Perform several commands in a pipeline
+        :param commands: Commands to perform
+        :param window: Maximum number of commands awaiting their response
+        :returns: List of the responses in the order of the commands. If the server reported an
+        error for a command, the corresponding item is the exception instead
+        """
+        with self.pipeline(window) as pipeline:
+            futures = [pipeline.submit(command) for command in commands]
+        return [future.exception() or future.result() for future in futures]
 
     def send(self, msg):
-        """Serialize an arbitrary object into JSON and send it to the server plus NL"""
-        json_string = json.dumps(msg, separators=(",", ":"), default=lambda o: o.__dict__)
+        """Serialize an arbitrary object into JSON and send it to the server"""
+        if self.socket is None:
+            raise RuntimeError("socket is closed or missing")
+
+        json_bytes = encode_message(msg)
         if self.debug:
-            print(f"send: {json_string}")
-        self.socket.sendall(json_string.encode("utf8"))
+            print(f"send: {json_bytes.decode('utf8')}")
+        self.socket.sendall(json_bytes)
+        if self.metrics is not None:
+            self.metrics.record_sent(len(json_bytes))
 
     def receive(self, cls):
         """Receive a deserialized object from the server"""
-        json_string = self.receive_json()
-        return cls.from_json(json.loads(json_string))
+        return cls.from_json(self.receive_data())
 
     def receive_response(self):
         """Receive a base response from the server"""
-        json_string = self.receive_json()
-        return responses.decode_response(json.loads(json_string))
+        return responses.decode_response(self.receive_data())
+
+    def receive_data(self):
+        """Receive the next JSON message from the server and deserialize it
+        The message is parsed straight from the receive buffer without decoding it into a string first"""
+        with self._receive_view() as view:
+            if self.metrics is None:
+                return json_codec.loads(view)
+            started = perf_counter()
+            data = json_codec.loads(view)
+        self.metrics.record_parse(perf_counter() - started)
+        return data
+
+    def poll_data(self):
+        """
+        Deserialize the next JSON message if it has been received completely, without waiting for it
+        :returns: Deserialized message or None if no complete message is available
+        """
+        sock = self.socket
+        if sock is None:
+            raise RuntimeError("socket is closed or missing")
+        # Nothing blocks here, so the whole time is accounted to framing
+        timer = None if self.metrics is None else ReceiveTimer(self.metrics)
+        json_object = self._framer.next_view()
+        while json_object is None:
+            try:
+                received = self._framer.recv_into(sock, self.RECV_BUFFER_SIZE, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                return None
+            if received == 0:
+                # The next blocking receive reports that the connection has been closed
+                return None
+            json_object = self._framer.next_view()
+
+        if timer is not None:
+            timer.finish(json_object.nbytes)
+        if self.debug:
+            print("recv:", str(json_object, "utf8"))
+        with json_object:
+            return json_codec.loads(json_object)
 
     def receive_json(self) -> str:
         """Receive the JSON response from the server"""
-        if not self.socket:
-            raise RuntimeError("socket is closed or missing")
+        with self._receive_view() as view:
+            if self.metrics is None:
+                return str(view, "utf8")
+            started = perf_counter()
+            json_string = str(view, "utf8")
+        self.metrics.record_parse(perf_counter() - started)
+        return json_string
 
-        json_string = self.input
+    def receive_json_bytes(self) -> bytes:
+        """Receive the UTF-8 encoded JSON response from the server"""
+        with self._receive_view() as view:
+            return view.tobytes()
+
+    def _receive_view(self) -> memoryview:
+        """Receive the next JSON message as view of the receive buffer, it must be released before receiving again"""
+        sock = self.socket
+        if sock is None:
+            raise RuntimeError("socket is closed or missing")
+        timer = None if self.metrics is None else ReceiveTimer(self.metrics)
 
         # There might be a full object waiting in the buffer
-        end_index = self.get_json_object_end_index(json_string)
-        if end_index > 1:
-            # Save whatever is left in the buffer
-            self.input = json_string[end_index:]
-            # Limit to the first full JSON object
-            json_string = json_string[:end_index]
-        else:
-            found = False
-            while not found:
-                # Refill the buffer and check again
-                BUFF_SIZE = 4096  # 4 KiB
-                data = b""
-                part = b""
-                while True:
-                    try:
-                        part = self.socket.recv(BUFF_SIZE)
-                        data += part
-                    except socket.timeout:
-                        pass
-                    except Exception as e:
-                        raise e
-                    # either 0 or end of data
-                    if len(part) < BUFF_SIZE:
-                        break
-
-                json_string += data.decode("utf8")
-
-                end_index = self.get_json_object_end_index(json_string)
-                if end_index > 1:
-                    # Save whatever is left in the buffer
-                    self.input = json_string[end_index:]
-                    # Limit to the first full JSON object
-                    json_string = json_string[:end_index]
-                    found = True
+        json_object = self._framer.next_view()
+        while json_object is None:
+            if timer is not None:
+                timer.framed()
+            # Receive directly into the buffer and check again. Only the newly received bytes are scanned
+            try:
+                received = self._framer.recv_into(sock, self.RECV_BUFFER_SIZE)
+            except socket.timeout:
+                continue
+            finally:
+                if timer is not None:
+                    timer.waited()
+            if received == 0:
+                raise ConnectionAbortedError("Connection closed by the remote end")
+            json_object = self._framer.next_view()
 
+        if timer is not None:
+            timer.finish(json_object.nbytes)
         if self.debug:
-            print("recv:", json_string)
-        return json_string
+            print("recv:", str(json_object, "utf8"))
+        return json_object
 
     @staticmethod
+    @deprecated("Use JsonFramer instead")
     def get_json_object_end_index(json_string: str):
         """Return the end index of the next full JSON object in the string"""
         count = 0
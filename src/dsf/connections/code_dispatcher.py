@@ -0,0 +1,371 @@
+import asyncio
+import socket
+import threading
+from enum import Enum
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .async_intercept_connection import AsyncInterceptConnection
+from .connection_metrics import LatencyHistogram
+from .init_messages.client_init_messages import InterceptionMode
+from .intercept_connection import InterceptConnection
+from .. import SOCKET_FILE
+from ..commands.code import Code
+from ..commands.code_channel import CodeChannel
+from ..commands.code_type import CodeType
+from ..object_model.messages import MessageType
+
+# Key of a handler: code type letter, major and minor number (None for any)
+_HandlerKey = Tuple[str, Optional[int], Optional[int]]
+
+
+class CodeOutcome(Enum):
+    """Outcomes a code handler may return instead of resolving the code"""
+
+    # Let the control server process the code without modifications
+    IGNORE = "Ignore"
+
+    # Cancel the code
+    CANCEL = "Cancel"
+
+
+def _code_type_letter(code_type) -> str:
+    return code_type.value if isinstance(code_type, CodeType) else CodeType(code_type).value
+
+
+def _handler_name(key: _HandlerKey) -> str:
+    """Text representation of a handler key that doubles as interception filter, e.g. M1234, M122.1 or T*"""
+    code_type, major, minor = key
+    if major is None:
+        return f"{code_type}*"
+    return f"{code_type}{major}" if minor is None else f"{code_type}{major}.{minor}"
+
+
+class _BaseCodeDispatcher:
+    """Registry of code handlers shared by CodeDispatcher and AsyncCodeDispatcher"""
+
+    def __init__(
+        self,
+        socket_file: str,
+        interception_mode: InterceptionMode,
+        channels: Optional[List[CodeChannel]],
+        auto_flush: bool,
+        auto_evaluate_expression: bool,
+        priority_codes: bool,
+        debug: bool,
+    ):
+        self.socket_file = socket_file
+        self.interception_mode = interception_mode
+        self.channels = channels if channels is not None else CodeChannel.list()
+        self.auto_flush = auto_flush
+        self.auto_evaluate_expression = auto_evaluate_expression
+        self.priority_codes = priority_codes
+        self.debug = debug
+        self._handlers: Dict[_HandlerKey, Callable] = {}
+        # Latency of the handlers by their filter expression, e.g. M1234
+        self.handler_latency: Dict[str, LatencyHistogram] = {}
+
+    def register(self, code_type: CodeType, major_number: Optional[int], handler: Callable,
+                 minor_number: Optional[int] = None):
+        """
+        Register a code handler. Handlers are called with the intercepted code and the connection it was received
+        from and may return
+        - None to resolve the code successfully
+        - a string to resolve the code successfully with this message
+        - a tuple of MessageType and message to resolve the code with another message type
+        - CodeOutcome.IGNORE or CodeOutcome.CANCEL to pass the code on or to cancel it
+        If a handler raises an exception, the code is resolved with an error message.
+        :param code_type: Type of the codes to handle
+        :param major_number: Major number of the codes to handle or None for all codes of this type
+        :param handler: Callable to invoke
+        :param minor_number: Minor number of the codes to handle or None for any minor number
+        """
+        if major_number is None and minor_number is not None:
+            raise ValueError("minor_number requires a major_number")
+        key = (_code_type_letter(code_type), major_number, minor_number)
+        if key in self._handlers:
+            raise ValueError(f"A handler for {_handler_name(key)} is already registered")
+        self._handlers[key] = handler
+
+    def handler(self, code_type: CodeType, major_number: Optional[int] = None, minor_number: Optional[int] = None):
+        """
+        Decorator to register a code handler (see register()), e.g.
+            @dispatcher.handler(CodeType.MCode, 1234)
+            def m1234(code, connection):
+                return "Done"
+        """
+        def decorator(func):
+            self.register(code_type, major_number, func, minor_number)
+            return func
+        return decorator
+
+    @property
+    def filters(self) -> List[str]:
+        """Interception filters derived from the registered handlers"""
+        return [_handler_name(key) for key in self._handlers]
+
+    def find_handler(self, code: Code) -> Tuple[Optional[_HandlerKey], Optional[Callable]]:
+        """Look up the handler of a code, handlers for a specific minor number take precedence"""
+        if not code.type:
+            return None, None
+        code_type = _code_type_letter(code.type)
+        keys: Tuple[_HandlerKey, ...] = ((code_type, code.majorNumber, code.minorNumber),
+                                         (code_type, code.majorNumber, None), (code_type, None, None))
+        for key in keys:
+            handler = self._handlers.get(key)
+            if handler is not None:
+                return key, handler
+        return None, None
+
+    def _record_latency(self, key: _HandlerKey, seconds: float):
+        name = _handler_name(key)
+        histogram = self.handler_latency.get(name)
+        if histogram is None:
+            histogram = self.handler_latency[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return the latency of each handler as plain dictionary"""
+        return {name: histogram.to_dict() for name, histogram in self.handler_latency.items()}
+
+    def _create_connection(self, connection_type, channel: CodeChannel):
+        if not self._handlers:
+            raise ValueError("No code handlers registered")
+        return connection_type(
+            self.interception_mode,
+            channels=[channel],
+            filters=self.filters,
+            auto_flush=self.auto_flush,
+            auto_evaluate_expression=self.auto_evaluate_expression,
+            priority_codes=self.priority_codes,
+            debug=self.debug,
+        )
+
+    @staticmethod
+    def _resolution(result) -> Tuple[str, Optional[MessageType], Optional[str]]:
+        """Convert the return value of a handler into the reply to the control server"""
+        if isinstance(result, CodeOutcome):
+            return result.value, None, None
+        if result is None:
+            return "Resolve", MessageType.Success, None
+        if isinstance(result, str):
+            return "Resolve", MessageType.Success, result
+        message_type, content = result
+        return "Resolve", message_type, content
+
+
+class CodeDispatcher(_BaseCodeDispatcher):
+    """
+    Dispatch intercepted codes to handlers registered per code type, major and minor number.
+    Every code channel is intercepted by its own connection and thread, so codes of one channel are handled in
+    strict order while a slow handler does not hold up the codes of other channels. Only the codes of
+    registered handlers are intercepted (see filters) and codes without handler are ignored.
+    The latency of each handler is recorded in handler_latency.
+
+    Constructor arguments:
+    :param socket_file: Path of the UNIX socket of the control server
+    :param interception_mode: Mode of the interceptors
+    :param channels: Code channels to intercept, all channels if not set
+    :param auto_flush: See InterceptConnection
+    :param auto_evaluate_expression: See InterceptConnection
+    :param priority_codes: Defines if priority codes may be intercepted (e.g. M122 or M999)
+    :param debug: Whether debugging output is turned on for the connections
+    """
+
+    def __init__(
+        self,
+        socket_file: str = SOCKET_FILE,
+        interception_mode: InterceptionMode = InterceptionMode.PRE,
+        channels: Optional[List[CodeChannel]] = None,
+        auto_flush: bool = True,
+        auto_evaluate_expression: bool = True,
+        priority_codes: bool = False,
+        debug: bool = False,
+    ):
+        super().__init__(socket_file, interception_mode, channels, auto_flush, auto_evaluate_expression,
+                         priority_codes, debug)
+        self._connections: List[InterceptConnection] = []
+        self._threads: List[threading.Thread] = []
+        self._errors: List[BaseException] = []
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """Connect an interceptor for every channel and start handling codes in the background"""
+        self._stopped.clear()
+        self._errors.clear()
+        try:
+            for channel in self.channels:
+                connection = self._create_connection(InterceptConnection, channel)
+                connection.connect(self.socket_file)
+                self._connections.append(connection)
+        except BaseException:
+            self.stop()
+            raise
+
+        for connection in self._connections:
+            thread = threading.Thread(target=self._serve, args=(connection,), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait until all interceptors have stopped
+        :raises: First exception that terminated an interceptor, e.g. ConnectionAbortedError
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._errors:
+            raise self._errors[0]
+
+    def run(self):
+        """Handle codes until stop() is called or a connection is lost"""
+        self.start()
+        try:
+            self.wait()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop handling codes and close all connections"""
+        self._stopped.set()
+        for connection in self._connections:
+            if connection.socket is not None:
+                try:
+                    # Wake up the thread waiting for the next code
+                    connection.socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(5)
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        self._threads.clear()
+
+    def _serve(self, connection: InterceptConnection):
+        try:
+            while not self._stopped.is_set():
+                self.dispatch(connection, connection.receive_code())
+        except BaseException as e:
+            if not self._stopped.is_set():
+                self._errors.append(e)
+                # Without this interceptor the codes of its channel would be held up, so stop all of them
+                self._stopped.set()
+                for other in self._connections:
+                    if other is not connection and other.socket is not None:
+                        try:
+                            other.socket.shutdown(socket.SHUT_RDWR)
+                        except OSError:
+                            pass
+
+    def dispatch(self, connection: InterceptConnection, code: Code):
+        """Invoke the handler of an intercepted code and send the outcome to the control server"""
+        key, handler = self.find_handler(code)
+        if key is None or handler is None:
+            connection.ignore_code()
+            return
+
+        started = perf_counter()
+        try:
+            command, message_type, content = self._resolution(handler(code, connection))
+        except Exception as e:
+            command, message_type, content = "Resolve", MessageType.Error, str(e) or type(e).__name__
+        seconds = perf_counter() - started
+        with self._lock:
+            self._record_latency(key, seconds)
+
+        if command == "Ignore":
+            connection.ignore_code()
+        elif command == "Cancel":
+            connection.cancel_code()
+        else:
+            connection.resolve_code(message_type or MessageType.Success, content)
+
+
+class AsyncCodeDispatcher(_BaseCodeDispatcher):
+    """
+    Asyncio variant of CodeDispatcher. Every code channel is intercepted by its own connection and task.
+    Handlers may be coroutine functions, which are awaited, or regular functions, which are run in the default
+    executor of the event loop so that they do not block the other channels. Commands can only be sent over the
+    connection passed to a handler from coroutine functions.
+
+    Constructor arguments: see CodeDispatcher
+    """
+
+    def __init__(
+        self,
+        socket_file: str = SOCKET_FILE,
+        interception_mode: InterceptionMode = InterceptionMode.PRE,
+        channels: Optional[List[CodeChannel]] = None,
+        auto_flush: bool = True,
+        auto_evaluate_expression: bool = True,
+        priority_codes: bool = False,
+        debug: bool = False,
+    ):
+        super().__init__(socket_file, interception_mode, channels, auto_flush, auto_evaluate_expression,
+                         priority_codes, debug)
+        self._tasks: List[asyncio.Task] = []
+
+    async def run(self):
+        """Handle codes until stop() is called or a connection is lost"""
+        connections = []
+        try:
+            for channel in self.channels:
+                connection = self._create_connection(AsyncInterceptConnection, channel)
+                await connection.connect(self.socket_file)
+                connections.append(connection)
+
+            self._tasks = [asyncio.ensure_future(self._serve(connection)) for connection in connections]
+            try:
+                await asyncio.gather(*self._tasks)
+            except asyncio.CancelledError:
+                pass
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+            for connection in connections:
+                await connection.close()
+
+    def stop(self):
+        """Stop handling codes, run() returns once the connections are closed"""
+        for task in self._tasks:
+            task.cancel()
+
+    async def _serve(self, connection: AsyncInterceptConnection):
+        while True:
+            await self.dispatch(connection, await connection.receive_code())
+
+    async def dispatch(self, connection: AsyncInterceptConnection, code: Code):
+        """Invoke the handler of an intercepted code and send the outcome to the control server"""
+        key, handler = self.find_handler(code)
+        if key is None or handler is None:
+            await connection.ignore_code()
+            return
+
+        started = perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                result = await handler(code, connection)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(None, handler, code, connection)
+            command, message_type, content = self._resolution(result)
+        except Exception as e:
+            command, message_type, content = "Resolve", MessageType.Error, str(e) or type(e).__name__
+        self._record_latency(key, perf_counter() - started)
+
+        if command == "Ignore":
+            await connection.ignore_code()
+        elif command == "Cancel":
+            await connection.cancel_code()
+        else:
+            await connection.resolve_code(message_type or MessageType.Success, content)
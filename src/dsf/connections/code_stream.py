@@ -0,0 +1,119 @@
+from collections import deque
+from time import perf_counter
+from typing import Callable, Deque, Iterable, Optional, Tuple, Union
+
+from .command_pipeline import CommandFuture
+from .exceptions import TaskCanceledException
+from .. import DEFAULT_PIPELINE_WINDOW
+from ..commands import generic
+from ..commands.code import Code
+from ..commands.code_channel import CodeChannel
+from ..object_model.messages import Message, MessageType
+
+
+def _is_error_reply(result) -> bool:
+    """Check if the reply of a code reports an error"""
+    if isinstance(result, Message):
+        return result.type == MessageType.Error
+    return isinstance(result, str) and result.startswith("Error")
+
+
+class CodeStreamReport:
+    """
+    Outcome of streaming codes through a code channel (see BaseCommandConnection.stream_codes())
+    """
+
+    def __init__(self):
+        # Number of codes sent to the control server
+        self.sent = 0
+        # Number of codes whose result has been received
+        self.completed = 0
+        # Reply or exception that stopped the stream, None if all codes were processed
+        self.error: Union[Exception, Message, str, None] = None
+        # Line number of the code that stopped the stream
+        self.error_line: Optional[int] = None
+        # Whether the stream was stopped because the control server cancelled a code
+        self.cancelled = False
+        self.started = perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether all codes have been processed without error"""
+        return self.error is None
+
+    @property
+    def elapsed(self) -> float:
+        """Duration of the stream in seconds"""
+        return (self.finished if self.finished is not None else perf_counter()) - self.started
+
+    @property
+    def codes_per_second(self) -> float:
+        """Throughput of the stream in completed codes per second"""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"CodeStreamReport(completed={self.completed}, sent={self.sent}, "
+                f"codes_per_second={self.codes_per_second:.1f}, error_line={self.error_line!r}, error={self.error!r})")
+
+
+def stream_codes(
+    connection,
+    codes: Iterable[Union[str, Code]],
+    channel: CodeChannel = CodeChannel.DEFAULT_CHANNEL,
+    window: int = DEFAULT_PIPELINE_WINDOW,
+    on_result: Optional[Callable[[int, object], None]] = None,
+    stop_on_error: bool = True,
+) -> CodeStreamReport:
+    """
+    Send codes through a code channel keeping up to `window` codes in flight (see BaseCommandConnection.stream_codes())
+    """
+    report = CodeStreamReport()
+    # Line number and future of every code awaiting its result
+    pending: Deque[Tuple[int, CommandFuture]] = deque()
+
+    def complete(line_number: int, future: CommandFuture):
+        exception = future.exception()
+        result = exception if exception is not None else future.result().result
+        report.completed += 1
+        if on_result is not None:
+            on_result(line_number, result)
+        if report.error is None:
+            if isinstance(exception, TaskCanceledException):
+                report.cancelled = True
+            elif exception is None and not (stop_on_error and _is_error_reply(result)):
+                return
+            report.error = result
+            report.error_line = line_number
+
+    try:
+        with connection.pipeline(window) as pipeline:
+            for index, item in enumerate(codes):
+                if isinstance(item, Code):
+                    item.channel = channel
+                    line_number = item.lineNumber if item.lineNumber is not None else index + 1
+                    command, cls = item, Message
+                else:
+                    item = item.rstrip("\r\n")
+                    if not item.strip():
+                        # Blank lines only count towards the line numbers
+                        continue
+                    line_number = index + 1
+                    command, cls = generic.simple_code(item, channel), None
+
+                # Wait for a free slot here rather than in submit() so no code is sent after an error
+                while len(pending) >= window or (pending and pending[0][1].done()):
+                    complete(*pending.popleft())
+                if report.error is not None:
+                    break
+
+                pending.append((line_number, pipeline.submit(command, cls)))
+                report.sent += 1
+
+            # Codes already in flight are still executed, so wait for their results
+            while pending:
+                complete(*pending.popleft())
+    finally:
+        report.finished = perf_counter()
+    return report
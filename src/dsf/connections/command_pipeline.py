@@ -0,0 +1,102 @@
+from collections import deque
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Deque, Optional, Tuple
+
+from .base_connection import process_command_response
+from .. import DEFAULT_PIPELINE_WINDOW
+
+
+class CommandFuture(Future):
+    """Future of a pipelined command. Waiting for its result reads the pending responses up to this command"""
+
+    def __init__(self, pipeline: 'CommandPipeline'):
+        super().__init__()
+        self._pipeline = pipeline
+
+    def result(self, timeout=None):
+        if not self.done():
+            self._pipeline.receive_until(self)
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        if not self.done():
+            self._pipeline.receive_until(self)
+        return super().exception(timeout)
+
+
+class CommandPipeline:
+    """
+    Send several commands over one connection without waiting for the response of each command.
+    The control server processes the commands of a connection in order, so the responses are matched
+    back to the futures returned by submit() in the same order. Errors reported by the server for a
+    command are set as the exception of its future.
+    At most `window` commands are in flight, further commands wait for the oldest response first so that
+    neither side blocks on full socket buffers.
+
+    Constructor arguments:
+    :param connection: Established connection to send the commands over
+    :param window: Maximum number of commands awaiting their response
+    """
+
+    def __init__(self, connection, window: int = DEFAULT_PIPELINE_WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.connection = connection
+        self.window = window
+        self._pending: Deque[Tuple[object, type, CommandFuture, Optional[float]]] = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    def __len__(self):
+        """Number of commands awaiting their response"""
+        return len(self._pending)
+
+    def submit(self, command, cls=None) -> CommandFuture:
+        """
+        Send a command without waiting for its response
+        :param command: Command to send
+        :param cls: Optional type to deserialize the result into
+        :returns: Future resolved with the response of the command
+        """
+        while len(self._pending) >= self.window:
+            self._receive_next()
+
+        future = CommandFuture(self)
+        # Latency of pipelined commands is measured from submission to the arrival of the response
+        started = None if self.connection.metrics is None else perf_counter()
+        self.connection.send(command)
+        self._pending.append((command, cls, future, started))
+        return future
+
+    def flush(self):
+        """Wait for the responses of all submitted commands"""
+        while self._pending:
+            self._receive_next()
+
+    def receive_until(self, future: CommandFuture):
+        """Read the responses of the pending commands up to and including the given one"""
+        while not future.done() and self._pending:
+            self._receive_next()
+
+    def _receive_next(self):
+        command, cls, future, started = self._pending[0]
+        try:
+            response = self.connection.receive_response()
+        except BaseException as e:
+            # The connection is unusable, the remaining responses will never be received
+            while self._pending:
+                self._pending.popleft()[2].set_exception(e)
+            raise
+
+        self._pending.popleft()
+        if started is not None:
+            self.connection.metrics.record_command(command, perf_counter() - started)
+        try:
+            future.set_result(process_command_response(command, response, cls))
+        except Exception as e:
+            future.set_exception(e)
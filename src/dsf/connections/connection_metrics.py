@@ -0,0 +1,216 @@
+import bisect
+from time import perf_counter
+from typing import Callable, Dict, Optional
+
+# Upper bounds of the latency histogram buckets (in s), values above the last bound are counted in an overflow bucket
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+
+def command_name(command) -> str:
+    """Name used to group the latencies of a command, e.g. SimpleCode"""
+    return getattr(command, "command", None) or type(command).__name__
+
+
+class LatencyHistogram:
+    """Distribution of measured durations (in s) using the fixed buckets in LATENCY_BUCKETS"""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        # Number of values per bucket, the last item counts the values exceeding the last bound
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, value: float):
+        """Add a measured duration (in s)"""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Average of the recorded values or None if nothing has been recorded"""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Estimate a percentile from the buckets
+        :param percent: Percentile to estimate (0..100)
+        :returns: Upper bound of the bucket holding the percentile (capped by the maximum) or None if empty
+        """
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                if index < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[index], self.max)
+                break
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": list(self.buckets),
+        }
+
+    def __repr__(self):
+        return f"LatencyHistogram(count={self.count}, mean={self.mean!r}, max={self.max!r})"
+
+
+class ConnectionMetrics:
+    """
+    Opt-in instrumentation of a connection. Durations are measured with time.perf_counter().
+    To start recording, call enable_metrics() of a connection or assign an instance to its metrics attribute.
+    Connections without metrics only check for None, so there is no measurable cost when this is disabled.
+
+    Round-trip latency per command type includes the time DCS needs to process a command, the time spent
+    waiting for the socket and the time needed to frame and parse the response. The latter two are recorded
+    separately, so comparing them tells where the time goes.
+
+    The hooks are optional callables invoked with every measurement:
+    - on_command(name, seconds) after a command response has been received
+    - on_receive(size, framing_seconds) after a JSON message has been framed
+    - on_parse(seconds) after a received message has been deserialized or decoded
+    - on_patch(seconds, changed_path_count) after an object model update has been applied
+    """
+
+    def __init__(self):
+        # Round-trip latency per command type
+        self.commands: Dict[str, LatencyHistogram] = {}
+        # Traffic counters
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        # Time spent waiting for data from the socket (in s)
+        self.receive_wait = 0.0
+        # Time needed to find the end of each received JSON message
+        self.framing = LatencyHistogram()
+        # Time needed to deserialize or decode each received message
+        self.parsing = LatencyHistogram()
+        # Time needed to apply each object model update in subscribe mode
+        self.patch_apply = LatencyHistogram()
+
+        self.on_command: Optional[Callable[[str, float], None]] = None
+        self.on_receive: Optional[Callable[[int, float], None]] = None
+        self.on_parse: Optional[Callable[[float], None]] = None
+        self.on_patch: Optional[Callable[[float, int], None]] = None
+
+    def record_command(self, command, seconds: float):
+        """Record the round-trip latency of a command"""
+        name = command_name(command)
+        histogram = self.commands.get(name)
+        if histogram is None:
+            histogram = self.commands[name] = LatencyHistogram()
+        histogram.record(seconds)
+        if self.on_command is not None:
+            self.on_command(name, seconds)
+
+    def record_sent(self, size: int):
+        """Record a sent message"""
+        self.bytes_sent += size
+        self.messages_sent += 1
+
+    def record_received(self, size: int, framing_seconds: float, wait_seconds: float):
+        """Record a received and framed message"""
+        self.bytes_received += size
+        self.messages_received += 1
+        self.receive_wait += wait_seconds
+        self.framing.record(framing_seconds)
+        if self.on_receive is not None:
+            self.on_receive(size, framing_seconds)
+
+    def record_parse(self, seconds: float):
+        """Record the time needed to deserialize a message"""
+        self.parsing.record(seconds)
+        if self.on_parse is not None:
+            self.on_parse(seconds)
+
+    def record_patch(self, seconds: float, changed_path_count: int):
+        """Record the time needed to apply an object model update"""
+        self.patch_apply.record(seconds)
+        if self.on_patch is not None:
+            self.on_patch(seconds, changed_path_count)
+
+    def reset(self):
+        """Clear all measurements but keep the hooks"""
+        self.commands = {}
+        self.bytes_sent = self.bytes_received = 0
+        self.messages_sent = self.messages_received = 0
+        self.receive_wait = 0.0
+        self.framing = LatencyHistogram()
+        self.parsing = LatencyHistogram()
+        self.patch_apply = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        """Return the current measurements as plain dictionary, e.g. to export them"""
+        return {
+            "commands": {name: histogram.to_dict() for name, histogram in self.commands.items()},
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "messages_sent": self.messages_sent,
+            "messages_received": self.messages_received,
+            "receive_wait": self.receive_wait,
+            "framing": self.framing.to_dict(),
+            "parsing": self.parsing.to_dict(),
+            "patch_apply": self.patch_apply.to_dict(),
+        }
+
+    def __repr__(self):
+        return (f"ConnectionMetrics(commands={sorted(self.commands)!r}, bytes_sent={self.bytes_sent}, "
+                f"bytes_received={self.bytes_received})")
+
+
+class ReceiveTimer:
+    """
+    Splits the time needed to receive a message into the time spent waiting for the socket and the time spent
+    framing it. The time since the last mark is accounted to waiting by waited() and to framing by framed()
+    """
+
+    __slots__ = ("metrics", "framing", "wait", "_mark")
+
+    def __init__(self, metrics: ConnectionMetrics):
+        self.metrics = metrics
+        self.framing = 0.0
+        self.wait = 0.0
+        self._mark = perf_counter()
+
+    def waited(self):
+        """Account the time since the last mark to waiting for the socket"""
+        now = perf_counter()
+        self.wait += now - self._mark
+        self._mark = now
+
+    def framed(self):
+        """Account the time since the last mark to framing"""
+        now = perf_counter()
+        self.framing += now - self._mark
+        self._mark = now
+
+    def finish(self, size: int):
+        """Record the received message of the given size"""
+        self.framed()
+        self.metrics.record_received(size, self.framing, self.wait)
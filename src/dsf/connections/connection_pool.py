@@ -0,0 +1,424 @@
+import asyncio
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, List, Optional, Tuple
+
+from .async_command_connection import AsyncCommandConnection
+from .command_connection import CommandConnection
+from .. import SOCKET_FILE
+
+# Default maximum number of connections of a pool
+DEFAULT_POOL_SIZE = 4
+
+
+class PoolMetrics:
+    """Usage counters of a connection pool"""
+
+    def __init__(self):
+        # Number of connections established
+        self.created = 0
+        # Number of checkouts served by an idle connection
+        self.reused = 0
+        # Number of connections closed because they failed a health check, expired or broke while checked out
+        self.discarded = 0
+        # Number of checkouts that had to wait for a connection to be returned
+        self.waits = 0
+        # Total time spent waiting for a connection (in s)
+        self.wait_time = 0.0
+        # Number of checkouts that timed out
+        self.timeouts = 0
+        # Current and highest number of connections checked out at the same time
+        self.in_use = 0
+        self.peak_in_use = 0
+        # Number of idle connections
+        self.idle = 0
+
+    def copy(self) -> 'PoolMetrics':
+        metrics = PoolMetrics()
+        metrics.__dict__.update(self.__dict__)
+        return metrics
+
+    def __repr__(self):
+        return f"PoolMetrics({', '.join(f'{key}={value!r}' for key, value in self.__dict__.items())})"
+
+
+def _is_socket_healthy(sock: Optional[socket.socket]) -> bool:
+    """Check without blocking that an idle connection has neither been closed nor received unexpected data"""
+    if sock is None:
+        return False
+    try:
+        sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    # Either the remote end closed the connection (no data) or it sent data that does not belong to any command
+    return False
+
+
+class _BasePool:
+    """Bookkeeping shared by the thread and asyncio connection pools"""
+
+    def __init__(self, socket_file: str, max_size: int, max_idle_time: Optional[float], connection_factory: Callable):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.socket_file = socket_file
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.connection_factory = connection_factory
+        self._metrics = PoolMetrics()
+        # Idle connections and the time they were returned, the most recently used one is last
+        self._idle: List[Tuple[object, float]] = []
+        self._size = 0
+        self._closed = False
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Snapshot of the usage counters"""
+        metrics = self._metrics.copy()
+        metrics.idle = len(self._idle)
+        return metrics
+
+    @property
+    def size(self) -> int:
+        """Number of open connections including the ones checked out"""
+        return self._size
+
+    def _take_idle(self):
+        """Take the most recently used idle connection, closing expired ones on the way"""
+        now = time.monotonic()
+        while self._idle:
+            connection, returned = self._idle.pop()
+            if self.max_idle_time is None or now - returned <= self.max_idle_time:
+                return connection
+            self._size -= 1
+            self._metrics.discarded += 1
+            self._close_later(connection)
+        return None
+
+    def _checked_out(self, reused: bool):
+        metrics = self._metrics
+        if reused:
+            metrics.reused += 1
+        else:
+            metrics.created += 1
+        metrics.in_use += 1
+        metrics.peak_in_use = max(metrics.peak_in_use, metrics.in_use)
+
+    def _close_later(self, connection):
+        """Close a discarded connection, called with the lock of the pool held"""
+        # Closing a UNIX socket does not block
+        connection.close()
+
+
+class ConnectionPool(_BasePool):
+    """
+    Thread-safe pool of command connections.
+    Connections are established lazily up to max_size and handed out to one thread at a time.
+    Idle connections are checked before they are reused and replaced if the control server closed them.
+
+    Constructor arguments:
+    :param socket_file: Path to the UNIX socket of the control server
+    :param max_size: Maximum number of connections
+    :param max_idle_time: Close connections that have been idle for longer than this (in s) or None to keep them
+    :param connection_factory: Callable creating a new unconnected command connection
+    """
+
+    def __init__(
+        self,
+        socket_file: str = SOCKET_FILE,
+        max_size: int = DEFAULT_POOL_SIZE,
+        max_idle_time: Optional[float] = None,
+        connection_factory: Callable[[], CommandConnection] = CommandConnection,
+    ):
+        super().__init__(socket_file, max_size, max_idle_time, connection_factory)
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def acquire(self, timeout: Optional[float] = None) -> CommandConnection:
+        """
+        Check out a connection, it must be given back by calling release()
+        :param timeout: Maximum time to wait for a connection if all of them are in use (in s) or None to wait forever
+        :raises TimeoutError: if no connection became available in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                connection = self._wait_for_connection(deadline)
+            if connection is not None:
+                if _is_socket_healthy(connection.socket):
+                    with self._condition:
+                        self._checked_out(True)
+                    return connection
+                self._discard(connection)
+                continue
+
+            # A slot has been reserved for a new connection
+            connection = self.connection_factory()
+            try:
+                connection.connect(self.socket_file)
+            except BaseException:
+                connection.close()
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._checked_out(False)
+            return connection
+
+    def _wait_for_connection(self, deadline: Optional[float]):
+        """Get an idle connection or reserve a slot for a new one (None), waiting if the pool is exhausted"""
+        start = None
+        while True:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            connection = self._take_idle()
+            if connection is not None or self._size < self.max_size:
+                if connection is None:
+                    self._size += 1
+                if start is not None:
+                    self._metrics.wait_time += time.monotonic() - start
+                return connection
+
+            if start is None:
+                start = time.monotonic()
+                self._metrics.waits += 1
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self._metrics.wait_time += time.monotonic() - start
+                self._metrics.timeouts += 1
+                raise TimeoutError("No connection available")
+            self._condition.wait(remaining)
+
+    def release(self, connection: CommandConnection, discard: bool = False):
+        """
+        Give back a checked out connection
+        :param connection: Connection returned by acquire()
+        :param discard: Close the connection instead of reusing it, e.g. because it is in an unknown state
+        """
+        pipeline = connection._pipeline
+        if discard or connection.socket is None or (pipeline is not None and len(pipeline) > 0):
+            with self._condition:
+                self._metrics.in_use -= 1
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._metrics.in_use -= 1
+            if self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                return
+        connection.close()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Check out a connection for the duration of a with block. Connections that broke
+        while they were in use are closed instead of being reused
+        :param timeout: Maximum time to wait for a connection (in s) or None to wait forever
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        except Exception as e:
+            # Connection errors are OSErrors, other exceptions leave the connection intact
+            self.release(connection, isinstance(e, OSError))
+            raise
+        except BaseException:
+            # Interrupted while a command was in progress, its response may not have been read
+            self.release(connection, True)
+            raise
+        self.release(connection)
+
+    def close(self):
+        """Close all idle connections. Connections still in use are closed when they are released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection, _ in idle:
+            connection.close()
+
+    def _discard(self, connection):
+        connection.close()
+        with self._condition:
+            self._size -= 1
+            self._metrics.discarded += 1
+            self._condition.notify()
+
+
+class AsyncConnectionPool(_BasePool):
+    """
+    Pool of asyncio command connections shared by the tasks of one event loop.
+    Connections are established lazily up to max_size and handed out to one task at a time.
+
+    Constructor arguments:
+    :param socket_file: Path to the UNIX socket of the control server
+    :param max_size: Maximum number of connections
+    :param max_idle_time: Close connections that have been idle for longer than this (in s) or None to keep them
+    :param connection_factory: Callable creating a new unconnected asyncio command connection
+    """
+
+    def __init__(
+        self,
+        socket_file: str = SOCKET_FILE,
+        max_size: int = DEFAULT_POOL_SIZE,
+        max_idle_time: Optional[float] = None,
+        connection_factory: Callable[[], AsyncCommandConnection] = AsyncCommandConnection,
+    ):
+        super().__init__(socket_file, max_size, max_idle_time, connection_factory)
+        self._condition: Optional[asyncio.Condition] = None
+        self._closing: List[AsyncCommandConnection] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Create the condition on first use so that the pool may be created outside of the event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self, timeout: Optional[float] = None) -> AsyncCommandConnection:
+        """
+        Check out a connection, it must be given back by calling release()
+        :param timeout: Maximum time to wait for a connection if all of them are in use (in s) or None to wait forever
+        :raises TimeoutError: if no connection became available in time
+        """
+        condition = self._get_condition()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            async with condition:
+                connection = await self._wait_for_connection(condition, deadline)
+            await self._close_expired()
+            if connection is not None:
+                if connection.writer is not None and not connection.writer.is_closing() \
+                        and not connection.reader.at_eof():
+                    self._checked_out(True)
+                    return connection
+                await self._discard(connection)
+                continue
+
+            connection = self.connection_factory()
+            try:
+                await connection.connect(self.socket_file)
+            except BaseException:
+                await connection.close()
+                async with condition:
+                    self._size -= 1
+                    condition.notify()
+                raise
+            self._checked_out(False)
+            return connection
+
+    async def _wait_for_connection(self, condition: asyncio.Condition, deadline: Optional[float]):
+        start = None
+        while True:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            connection = self._take_idle()
+            if connection is not None or self._size < self.max_size:
+                if connection is None:
+                    self._size += 1
+                if start is not None:
+                    self._metrics.wait_time += time.monotonic() - start
+                return connection
+
+            if start is None:
+                start = time.monotonic()
+                self._metrics.waits += 1
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(condition.wait(), remaining)
+            except asyncio.TimeoutError:
+                self._metrics.wait_time += time.monotonic() - start
+                self._metrics.timeouts += 1
+                raise TimeoutError("No connection available") from None
+
+    async def release(self, connection: AsyncCommandConnection, discard: bool = False):
+        """
+        Give back a checked out connection
+        :param connection: Connection returned by acquire()
+        :param discard: Close the connection instead of reusing it, e.g. because it is in an unknown state
+        """
+        self._metrics.in_use -= 1
+        if discard or connection.writer is None:
+            await self._discard(connection)
+            return
+
+        condition = self._get_condition()
+        async with condition:
+            if not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                condition.notify()
+                return
+            self._size -= 1
+        await connection.close()
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None):
+        """
+        Check out a connection for the duration of an async with block. Connections that broke
+        while they were in use are closed instead of being reused
+        :param timeout: Maximum time to wait for a connection (in s) or None to wait forever
+        """
+        connection = await self.acquire(timeout)
+        try:
+            yield connection
+        except (OSError, asyncio.CancelledError):
+            # A cancelled task may have left a response unread
+            await self.release(connection, True)
+            raise
+        except Exception:
+            await self.release(connection)
+            raise
+        except BaseException:
+            await self.release(connection, True)
+            raise
+        await self.release(connection)
+
+    async def close(self):
+        """Close all idle connections. Connections still in use are closed when they are released"""
+        condition = self._get_condition()
+        async with condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            condition.notify_all()
+        for connection, _ in idle:
+            await connection.close()
+        await self._close_expired()
+
+    async def _discard(self, connection):
+        await connection.close()
+        condition = self._get_condition()
+        async with condition:
+            self._size -= 1
+            self._metrics.discarded += 1
+            condition.notify()
+
+    def _close_later(self, connection):
+        # Expired connections are taken while the condition is held, close them once it has been released
+        self._closing.append(connection)
+
+    async def _close_expired(self):
+        closing, self._closing = self._closing, []
+        for connection in closing:
+            await connection.close()
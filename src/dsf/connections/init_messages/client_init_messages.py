@@ -17,7 +17,7 @@ clientinitmessages holds all messages a client can send to the server to initiat
     You should have received a copy of the GNU Lesser General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import List
+from typing import List, Optional
 from .server_init_message import ServerInitMessage
 from .. import ConnectionMode, InterceptionMode, SubscriptionMode
 from ...commands.code_channel import CodeChannel
@@ -39,7 +39,7 @@ class ClientInitMessage:
 def intercept_init_message(
         intercept_mode: InterceptionMode,
         channels: List[CodeChannel],
-        filters: List[str],
+        filters: Optional[List[str]],
         priority_codes: bool,
         auto_flush: bool = True,
         auto_evaluate_expression: bool = True):
@@ -0,0 +1,198 @@
+"""
+jsonframer splits the byte stream received from the control server into single JSON objects
+"""
+import re
+import socket
+from typing import Optional, Tuple
+
+# Bytes that matter outside of JSON strings: curly braces and the start of a string
+_STRUCTURE_TOKENS = re.compile(rb'[{}"]')
+# Bytes that matter inside of JSON strings: the end of the string and escape sequences
+_STRING_TOKENS = re.compile(rb'["\\]')
+
+_OPENING_BRACE = ord("{")
+_CLOSING_BRACE = ord("}")
+_QUOTE = ord('"')
+
+
+class JsonFramer:
+    """
+    Incremental framer for a stream of concatenated JSON objects.
+    Received data is stored in a preallocated buffer that grows as needed and the scan position as well as
+    the nesting depth and string state are kept between calls, so every byte is only inspected once
+    no matter in how many parts an object arrives.
+    Data can be read from a socket directly into the buffer (see recv_into()) and framed objects can be
+    retrieved as memoryview of the buffer (see next_view()), so a message is not copied before it is parsed.
+    Braces inside of JSON strings (e.g. echo "{") are ignored.
+
+    Constructor arguments:
+    :param initial_size: Initial capacity of the buffer (in bytes)
+    """
+
+    def __init__(self, initial_size: int = 64 * 1024):
+        self._initial_size = initial_size
+        self._buffer = bytearray(initial_size)
+        # Start of the data that has not been returned as an object yet
+        self._start = 0
+        # End of the received data
+        self._end = 0
+        # Position of the next byte to inspect
+        self._position = 0
+        # Nesting depth of the object being framed (0 if none has been started yet)
+        self._depth = 0
+        # Whether the scan position is inside of a JSON string
+        self._in_string = False
+
+    def __len__(self):
+        """Number of buffered bytes that have not been returned as an object yet"""
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        """Current size of the buffer"""
+        return len(self._buffer)
+
+    @property
+    def pending(self) -> bytes:
+        """Buffered bytes that have not been returned as an object yet"""
+        return bytes(self._buffer[self._start:self._end])
+
+    def clear(self):
+        """Discard all buffered data, reset the scan state and shrink the buffer to its initial size"""
+        if len(self._buffer) != self._initial_size:
+            self._buffer = bytearray(self._initial_size)
+        self._start = self._end = self._position = 0
+        self._depth = 0
+        self._in_string = False
+
+    def reserve(self, size: int):
+        """
+        Make sure that at least size bytes can be appended to the buffer.
+        Buffered data is moved to the start of the buffer first and the buffer is only grown if that is not enough.
+        Views returned by next_view() must not be used anymore once this is called
+        """
+        buffer = self._buffer
+        if len(buffer) - self._end >= size:
+            return
+
+        start = self._start
+        if start > 0:
+            # Move the pending data to the front
+            length = self._end - start
+            with memoryview(buffer) as view:
+                view[:length] = view[start:self._end]
+            self._start = 0
+            self._end = length
+            self._position -= start
+
+        missing = size - (len(buffer) - self._end)
+        if missing > 0:
+            buffer.extend(bytes(max(missing, len(buffer))))
+
+    def feed(self, data: bytes):
+        """Append received data"""
+        self.reserve(len(data))
+        end = self._end + len(data)
+        self._buffer[self._end:end] = data
+        self._end = end
+
+    def recv_into(self, sock: socket.socket, size: int, flags: int = 0) -> int:
+        """
+        Receive up to size bytes from a socket directly into the buffer
+        :param flags: Flags passed on to socket.recv_into(), e.g. socket.MSG_DONTWAIT
+        :returns: Number of received bytes, 0 if the remote end closed the connection
+        """
+        self.reserve(size)
+        with memoryview(self._buffer)[self._end:self._end + size] as view:
+            received = sock.recv_into(view, 0, flags)
+        self._end += received
+        return received
+
+    def next_object(self) -> Optional[bytes]:
+        """
+        Return a copy of the next complete JSON object from the buffer or None if more data is needed.
+        Data preceding the first opening curly brace (e.g. whitespace) is discarded
+        """
+        bounds = self._frame()
+        if bounds is None:
+            return None
+        return bytes(self._buffer[bounds[0]:bounds[1]])
+
+    def next_view(self) -> Optional[memoryview]:
+        """
+        Return the next complete JSON object as memoryview of the buffer or None if more data is needed.
+        The view is only valid until more data is received and it must be released before the buffer grows,
+        so release it (e.g. by using it as context manager) as soon as it has been parsed
+        """
+        bounds = self._frame()
+        if bounds is None:
+            return None
+        return memoryview(self._buffer)[bounds[0]:bounds[1]]
+
+    def _frame(self) -> Optional[Tuple[int, int]]:
+        """Find the next complete JSON object and mark it as consumed, returns its start and end index"""
+        buffer = self._buffer
+        start = self._start
+        position = self._position
+        depth = self._depth
+        in_string = self._in_string
+        end = self._end
+
+        while position < end:
+            if depth == 0:
+                # Look for the start of the next object and drop anything before it
+                start = buffer.find(b"{", position, end)
+                if start < 0:
+                    start = position = end
+                    break
+                depth = 1
+                position = start + 1
+            elif in_string:
+                match = _STRING_TOKENS.search(buffer, position, end)
+                if match is None:
+                    position = end
+                    break
+                position = match.start()
+                if buffer[position] == _QUOTE:
+                    in_string = False
+                    position += 1
+                elif position + 1 < end:
+                    # Skip the escaped character
+                    position += 2
+                else:
+                    # The escaped character has not been received yet, resume at the backslash
+                    break
+            else:
+                match = _STRUCTURE_TOKENS.search(buffer, position, end)
+                if match is None:
+                    position = end
+                    break
+                position = match.start()
+                token = buffer[position]
+                position += 1
+                if token == _QUOTE:
+                    in_string = True
+                elif token == _OPENING_BRACE:
+                    depth += 1
+                elif token == _CLOSING_BRACE:
+                    depth -= 1
+                    if depth == 0:
+                        # Found a complete object, the following data starts at its end
+                        if position == end:
+                            # Nothing left, so the next data can be received at the start of the buffer
+                            self._start = self._end = self._position = 0
+                        else:
+                            self._start = self._position = position
+                        self._depth = 0
+                        self._in_string = False
+                        return start, position
+
+        if depth == 0 and start == end:
+            # Only discarded data has been buffered
+            self._start = self._end = self._position = 0
+        else:
+            self._start = start
+            self._position = position
+        self._depth = depth
+        self._in_string = in_string
+        return None
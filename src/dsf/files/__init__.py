@@ -0,0 +1,10 @@
+"""
+files provides local tools for G-code job files that work without the control server, e.g.
+
+    for path, info in get_file_infos(paths):
+        print(path, info.generated_by, info.print_time)
+"""
+from .file_index import GCodeFileIndex
+from .file_info_cache import FileInfoCache
+from .info_parser import get_file_info, get_file_infos, parse_file_info
+from .thumbnails import iter_thumbnail, read_thumbnail, ThumbnailCache
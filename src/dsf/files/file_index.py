@@ -0,0 +1,306 @@
+import bisect
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..commands.code_parser import parse_codes
+from ..exceptions import CodeParserException
+
+# Sidecar files are stored next to the G-code file with this extension
+INDEX_EXTENSION = ".dsfidx"
+
+_MAGIC = b"DSFI"
+_VERSION = 1
+# Magic, version, source size, source modification time (ns), number of layers, number of object changes,
+# length of the JSON-encoded object names
+_HEADER = struct.Struct("<4sHxxQqQQQ")
+
+# Comments written by the slicers when a new layer starts
+_LAYER_COMMENTS = (b";LAYER_CHANGE", b";LAYER:", b"; layer ")
+# Comments stating the Z height of the new layer (PrusaSlicer)
+_Z_COMMENT = b";Z:"
+
+# Letter and major number of a G/M-code, which may be followed by parameters without whitespace (e.g. G1Z.2E1)
+_COMMAND = re.compile(rb"([GgMm])(\d+)")
+# Parameters of a code, numeric values end at the next letter like in code_parser
+_PARAMETER = re.compile(rb"([A-Za-z])([-+0-9.:]*)")
+
+
+def _array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _object_change(line: bytes) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Get the object ID (S) and name (A) of an M486 code. The line is parsed by code_parser, so names may contain
+    whitespace and semicolons, e.g. M486 S0 A"Shape Box id:0 copy 0"
+    """
+    try:
+        code = parse_codes(line.decode("utf8", errors="replace"))[0]
+    except CodeParserException:
+        return None, None
+    object_id = code.parameter("S")
+    name = code.parameter("A")
+    try:
+        return (int(object_id.string_value) if object_id is not None else None,
+                name.string_value if name is not None else None)
+    except ValueError:
+        return None, None
+
+
+class GCodeFileIndex:
+    """
+    Index of the byte offsets of the layers and of the objects (M486) in a G-code file.
+    Lookups are binary searches in arrays, so resuming from a layer or skipping cancelled objects does not
+    require another scan of the file. Use build() to scan a file, save() and load() to keep the index in a
+    sidecar file and load_or_build() to do both.
+
+    Layers are taken from the layer change comments of the slicers if the file has any, otherwise a layer starts
+    whenever material is extruded at a higher Z than before. Z heights are expected to increase from layer to
+    layer. Extrusion is the total length of filament (in mm) extruded by all extruders before a layer starts.
+    """
+
+    def __init__(self, source_size: int = 0, source_mtime_ns: int = 0):
+        self.source_size = source_size
+        self.source_mtime_ns = source_mtime_ns
+        # Start offsets, Z heights and total extrusion of the layers
+        self.layer_offsets = array("q")
+        self.layer_z = array("d")
+        self.layer_extrusion = array("d")
+        # Offsets at which the current object changes and the new object ID (-1 if no object is printed)
+        self.object_offsets = array("q")
+        self.object_ids = array("i")
+        # Names of the objects by ID
+        self.object_names: Dict[int, str] = {}
+
+    @property
+    def num_layers(self) -> int:
+        return len(self.layer_offsets)
+
+    def layer_at(self, offset: int) -> int:
+        """Get the index of the layer that contains the given byte offset or -1 if it precedes the first layer"""
+        return bisect.bisect_right(self.layer_offsets, offset) - 1
+
+    def layer_offset(self, layer: int) -> int:
+        """Get the byte offset at which a layer (starting at 0) starts"""
+        return self.layer_offsets[layer]
+
+    def layer_for_z(self, z: float) -> int:
+        """Get the index of the first layer at or above the given Z height or num_layers if there is none"""
+        return bisect.bisect_left(self.layer_z, z - 1e-6)
+
+    def object_at(self, offset: int) -> int:
+        """Get the ID of the object printed at the given byte offset or -1 if none"""
+        index = bisect.bisect_right(self.object_offsets, offset) - 1
+        return self.object_ids[index] if index >= 0 else -1
+
+    def object_segments(self, object_id: int) -> List[Tuple[int, Optional[int]]]:
+        """Get the byte ranges (start, end) of an object, end is None if it extends to the end of the file"""
+        segments = []
+        for index, current in enumerate(self.object_ids):
+            if current == object_id:
+                end = self.object_offsets[index + 1] if index + 1 < len(self.object_offsets) else None
+                segments.append((self.object_offsets[index], end))
+        return segments
+
+    def next_offset(self, offset: int, cancelled_objects: Iterable[int]) -> Optional[int]:
+        """
+        Get the first byte offset at or after the given one that does not belong to a cancelled object
+        :returns: Byte offset or None if only cancelled objects follow
+        """
+        cancelled = set(cancelled_objects)
+        index = bisect.bisect_right(self.object_offsets, offset) - 1
+        if index < 0 or self.object_ids[index] not in cancelled:
+            return offset
+        for index in range(index + 1, len(self.object_ids)):
+            if self.object_ids[index] not in cancelled:
+                return self.object_offsets[index]
+        return None
+
+    def is_current(self, path: str) -> bool:
+        """Check if the index belongs to the current version of a G-code file"""
+        stat = os.stat(path)
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+
+    @classmethod
+    def build(cls, path: str) -> 'GCodeFileIndex':
+        """Scan a G-code file and build its index"""
+        stat = os.stat(path)
+        index = cls(stat.st_size, stat.st_mtime_ns)
+        # Layers found from comments and from Z moves with extrusion
+        comment_layers: List[Tuple[int, float, float]] = []
+        move_layers: List[Tuple[int, float, float]] = []
+
+        z = 0.0
+        z_offset = 0
+        last_layer_z = None
+        comment_layer_pending = False
+        relative_positions = False
+        relative_extrusion = False
+        last_e = 0.0
+        extruded = 0.0
+        current_object = -1
+
+        offset = 0
+        with open(path, "rb") as file:
+            for line in file:
+                position = offset
+                offset += len(line)
+                if line[:1] in b" \t":
+                    line = line.lstrip()
+                first = line[:1]
+                if first == b";":
+                    if line.startswith(_LAYER_COMMENTS):
+                        comment_layers.append((position, z, extruded))
+                        comment_layer_pending = True
+                    elif line.startswith(_Z_COMMENT) and comment_layers and comment_layer_pending:
+                        try:
+                            comment_layers[-1] = (comment_layers[-1][0], float(line[3:]), comment_layers[-1][2])
+                            comment_layer_pending = False
+                        except ValueError:
+                            pass
+                    continue
+                if not first or first not in b"GgMm":
+                    continue
+
+                match = _COMMAND.match(line)
+                if match is None:
+                    continue
+                command = (match.group(1).upper(), int(match.group(2)))
+                if command in ((b"G", 0), (b"G", 1)):
+                    new_z = None
+                    e = None
+                    for letter, value in _PARAMETER.findall(line.split(b";", 1)[0], match.end()):
+                        if letter in b"Zz":
+                            try:
+                                new_z = float(value)
+                            except ValueError:
+                                pass
+                        elif letter in b"Ee":
+                            try:
+                                e = float(value)
+                            except ValueError:
+                                pass
+                    if new_z is not None:
+                        z = z + new_z if relative_positions else new_z
+                        z_offset = position
+                        if comment_layer_pending:
+                            comment_layers[-1] = (comment_layers[-1][0], z, comment_layers[-1][2])
+                            comment_layer_pending = False
+                    if e is not None:
+                        amount = e if relative_extrusion else e - last_e
+                        last_e = last_e + e if relative_extrusion else e
+                        if amount > 0:
+                            if last_layer_z is None or z > last_layer_z + 1e-6:
+                                move_layers.append((z_offset, z, extruded))
+                                last_layer_z = z
+                            extruded += amount
+                elif command == (b"G", 92):
+                    for letter, value in _PARAMETER.findall(line.split(b";", 1)[0], match.end()):
+                        if letter in b"Ee":
+                            try:
+                                last_e = float(value or 0)
+                            except ValueError:
+                                pass
+                elif command == (b"G", 91):
+                    relative_positions = relative_extrusion = True
+                elif command == (b"G", 90):
+                    relative_positions = False
+                elif command == (b"M", 83):
+                    relative_extrusion = True
+                elif command == (b"M", 82):
+                    relative_extrusion = False
+                elif command == (b"M", 486):
+                    object_id, name = _object_change(line)
+                    if object_id is not None:
+                        if name is not None and object_id >= 0:
+                            index.object_names[object_id] = name
+                        if object_id != current_object:
+                            index.object_offsets.append(position)
+                            index.object_ids.append(object_id)
+                            current_object = object_id
+
+        for layer_offset, layer_z, layer_extrusion in comment_layers or move_layers:
+            index.layer_offsets.append(layer_offset)
+            index.layer_z.append(layer_z)
+            index.layer_extrusion.append(layer_extrusion)
+        return index
+
+    def save(self, path: str):
+        """Write the index to a file"""
+        names = json.dumps({str(key): value for key, value in self.object_names.items()}).encode("utf8")
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.source_size, self.source_mtime_ns, len(self.layer_offsets),
+                                    len(self.object_offsets), len(names)))
+            for values in (self.layer_offsets, self.layer_z, self.layer_extrusion, self.object_offsets,
+                           self.object_ids):
+                file.write(_to_bytes(values))
+            file.write(names)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'GCodeFileIndex':
+        """
+        Read an index from a file
+        :raises ValueError: if the file is not a valid index
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("Index file is truncated")
+        magic, version, source_size, source_mtime_ns, layers, objects, names_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Unsupported index file")
+
+        index = cls(source_size, source_mtime_ns)
+        position = _HEADER.size
+        for name, typecode, count in (("layer_offsets", "q", layers), ("layer_z", "d", layers),
+                                      ("layer_extrusion", "d", layers), ("object_offsets", "q", objects),
+                                      ("object_ids", "i", objects)):
+            size = array(typecode).itemsize * count
+            if position + size > len(data):
+                raise ValueError("Index file is truncated")
+            setattr(index, name, _array(typecode, data[position:position + size]))
+            position += size
+        names = data[position:position + names_length]
+        index.object_names = {int(key): value for key, value in json.loads(names or b"{}").items()}
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: str, index_path: Optional[str] = None) -> 'GCodeFileIndex':
+        """
+        Load the sidecar index of a G-code file or build and save it if it is missing or outdated
+        :param path: Path of the G-code file
+        :param index_path: Path of the index file, defaults to the path of the G-code file plus INDEX_EXTENSION
+        """
+        if index_path is None:
+            index_path = path + INDEX_EXTENSION
+        try:
+            index = cls.load(index_path)
+            if index.is_current(path):
+                return index
+        except (OSError, ValueError):
+            pass
+        index = cls.build(path)
+        try:
+            index.save(index_path)
+        except OSError:
+            # The directory may be read-only, the index is still usable
+            pass
+        return index
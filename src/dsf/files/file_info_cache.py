@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple, cast
+
+from .info_parser import get_file_info, get_file_infos
+from ..object_model.job import GCodeFileInfo
+
+# Default number of file infos kept in memory
+DEFAULT_CACHE_ENTRIES = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_info (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    thumbnails INTEGER NOT NULL,
+    info TEXT NOT NULL
+)
+"""
+
+
+class _Entry(NamedTuple):
+    size: int
+    mtime_ns: int
+    # Whether the thumbnail data has been read
+    thumbnails: bool
+    info: GCodeFileInfo
+
+
+class FileInfoCache:
+    """
+    Cache of G-code file information in front of the analysis of the files, either by the control server
+    (e.g. loader=connection.get_file_info) or by the local analyzer (default).
+    Entries are keyed by the resolved path of a file and invalidated when its size or modification time changes,
+    so only the files that are new or changed since the last call are analyzed again.
+    The most recently used entries are kept in memory. If a database file is given, entries are also stored
+    in SQLite so they survive restarts.
+    Cached GCodeFileInfo instances are shared between callers and must not be modified.
+
+    Constructor arguments:
+    :param loader: Callable returning the GCodeFileInfo of a file name and whether to read the thumbnail content
+    :param max_entries: Maximum number of entries kept in memory
+    :param database: Path of the SQLite database to store the entries in (optional)
+    :param resolve_path: Callable mapping a file name to the physical path that is checked for changes,
+    e.g. to map the virtual paths of the control server to the local file system
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[str, bool], GCodeFileInfo]] = None,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        database: Optional[str] = None,
+        resolve_path: Callable[[str], str] = os.path.realpath,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.loader = loader
+        self.max_entries = max_entries
+        self.resolve_path = resolve_path
+        self.hits = 0
+        self.misses = 0
+        # Hits of entries that were only found in the database
+        self.database_hits = 0
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._database: Optional[sqlite3.Connection] = None
+        if database is not None:
+            self._database = sqlite3.connect(database, check_same_thread=False)
+            with self._database:
+                self._database.execute(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        """Number of entries in memory"""
+        return len(self._entries)
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+    def get_file_info(self, file_name: str, read_thumbnail_content: bool = False) -> GCodeFileInfo:
+        """
+        Get the information about a G-code file, it is only analyzed if it is not cached or if it has changed
+        :param file_name: Name of the file as passed to the loader
+        :param read_thumbnail_content: Include the base64-encoded thumbnail data
+        :raises OSError: if the file does not exist
+        """
+        path, size, mtime_ns = self._stat(file_name)
+        info = self._lookup(path, size, mtime_ns, read_thumbnail_content)
+        if info is not None:
+            return info
+
+        if self.loader is not None:
+            info = self.loader(file_name, read_thumbnail_content)
+        else:
+            info = get_file_info(path, read_thumbnail_content)
+        self._store(path, _Entry(size, mtime_ns, read_thumbnail_content, info))
+        return info
+
+    def get_file_infos(self, file_names: Iterable[str], read_thumbnail_content: bool = False,
+                       max_workers: Optional[int] = None) -> Dict[str, GCodeFileInfo]:
+        """
+        Get the information about several G-code files, e.g. to list a directory.
+        Without a loader the files that are not cached are analyzed in parallel (see get_file_infos() of
+        dsf.files.info_parser). Files that cannot be read are left out
+        :param file_names: Names of the files as passed to the loader
+        :param read_thumbnail_content: Include the base64-encoded thumbnail data
+        :param max_workers: Number of processes to analyze files that are not cached
+        :returns: File information by file name
+        """
+        result = {}
+        missing: Dict[str, Tuple[str, int, int]] = {}
+        for file_name in file_names:
+            try:
+                path, size, mtime_ns = self._stat(file_name)
+            except OSError:
+                continue
+            info = self._lookup(path, size, mtime_ns, read_thumbnail_content)
+            if info is not None:
+                result[file_name] = info
+            else:
+                missing[file_name] = (path, size, mtime_ns)
+
+        if self.loader is not None:
+            for file_name, (path, size, mtime_ns) in missing.items():
+                try:
+                    info = self.loader(file_name, read_thumbnail_content)
+                except OSError:
+                    continue
+                self._store(path, _Entry(size, mtime_ns, read_thumbnail_content, info))
+                result[file_name] = info
+        elif missing:
+            file_names = list(missing)
+            infos = get_file_infos([missing[file_name][0] for file_name in file_names], read_thumbnail_content,
+                                   max_workers)
+            for file_name, (_, parsed) in zip(file_names, infos):
+                if isinstance(parsed, GCodeFileInfo):
+                    path, size, mtime_ns = missing[file_name]
+                    self._store(path, _Entry(size, mtime_ns, read_thumbnail_content, parsed))
+                    result[file_name] = parsed
+        return result
+
+    def invalidate(self, file_name: Optional[str] = None):
+        """Remove the entry of a file or all entries if no file name is given"""
+        with self._lock:
+            if file_name is None:
+                self._entries.clear()
+                if self._database is not None:
+                    with self._database:
+                        self._database.execute("DELETE FROM file_info")
+                return
+
+            path = self.resolve_path(file_name)
+            self._entries.pop(path, None)
+            if self._database is not None:
+                with self._database:
+                    self._database.execute("DELETE FROM file_info WHERE path = ?", (path,))
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "database_hits": self.database_hits,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "entries": len(self._entries),
+            }
+
+    def _stat(self, file_name: str) -> Tuple[str, int, int]:
+        path = self.resolve_path(file_name)
+        stat = os.stat(path)
+        return path, stat.st_size, stat.st_mtime_ns
+
+    def _lookup(self, path: str, size: int, mtime_ns: int, read_thumbnail_content: bool) -> Optional[GCodeFileInfo]:
+        with self._lock:
+            entry = self._entries.get(path)
+            from_database = False
+            if entry is None and self._database is not None:
+                row = self._database.execute("SELECT size, mtime_ns, thumbnails, info FROM file_info WHERE path = ?",
+                                             (path,)).fetchone()
+                if row is not None:
+                    entry = _Entry(row[0], row[1], bool(row[2]), cast(GCodeFileInfo, GCodeFileInfo.from_json(row[3])))
+                    from_database = True
+
+            if entry is None or entry.size != size or entry.mtime_ns != mtime_ns or \
+                    (read_thumbnail_content and not entry.thumbnails):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if from_database:
+                self.database_hits += 1
+                self._remember(path, entry)
+            else:
+                self._entries.move_to_end(path)
+            return entry.info
+
+    def _remember(self, path: str, entry: _Entry):
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, path: str, entry: _Entry):
+        with self._lock:
+            self._remember(path, entry)
+            if self._database is not None:
+                with self._database:
+                    self._database.execute(
+                        "INSERT OR REPLACE INTO file_info (path, size, mtime_ns, thumbnails, info) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (path, entry.size, entry.mtime_ns, int(entry.thumbnails), entry.info.to_json()),
+                    )
@@ -0,0 +1,292 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, cast
+
+from ..object_model.job import GCodeFileInfo
+
+# Number of bytes read from the start and the end of a file, the slicers write their summaries there
+DEFAULT_HEADER_SIZE = 64 * 1024
+DEFAULT_FOOTER_SIZE = 256 * 1024
+
+# Names of the slicers as they appear in the first comment lines
+_GENERATED_BY = (
+    re.compile(rb"^;\s*generated by\s+(.+?)(?:\s+on\s+\d{4}-\d{2}-\d{2}.*)?\s*$", re.I | re.M),
+    re.compile(rb"^;\s*Generated with\s+(.+?)\s*$", re.I | re.M),
+    re.compile(rb"^;\s*G-Code generated by\s+(.+?)\s*$", re.I | re.M),
+    re.compile(rb"^;\s*Sliced by\s+(.+?)\s*$", re.I | re.M),
+    re.compile(rb"^;\s*(KISSlicer.*?)\s*$", re.I | re.M),
+    re.compile(rb"^;\s*(Sliced (?:at|on):.*?)\s*$", re.I | re.M),
+)
+
+_LAYER_HEIGHT = (
+    re.compile(rb"^;\s*layer_height\s*=\s*([\d.]+)", re.M),                  # PrusaSlicer, SuperSlicer, OrcaSlicer
+    re.compile(rb"^;\s*Layer height\s*:\s*([\d.]+)", re.I | re.M),           # Cura, ideaMaker
+    re.compile(rb"^;\s*layerHeight\s*[,=]\s*([\d.]+)", re.M),                # Simplify3D
+    re.compile(rb"^;\s*layer_thickness_mm\s*=\s*([\d.]+)", re.M),            # KISSlicer
+)
+
+_FIRST_LAYER_HEIGHT = (
+    re.compile(rb"^;\s*first_layer_height\s*=\s*([\d.]+)", re.M),
+    re.compile(rb"^;\s*firstLayerHeight\s*[,=]\s*([\d.]+)", re.M),
+)
+
+_HEIGHT = (
+    re.compile(rb"^;\s*max_layer_z\s*=\s*([\d.]+)", re.M),                   # PrusaSlicer
+    re.compile(rb"^;\s*MAXZ\s*:\s*([\d.]+)", re.M),                          # Cura
+)
+
+_NUM_LAYERS = (
+    re.compile(rb"^;\s*LAYER_COUNT\s*:\s*(\d+)", re.M),                       # Cura
+    re.compile(rb"^;\s*total layers? count\s*=\s*(\d+)", re.I | re.M),        # PrusaSlicer, OrcaSlicer
+    re.compile(rb"^;\s*NUM_LAYERS\s*:\s*(\d+)", re.M),
+    re.compile(rb"^;\s*Layer count\s*:\s*(\d+)", re.I | re.M),                # ideaMaker
+)
+
+# Filament usage in mm, either per extruder separated by commas or one line per extruder
+_FILAMENT_MM = (
+    re.compile(rb"^;\s*filament used \[mm\]\s*=\s*([\d.,\s]+)$", re.M),       # PrusaSlicer
+    re.compile(rb"^;\s*Filament length:\s*([\d.]+)\s*mm", re.I | re.M),       # Simplify3D
+    re.compile(rb"^;\s*Material#\d+ Used:\s*([\d.]+)", re.I | re.M),          # ideaMaker
+    re.compile(rb"^;\s*Ext(?:ruder)? #?\d+\s*=\s*([\d.]+)\s*mm", re.I | re.M),  # KISSlicer
+)
+# Filament usage in m (Cura)
+_FILAMENT_M = re.compile(rb"^;\s*Filament used\s*:\s*([\d.]+m(?:\s*,\s*[\d.]+m)*)", re.I | re.M)
+
+_PRINT_TIME_SECONDS = (
+    re.compile(rb"^;\s*TIME\s*:\s*(\d+)", re.M),                              # Cura
+    re.compile(rb"^;\s*Print Time\s*:\s*(\d+)", re.I | re.M),                # ideaMaker
+    re.compile(rb"^;\s*total print time \(s\)\s*[:=]\s*(\d+)", re.I | re.M),
+)
+# Durations like 1d 2h 3m 4s or 1 hour 2 minutes
+_PRINT_TIME_TEXT = (
+    re.compile(rb"^;\s*estimated printing time(?: \(normal mode\))?\s*=\s*(.+)$", re.I | re.M),  # PrusaSlicer
+    re.compile(rb"^;\s*Build time:\s*(.+)$", re.I | re.M),                    # Simplify3D
+    re.compile(rb"^;\s*Estimated Build Time:\s*(.+)$", re.I | re.M),          # KISSlicer
+)
+_SIMULATED_TIME = re.compile(rb"^;\s*Simulated print time\s*:\s*(\d+)", re.I | re.M)
+_DURATION_PART = re.compile(rb"(\d+(?:\.\d+)?)\s*(d|h|m|s)", re.I)
+_DURATION_UNITS = {b"d": 86400, b"h": 3600, b"m": 60, b"s": 1}
+
+_THUMBNAIL_BEGIN = re.compile(rb"^;\s*thumbnail(?:_(JPG|QOI|PNG))? begin\s+(\d+)x(\d+)\s+(\d+)", re.I | re.M)
+_THUMBNAIL_FORMATS = {None: "png", b"PNG": "png", b"JPG": "jpeg", b"QOI": "qoi"}
+
+# Moves with a Z parameter and extruding moves, used to find the height if no slicer comment states it
+_Z_MOVE = re.compile(rb"^G[01]\b[^;\n]*?\bZ(-?[\d.]+)", re.I | re.M)
+_EXTRUDING_MOVE = re.compile(rb"^G1\b[^;\n]*?\bE\+?[\d.]*[1-9]", re.I | re.M)
+
+
+def _search(patterns, data: bytes) -> Optional[bytes]:
+    if not isinstance(patterns, tuple):
+        patterns = (patterns,)
+    for pattern in patterns:
+        match = pattern.search(data)
+        if match is not None:
+            return match.group(1)
+    return None
+
+
+def _search_float(patterns, *blocks: bytes) -> Optional[float]:
+    for data in blocks:
+        value = _search(patterns, data)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+
+def _parse_duration(text: bytes) -> Optional[int]:
+    """Convert a duration like 1d 2h 3m 4s or 1 hour 20 minutes to seconds"""
+    seconds = 0.0
+    found = False
+    for value, unit in _DURATION_PART.findall(text.replace(b"hour", b"h").replace(b"minute", b"m")):
+        seconds += float(value) * _DURATION_UNITS[unit[:1].lower()]
+        found = True
+    return int(seconds) if found else None
+
+
+def _find_filament(*blocks: bytes) -> List[float]:
+    for data in blocks:
+        match = _FILAMENT_M.search(data)
+        if match is not None:
+            return [float(value.strip()[:-1]) * 1000 for value in match.group(1).split(b",")]
+        for pattern in _FILAMENT_MM:
+            matches = pattern.findall(data)
+            if matches:
+                values = [value for match in matches for value in match.split(b",") if value.strip()]
+                try:
+                    return [float(value) for value in values]
+                except ValueError:
+                    continue
+    return []
+
+
+def _find_height(footer: bytes) -> float:
+    """Get the Z height of the last extruding move in the footer"""
+    last_extrusion = None
+    for match in _EXTRUDING_MOVE.finditer(footer):
+        last_extrusion = match.start()
+    height = 0.0
+    for match in _Z_MOVE.finditer(footer):
+        if last_extrusion is not None and match.start() > last_extrusion:
+            break
+        try:
+            height = float(match.group(1))
+        except ValueError:
+            pass
+    return height
+
+
+def _find_thumbnails(mm, header_size: int, read_content: bool) -> List[dict]:
+    """Find the thumbnail blocks at the start of a file. Thumbnails may exceed the header, so they are searched
+    in the memory-mapped file and the header is extended past every thumbnail found"""
+    thumbnails: List[dict] = []
+    position = 0
+    limit = min(header_size, len(mm))
+    while True:
+        match = _THUMBNAIL_BEGIN.search(mm, position, limit)
+        if match is None:
+            return thumbnails
+        image_format, width, height, size = match.groups()
+        # Data starts on the next line
+        offset = mm.find(b"\n", match.end())
+        offset = len(mm) if offset < 0 else offset + 1
+        end = mm.find(b"thumbnail", offset)
+        end = len(mm) if end < 0 else end
+        thumbnail = {
+            "format": _THUMBNAIL_FORMATS.get(image_format.upper() if image_format else None, "png"),
+            "width": int(width),
+            "height": int(height),
+            "offset": offset,
+            "size": int(size),
+            "data": None,
+        }
+        if read_content:
+            lines = mm[offset:end].split(b"\n")
+            thumbnail["data"] = b"".join(line.lstrip(b"; ").strip() for line in lines
+                                         if line.startswith(b";")).decode("ascii", errors="ignore") or None
+        thumbnails.append(thumbnail)
+        position = end
+        limit = min(max(limit, end + header_size), len(mm))
+
+
+def parse_file_info(
+    path: str,
+    read_thumbnail_content: bool = False,
+    header_size: int = DEFAULT_HEADER_SIZE,
+    footer_size: int = DEFAULT_FOOTER_SIZE,
+) -> dict:
+    """
+    Analyze a G-code file and return the file information in the JSON format of the control server
+    (see GCodeFileInfo.from_json()). Only the header and the footer of the file are read through a memory map.
+    :param path: Path of the G-code file
+    :param read_thumbnail_content: Include the base64-encoded thumbnail data
+    :param header_size: Number of bytes to analyze at the start of the file
+    :param footer_size: Number of bytes to analyze at the end of the file
+    :raises OSError: if the file cannot be read
+    """
+    stat = os.stat(path)
+    info = {
+        "fileName": path,
+        "size": stat.st_size,
+        "lastModified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        "filament": [],
+        "generatedBy": "",
+        "height": 0,
+        "layerHeight": 0,
+        "numLayers": 0,
+        "printTime": None,
+        "simulatedTime": None,
+        "thumbnails": [],
+    }
+    if stat.st_size == 0:
+        return info
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = mm[:header_size]
+        footer = mm[max(len(mm) - footer_size, header_size):] if len(mm) > header_size else b""
+        info["thumbnails"] = _find_thumbnails(mm, header_size, read_thumbnail_content)
+
+    generated_by = _search(_GENERATED_BY, header) or _search(_GENERATED_BY, footer)
+    if generated_by is not None:
+        info["generatedBy"] = generated_by.decode("utf8", errors="replace")
+
+    # Slicers write their settings either at the start or at the end of the file
+    layer_height = _search_float(_LAYER_HEIGHT, header, footer)
+    first_layer_height = _search_float(_FIRST_LAYER_HEIGHT, header, footer)
+    height = _search_float(_HEIGHT, header, footer)
+    if height is None:
+        height = _find_height(footer or header)
+    num_layers = _search_float(_NUM_LAYERS, header, footer)
+
+    if layer_height is not None:
+        info["layerHeight"] = layer_height
+    info["height"] = height
+    if num_layers is not None:
+        info["numLayers"] = int(num_layers)
+    elif layer_height and height > 0:
+        first_layer_height = first_layer_height or layer_height
+        info["numLayers"] = int(round((height - first_layer_height) / layer_height)) + 1
+
+    info["filament"] = _find_filament(footer, header)
+
+    print_time = _search_float(_PRINT_TIME_SECONDS, header, footer)
+    if print_time is None:
+        text = _search(_PRINT_TIME_TEXT, footer) or _search(_PRINT_TIME_TEXT, header)
+        print_time = _parse_duration(text) if text is not None else None
+    if print_time is not None:
+        info["printTime"] = int(print_time)
+    simulated_time = _search_float(_SIMULATED_TIME, footer, header)
+    if simulated_time is not None:
+        info["simulatedTime"] = int(simulated_time)
+    return info
+
+
+def get_file_info(path: str, read_thumbnail_content: bool = False, header_size: int = DEFAULT_HEADER_SIZE,
+                  footer_size: int = DEFAULT_FOOTER_SIZE) -> GCodeFileInfo:
+    """
+    Analyze a G-code file locally like BaseCommandConnection.get_file_info() does on the control server
+    (see parse_file_info())
+    """
+    info = parse_file_info(path, read_thumbnail_content, header_size, footer_size)
+    return cast(GCodeFileInfo, GCodeFileInfo.from_json(info))
+
+
+def _parse_or_error(args) -> Tuple[Optional[dict], Optional[BaseException]]:
+    try:
+        return parse_file_info(*args), None
+    except Exception as e:
+        return None, e
+
+
+def get_file_infos(
+    paths: Iterable[str],
+    read_thumbnail_content: bool = False,
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+    header_size: int = DEFAULT_HEADER_SIZE,
+    footer_size: int = DEFAULT_FOOTER_SIZE,
+) -> Iterator[Tuple[str, Union[GCodeFileInfo, BaseException]]]:
+    """
+    Analyze many G-code files in parallel on a process pool
+    :param paths: Paths of the G-code files
+    :param read_thumbnail_content: Include the base64-encoded thumbnail data
+    :param max_workers: Number of processes, defaults to the number of CPUs
+    :param chunksize: Number of files handed to a process at once
+    :param header_size: Number of bytes to analyze at the start of each file
+    :param footer_size: Number of bytes to analyze at the end of each file
+    :returns: Iterator of the paths and their file information in the order of the paths. If a file
+    could not be analyzed, the exception is returned instead
+    """
+    paths = list(paths)
+    arguments = [(path, read_thumbnail_content, header_size, footer_size) for path in paths]
+    with ProcessPoolExecutor(max_workers) as executor:
+        for path, (info, error) in zip(paths, executor.map(_parse_or_error, arguments, chunksize=chunksize)):
+            if info is None:
+                yield path, cast(BaseException, error)
+            else:
+                yield path, cast(GCodeFileInfo, GCodeFileInfo.from_json(info))
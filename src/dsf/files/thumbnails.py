@@ -0,0 +1,148 @@
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Iterator, Optional
+
+from ..object_model.job import ThumbnailInfo, ThumbnailInfoFormat
+
+# Number of base64 characters decoded at once, a multiple of 4 so that every chunk can be decoded on its own
+_CHUNK_SIZE = 64 * 1024
+
+_EXTENSIONS = {
+    ThumbnailInfoFormat.PNG: ".png",
+    ThumbnailInfoFormat.JPEG: ".jpg",
+    ThumbnailInfoFormat.QOI: ".qoi",
+}
+
+
+def _base64_lines(stream: BinaryIO, size: int) -> Iterator[bytes]:
+    """Yield the base64 characters of the thumbnail lines (e.g. '; iVBORw0...') following the current position"""
+    remaining = size
+    while remaining > 0:
+        line = stream.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line.startswith(b";"):
+            break
+        data = line.lstrip(b"; \t")
+        if data.startswith(b"thumbnail"):
+            # End marker of the thumbnail block
+            break
+        data = data[:remaining]
+        remaining -= len(data)
+        yield data
+    if remaining > 0:
+        raise ValueError(f"Thumbnail data is incomplete, {remaining} of {size} characters are missing")
+
+
+def iter_thumbnail(path: str, thumbnail: ThumbnailInfo) -> Iterator[bytes]:
+    """
+    Read a thumbnail from a G-code file and decode it chunk by chunk
+    :param path: Path of the G-code file
+    :param thumbnail: Thumbnail as found by the file info parser, only its offset and size are used
+    :returns: Iterator of decoded image data
+    :raises ValueError: if the thumbnail data is incomplete
+    """
+    with open(path, "rb") as stream:
+        stream.seek(thumbnail.offset)
+        pending = b""
+        for data in _base64_lines(stream, thumbnail.size):
+            pending += data
+            if len(pending) >= _CHUNK_SIZE:
+                cut = len(pending) - len(pending) % 4
+                yield base64.b64decode(pending[:cut])
+                pending = pending[cut:]
+        if pending:
+            yield base64.b64decode(pending)
+
+
+def read_thumbnail(path: str, thumbnail: ThumbnailInfo) -> bytes:
+    """
+    Read a thumbnail from a G-code file, only the thumbnail itself is read from the file
+    :param path: Path of the G-code file
+    :param thumbnail: Thumbnail as found by the file info parser, only its offset and size are used
+    :returns: Decoded image data
+    :raises ValueError: if the thumbnail data is incomplete
+    """
+    return b"".join(iter_thumbnail(path, thumbnail))
+
+
+class ThumbnailCache:
+    """
+    Cache of decoded thumbnails on disk. Images are stored as files named after the resolved path and the
+    modification time of the G-code file and the offset of the thumbnail, so the images of changed files are
+    decoded again. Use get_path() to serve the images directly from the cache directory.
+
+    Constructor arguments:
+    :param directory: Directory to store the decoded images in, it is created if it does not exist
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _file_name(self, path: str, thumbnail: ThumbnailInfo) -> str:
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        key = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{thumbnail.offset}\0{thumbnail.size}"
+        digest = hashlib.sha1(key.encode("utf8", errors="surrogateescape")).hexdigest()
+        return os.path.join(self.directory, digest + _EXTENSIONS.get(thumbnail.format, ".img"))
+
+    def get_path(self, path: str, thumbnail: ThumbnailInfo) -> str:
+        """
+        Get the path of the decoded image, it is read from the G-code file if it is not cached yet
+        :param path: Path of the G-code file
+        :param thumbnail: Thumbnail as found by the file info parser
+        :raises OSError: if the G-code file cannot be read
+        :raises ValueError: if the thumbnail data is incomplete
+        """
+        file_name = self._file_name(path, thumbnail)
+        if os.path.exists(file_name):
+            with self._lock:
+                self.hits += 1
+            return file_name
+
+        with self._lock:
+            self.misses += 1
+        # Write to a temporary file first so that concurrent readers never see a partial image
+        descriptor, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                for data in iter_thumbnail(path, thumbnail):
+                    file.write(data)
+            os.replace(temp_name, file_name)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        return file_name
+
+    def get(self, path: str, thumbnail: ThumbnailInfo) -> bytes:
+        """
+        Get a decoded thumbnail, it is read from the G-code file if it is not cached yet
+        :param path: Path of the G-code file
+        :param thumbnail: Thumbnail as found by the file info parser
+        :raises OSError: if the G-code file cannot be read
+        :raises ValueError: if the thumbnail data is incomplete
+        """
+        with open(self.get_path(path, thumbnail), "rb") as file:
+            return file.read()
+
+    def clear(self, older_than: Optional[float] = None):
+        """
+        Delete cached images
+        :param older_than: Only delete images that have not been modified for this number of seconds
+        """
+        deadline = None if older_than is None else time.time() - older_than
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and (deadline is None or entry.stat().st_mtime < deadline):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
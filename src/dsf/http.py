@@ -1,11 +1,12 @@
 import asyncio
-import json
 import os
-from concurrent.futures import ThreadPoolExecutor
+import threading
 from enum import Enum
+from typing import Optional, Set
 
 from . import DEFAULT_BACKLOG
 from .object_model import HttpEndpointType
+from .utility import json_codec
 
 
 class HttpResponseType(str, Enum):
@@ -80,7 +81,7 @@ class HttpEndpointConnection:
     async def receive(self, cls):
         """Receive a deserialized object"""
         json_string = await self.receive_json()
-        return cls.from_json(json.loads(json_string))
+        return cls.from_json(json_codec.loads(json_string))
 
     async def receive_json(self):
         """Receive a JSON object"""
@@ -91,15 +92,86 @@ class HttpEndpointConnection:
 
     async def send(self, obj):
         """Send an arbitrary object"""
-        json_string = json.dumps(obj, default=lambda o: o.__dict__)
+        json_bytes = json_codec.dumps(obj, default=lambda o: o.__dict__)
         if self.debug:
-            print("send:", json_string)
-        self.writer.write(json_string.encode("utf8"))
+            print("send:", json_bytes.decode("utf8"))
+        self.writer.write(json_bytes)
         await self.writer.drain()
 
 
+class EventLoopThread:
+    """
+    Event loop running in a background thread that is shared by the HTTP endpoints of synchronous connections.
+    The thread is started when the first endpoint acquires the loop and stopped when the last one releases it
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Event loop of the thread or None if it is not running"""
+        return self._loop
+
+    def acquire(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop and start it if necessary"""
+        with self._lock:
+            self._users += 1
+            loop = self._loop
+            if loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(loop, started), name="dsf-http-endpoints", daemon=True
+                )
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return loop
+
+    def release(self):
+        """Release the event loop, it is stopped once it is no longer used"""
+        with self._lock:
+            self._users -= 1
+            if self._users > 0 or self._loop is None:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        assert thread is not None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join()
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+            # Cancel the connections that are still being handled
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
+# Event loop shared by the endpoints that are not attached to a loop of the caller
+_shared_loop = EventLoopThread()
+
+
 class HttpEndpointUnixSocket:
-    """Class for dealing with custom HTTP endpoints"""
+    """
+    Class for dealing with custom HTTP endpoints.
+    The UNIX socket is served on the event loop passed to the constructor. If no loop is passed, the event loop
+    running in the calling thread is used or, if there is none, an event loop in a background thread that is
+    shared by all endpoints. Connection handlers are run on the same loop, so they must not block it
+    """
 
     def __init__(
         self,
@@ -109,8 +181,13 @@ class HttpEndpointUnixSocket:
         socket_file: str,
         backlog: int = DEFAULT_BACKLOG,
         debug: bool = False,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
     ):
-        """Open a new UNIX socket on the given file path"""
+        """
+        Open a new UNIX socket on the given file path.
+        If the loop runs in another thread, this waits until the socket is listening
+        :raises OSError: if the socket cannot be opened
+        """
         self.endpoint_type = endpoint_type
         self.namespace = namespace
         self.endpoint_path = path
@@ -118,8 +195,17 @@ class HttpEndpointUnixSocket:
         self.backlog = backlog
         self.handler = None
         self.debug = debug
-        self._loop = None
-        self._server = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._closed = False
+
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+        self._shared = loop is None
+        self._loop: asyncio.AbstractEventLoop = _shared_loop.acquire() if loop is None else loop
 
         try:
             os.remove(self.socket_file)
@@ -128,40 +214,91 @@ class HttpEndpointUnixSocket:
             # TODO: should we care about deletion failed?
             pass
 
-        self.executor = ThreadPoolExecutor(max_workers=1)
-        self.event_loop = self.executor.submit(self.start_connection_listener)
+        self._started = asyncio.run_coroutine_threadsafe(self._start_server(), self._loop)
+        if self._loop.is_running() and not self._in_loop_thread():
+            try:
+                self._started.result()
+            except BaseException:
+                self._release_loop()
+                raise
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop serving this endpoint"""
+        return self._loop
+
+    async def wait_started(self):
+        """
+        Wait until the socket is listening, useful if the endpoint was created on the thread of its loop
+        :raises OSError: if the socket cannot be opened
+        """
+        await asyncio.wrap_future(self._started)
 
     def close(self):
-        """Close the socket connection"""
-        if self._loop is not None:
-            # TODO: this enables correctly ending the loop. Why?
-            self._loop.set_debug(True)
-            self._server.close()
-            self._loop.stop()
-        self.event_loop.cancel()
-        self.executor.shutdown(wait=False)
+        """
+        Close the socket and cancel the connections that are still being handled.
+        If called from another thread than the one of the loop, this waits until the socket is closed
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._in_loop_thread() and self._started.done():
+            self._close_server_now()
+        else:
+            closed = asyncio.run_coroutine_threadsafe(self._close_server(), self._loop)
+            if self._loop.is_running() and not self._in_loop_thread():
+                closed.result()
         try:
             os.remove(self.socket_file)
         except FileNotFoundError:
             pass
+        self._release_loop()
 
     def set_endpoint_handler(self, handler):
         """Set the handler to handle client connections"""
         self.handler = handler
 
-    def start_connection_listener(self):
+    def _in_loop_thread(self) -> bool:
         try:
-            self._loop = asyncio.new_event_loop()
-            self._server = asyncio.start_unix_server(
-                self.handle_connection, self.socket_file, backlog=self.backlog
-            )
-            self._loop.create_task(self._server)
-            self._loop.run_forever()
-        finally:
-            self._loop.close()
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _release_loop(self):
+        if self._shared:
+            self._shared = False
+            _shared_loop.release()
+
+    async def _start_server(self):
+        self._server = await asyncio.start_unix_server(
+            self.handle_connection, self.socket_file, backlog=self.backlog
+        )
+
+    async def _close_server(self):
+        try:
+            await asyncio.wrap_future(self._started)
+        except (Exception, asyncio.CancelledError):
+            # The socket could not be opened
+            return
+        self._close_server_now()
+
+    def _close_server_now(self):
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._connections):
+            task.cancel()
 
     async def handle_connection(self, reader, writer):
         """Handle incoming UNIX socket connections (HTTP/WebSocket requests)"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await self._handle_connection(reader, writer)
+        finally:
+            self._connections.discard(task)
+
+    async def _handle_connection(self, reader, writer):
         http_endpoint_connection = HttpEndpointConnection(
             reader,
             writer,
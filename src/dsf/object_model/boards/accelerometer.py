@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class Accelerometer(ModelObject):
     """This represents an accelerometer"""
+
+    __slots__ = ('_orientation', '_points', '_runs')
+
     def __init__(self):
         super(Accelerometer, self).__init__()
         # Orientation of the accelerometer
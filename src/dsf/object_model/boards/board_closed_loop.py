@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class BoardClosedLoop(ModelObject):
     """This represents information about closed-loop tuning"""
+
+    __slots__ = ('_points', '_runs')
+
     def __init__(self):
         super(BoardClosedLoop, self).__init__()
         # Number of collected data points in the last run or 0 if it failed
@@ -37,6 +37,14 @@ class BoardState(str, Enum):
 class Board(ModelObject):
     """Information about a connected board"""
 
+    __slots__ = (
+        '_accelerometer', '_bootloader_file_name', '_can_address', '_closed_loop', '_direct_display', '_drivers',
+        '_firmware_date', '_firmware_file_name', '_firmware_name', '_firmware_version', '_free_ram',
+        '_iap_file_name_SBC', '_iap_file_name_SD', '_inductive_sensor', '_max_heaters', '_max_motors', '_mcu_temp',
+        '_name', '_short_name', '_state', '_supports_12864', '_supports_direct_display', '_unique_id', '_v_12', '_v_in',
+        '_wifi_firmware_file_name'
+    )
+
     # Accelerometer of this board or None if unknown
     accelerometer = wrap_model_property('accelerometer', Accelerometer)
     # Closed loop data of this board or None if unknown
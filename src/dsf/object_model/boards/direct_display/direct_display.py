@@ -8,6 +8,8 @@ from ...utils import wrap_model_property
 class DirectDisplay(ModelObject):
     """Class providing information about a connected direct-connect display"""
 
+    __slots__ = ('_encoder', '_screen')
+
     encoder = wrap_model_property('encoder', DirectDisplayEncoder)
 
     def __init__(self):
@@ -4,6 +4,8 @@ from ...model_object import ModelObject
 class DirectDisplayEncoder(ModelObject):
     """Class providing information about a connected display encoder"""
 
+    __slots__ = ('_pulses_per_click',)
+
     def __init__(self):
         super().__init__()
         # Number of pulses per click of the rotary encoder
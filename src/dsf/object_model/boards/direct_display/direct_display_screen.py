@@ -7,6 +7,8 @@ from ...model_object import ModelObject
 class DirectDisplayScreen(ModelObject):
     """Class providing information about a connected display screen"""
 
+    __slots__ = ('_colour_bits', '_controller', '_height', '_spi_freq', '_width')
+
     def __init__(self, controller=DirectDisplayController.ST7920):
         super().__init__()
         # Number of colour bits
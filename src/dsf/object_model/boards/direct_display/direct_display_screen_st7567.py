@@ -5,6 +5,8 @@ from .direct_display_controller import DirectDisplayController
 class DirectDisplayScreenST7567(DirectDisplayScreen):
     """Direct-connected display screen with a ST7567 controller"""
 
+    __slots__ = ('_contrast', '_resistor_ratio')
+
     def __init__(self):
         super().__init__(controller=DirectDisplayController.ST7567)
         # Configured contrast
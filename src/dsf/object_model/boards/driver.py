@@ -6,6 +6,8 @@ from ..utils import wrap_model_property
 class Driver(ModelObject):
     """Information about a driver"""
 
+    __slots__ = ('_closed_loop', '_status')
+
     # Closed-loop settings (if applicable)
     closed_loop = wrap_model_property('closed_loop', DriverClosedLoop)
 
@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class ClosedLoopCurrentFraction(ModelObject):
     """Information about the current fraction of the closed-loop configuration"""
+
+    __slots__ = ('_avg', '_max')
+
     def __init__(self):
         super(ClosedLoopCurrentFraction, self).__init__()
         # Average fraction
@@ -31,6 +34,9 @@ class ClosedLoopCurrentFraction(ModelObject):
 
 class ClosedLoopPositionError(ModelObject):
     """Information about the current fraction of the closed-loop configuration"""
+
+    __slots__ = ('_max', '_rms')
+
     def __init__(self):
         super(ClosedLoopPositionError, self).__init__()
         # Maximum position error
@@ -59,6 +65,9 @@ class ClosedLoopPositionError(ModelObject):
 
 class DriverClosedLoop(ModelObject):
     """This represents information about closed-loop tuning"""
+
+    __slots__ = ('_current_fraction', '_position_error')
+
     def __init__(self):
         super(DriverClosedLoop, self).__init__()
         # Current fraction
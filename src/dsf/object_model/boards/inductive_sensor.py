@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class InductiveSensor(ModelObject):
     """"""
 
+    __slots__ = ()
+
     def __init__(self):
         super(InductiveSensor, self).__init__()
         # still empty
@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class MinMaxCurrent(ModelObject):
     """Provides minimum, maximum and current values"""
 
+    __slots__ = ('_current', '_min', '_max')
+
     def __init__(self):
         super(MinMaxCurrent, self).__init__()
         # Current value (mA)
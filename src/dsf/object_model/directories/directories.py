@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class Directories(ModelObject):
     """Information about the configured directories"""
+
+    __slots__ = ('_filaments', '_firmware', '_g_codes', '_macros', '_menu', '_system', '_web')
+
     def __init__(self):
         super().__init__()
         # Path to the filaments directory
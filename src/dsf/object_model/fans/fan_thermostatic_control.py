@@ -5,6 +5,9 @@ from ...utils import deprecated
 
 class FanThermostaticControl(ModelObject):
     """Thermostatic parameters of a fan"""
+
+    __slots__ = ('_heaters', '_high_temperature', '_low_temperature', '_sensors')
+
     def __init__(self):
         super().__init__()
         # List of the heaters to monitor (indices)
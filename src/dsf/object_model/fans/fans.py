@@ -4,6 +4,12 @@ from ..model_object import ModelObject
 
 class Fan(ModelObject):
     """Class representing information about an attached fan"""
+
+    __slots__ = (
+        '_actual_value', '_blip', '_frequency', '_max', '_min', '_name', '_requested_value', '_rpm', '_tacho_ppr',
+        '_thermostatic'
+    )
+
     def __init__(self):
         super().__init__()
         # Value of this fan (0..1 or -1 if unknown)
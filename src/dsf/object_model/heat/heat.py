@@ -8,6 +8,10 @@ from ..model_object import ModelObject
 class Heat(ModelObject):
     """Information about the heat subsystem"""
 
+    __slots__ = (
+        '_bed_heaters', '_chamber_heaters', '_cold_extrude_temperature', '_cold_retract_temperature', '_heaters'
+    )
+
     def __init__(self):
         super().__init__()
         # List of configured bed heaters (indices)
@@ -31,6 +31,12 @@ class HeaterState(str, Enum):
 
 class Heater(ModelObject):
     """Information about a heater"""
+
+    __slots__ = (
+        '_active', '_avg_pwm', '_current', '_max', '_max_bad_readings', '_max_heating_fault_time',
+        '_max_temp_excursion', '_min', '_model', '_monitors', '_sensor', '_standby', '_state'
+    )
+
     def __init__(self):
         super().__init__()
         # Active temperature of the heater (in C)
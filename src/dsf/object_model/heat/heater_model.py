@@ -5,6 +5,11 @@ from .heater_model_pid import HeaterModelPID
 class HeaterModel(ModelObject):
     """Information about the way the heater heats up"""
 
+    __slots__ = (
+        '_cooling_exp', '_cooling_rate', '_dead_time', '_enabled', '_fan_cooling_rate', '_heating_rate', '_inverted',
+        '_max_pwm', '_pid', '_standard_voltage'
+    )
+
     def __init__(self):
         super().__init__()
         # Cooling rate exponent
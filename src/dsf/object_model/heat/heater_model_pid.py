@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class HeaterModelPID(ModelObject):
     """Details about the PID model of a heater"""
 
+    __slots__ = ('_d', '_i', '_overridden', '_p', '_used')
+
     def __init__(self):
         super().__init__()
         # Derivative value of the PID regulator
@@ -36,6 +36,8 @@ class HeaterMonitorCondition(str, Enum):
 class HeaterMonitor(ModelObject):
     """Information about a heater monitor"""
 
+    __slots__ = ('_action', '_condition', '_limit', '_sensor')
+
     def __init__(self):
         super().__init__()
         # Action to perform when the trigger condition is met
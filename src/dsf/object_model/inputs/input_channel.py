@@ -7,6 +7,12 @@ from ...commands.code_channel import CodeChannel
 
 class InputChannel(ModelObject):
     """Information about a G/M/T-code channel"""
+
+    __slots__ = (
+        '_active', '_axes_relative', '_compatibility', '_distance_unit', '_drives_relative', '_feed_rate', '_in_macro',
+        '_inverse_time_mode', '_macro_restartable', '_motion_system', '_name', '_selected_plane', '_stack_depth',
+        '_state', '_line_number', '_volumetric'
+    )
     
     def __init__(self):
         super().__init__()
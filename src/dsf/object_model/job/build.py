@@ -7,6 +7,9 @@ from ..model_object import ModelObject
 
 class Build(ModelObject):
     """Information about the current build"""
+
+    __slots__ = ('_current_object', '_m486_names', '_m486_numbers', '_objects')
+
     def __init__(self):
         super().__init__()
         # Index of the current object being printed or -1 if unknown
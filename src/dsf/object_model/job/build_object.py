@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class BuildObject(ModelObject):
     """Information about a detected build object"""
 
+    __slots__ = ('_canceled', '_name', '_x', '_y')
+
     def __init__(self):
         super().__init__()
         # Indicates if this build object is cancelled
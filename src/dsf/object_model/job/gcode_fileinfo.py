@@ -9,6 +9,11 @@ from ..model_object import ModelObject
 class GCodeFileInfo(ModelObject):
     """Holds information about a parsed G-code file"""
 
+    __slots__ = (
+        '_filament', '_file_name', '_generated_by', '_height', '_last_modified', '_layer_height', '_num_layers',
+        '_print_time', '_simulated_time', '_size', '_thumbnails'
+    )
+
     def __init__(self):
         super().__init__()
         self._filament = []
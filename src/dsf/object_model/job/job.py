@@ -12,6 +12,12 @@ from ..utils import wrap_model_property
 class Job(ModelObject):
     """Information about the current job"""
 
+    __slots__ = (
+        '_build', '_duration', '_file', '_file_position', '_last_duration', '_last_file_aborted',
+        '_last_file_cancelled', '_last_file_name', '_last_file_simulated', '_last_warm_up_duration', '_layer',
+        '_layers', '_layer_time', '_pause_duration', '_raw_extrusion', '_times_left', '_warm_up_duration'
+    )
+
     # Information about the current build or None if not available
     build = wrap_model_property('build', Build)
     # Information about the file being processed
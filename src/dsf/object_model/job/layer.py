@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class Layer(ModelObject):
     """Information about a layer from a file being printed"""
 
+    __slots__ = ('_duration', '_filament', '_fraction_printed', '_height', '_temperatures')
+
     def __init__(self):
         super().__init__()
         # Duration of the layer (in s)
@@ -19,6 +19,8 @@ class ThumbnailInfoFormat(str, Enum):
 class ThumbnailInfo(ModelObject):
     """Information about a thumbnail from a G-code file"""
 
+    __slots__ = ('_data', '_format', '_height', '_offset', '_size', '_width')
+
     def __init__(self):
         super().__init__()
         # Base64-encoded thumbnail or null if invalid or not requested
@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class TimesLeft(ModelObject):
     """Estimations about the times left"""
 
+    __slots__ = ('_filament', '_file', '_slicer')
+
     def __init__(self):
         super().__init__()
         # Time left based on filament consumption (in s or null)
@@ -20,6 +20,8 @@ class LedStripType(str, Enum):
 class LedStrip(ModelObject):
     """Type of this LED strip"""
 
+    __slots__ = ('_board', '_pin', '_stop_movement', '_type')
+
     def __init__(self):
         super().__init__()
         # Board address of the corresponding pin
@@ -6,6 +6,13 @@ from ..model_object import ModelObject
 class Limits(ModelObject):
     """Machine configuration limits"""
 
+    __slots__ = (
+        '_axes', '_axes_plus_extruders', '_bed_heaters', '_boards', '_chamber_heaters', '_drivers', '_drivers_per_axis',
+        '_extruders', '_extruders_per_tool', '_fans', '_gp_in_ports', '_gp_out_ports', '_heaters', '_heaters_per_tool',
+        '_led_strips', '_monitors_per_heater', '_ports_per_heater', '_restore_points', '_sensors', '_spindles',
+        '_tools', '_tracked_objects', '_triggers', '_volumes', '_workplaces', '_z_probe_program_bytes', '_z_probes'
+    )
+
     def __init__(self):
         super().__init__()
         # Maximum number of axes or null if unknown
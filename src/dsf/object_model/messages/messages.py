@@ -26,6 +26,8 @@ class Message(ModelObject):
     :param msg_type: Type of this message
     """
 
+    __slots__ = ('_content', '_time', '_type')
+
     @classmethod
     def from_json(cls, data):
         """Deserialize an instance of this class from JSON deserialized dictionary"""
@@ -1,23 +1,103 @@
 import json
 from datetime import datetime
-from typing import Union
+from typing import Dict, FrozenSet, Tuple, Union
 
 
 from .utils import is_model_object
+from ..utility import json_codec
 from ..utils import preserve_builtin, camel_to_snake, snake_to_camel
 
 
-class FloatJSON(float):
-    # Remove trailing zeros from float numbers
-    __repr__ = staticmethod(lambda o: f'{o:g}')
+def _strip_float_zeros(value):
+    """Remove trailing zeros from float numbers (e.g. 1.0 => 1) in the given value and its list or dict items
+    This replaces values instead of patching the float formatting of the json module, so the
+    C accelerated encoder remains available"""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, list):
+        return [_strip_float_zeros(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _strip_float_zeros(item) for key, item in value.items()}
+    return value
 
 
-json.encoder.c_make_encoder = None
-json.encoder.float = FloatJSON
+class _ModelSchema:
+    """Maps the JSON keys of a model class to the properties or protected attributes they update.
+    It is computed once per class and filled lazily as new keys are encountered"""
+
+    __slots__ = ('_writeable_properties', '_transient_attributes', '_keys', 'slots', 'has_dict', 'json_slots')
+
+    def __init__(self, cls):
+        # Get the class writeable properties including from inherited classes
+        # (the ones which have a setter -> fset property object attribute)
+        cls_dict = {attr: getattr(cls, attr) for attr in dir(cls)}
+        self._writeable_properties = frozenset(attr for attr, value in cls_dict.items()
+                                               if isinstance(value, property) and value.fset is not None)
+        self._keys = {}
+        # Attributes stored in the slots of the class and its bases
+        self.slots = frozenset(name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ())
+                               if name not in ('__dict__', '__weakref__'))
+        # Whether instances have a __dict__ because the class or one of its bases does not define __slots__
+        self.has_dict = cls.__dictoffset__ != 0
+        # Slots to serialize and their JSON keys, 'globals' is converted back to 'global'
+        transient_attributes = getattr(cls, '_transient_attributes', ())
+        self._transient_attributes = frozenset(transient_attributes)
+        self.json_slots = tuple((name, snake_to_camel(name if name != '_globals' else '_global'))
+                                for name in sorted(self.slots) if name not in transient_attributes)
+
+    def get(self, json_key: str) -> Tuple[str, bool]:
+        """Get the attribute name for the given JSON key and whether it is a writeable property"""
+        entry = self._keys.get(json_key)
+        if entry is None:
+            # Convert JSON attributes from CamelCase to snake_case to satisfy python PEP8 naming
+            # Remove trailing underscore set by preserve_builtin()
+            json_key_snake = camel_to_snake(json_key.rstrip('_'))
+            if f"_{json_key_snake}" in self._transient_attributes:
+                # Transient attributes are not part of the object model and must never be updated from JSON
+                entry = ('', False)
+            elif json_key_snake in self._writeable_properties:
+                entry = (json_key_snake, True)
+            else:
+                # Protected (non-writeable) attributes are prefixed by an underscore
+                entry = (f"_{json_key_snake}", False)
+            self._keys[json_key] = entry
+        return entry
+
+
+# Schemas of the model classes that have been updated from JSON so far
+_schemas: Dict[type, _ModelSchema] = {}
+
+
+def _get_schema(cls) -> _ModelSchema:
+    schema = _schemas.get(cls)
+    if schema is None:
+        schema = _schemas[cls] = _ModelSchema(cls)
+    return schema
+
+
+def _instance_attributes(obj) -> dict:
+    """Get the instance attributes of an object, including the ones stored in slots"""
+    schema = _get_schema(obj.__class__)
+    if not schema.slots:
+        return vars(obj)
+    attributes = dict(vars(obj)) if schema.has_dict else {}
+    for name in schema.slots:
+        try:
+            attributes[name] = getattr(obj, name)
+        except AttributeError:
+            # Slot has not been assigned
+            pass
+    return attributes
 
 
 class ModelObject:
-    """Base class for object model classes"""
+    """Base class for object model classes
+    Subclasses declare their attributes in __slots__ to keep large models compact"""
+
+    __slots__ = ()
+
+    # Instance attributes that are not part of the object model and must not be serialized
+    _transient_attributes: FrozenSet[str] = frozenset()
 
     def __init__(self, *args, **kwargs):
         pass
@@ -33,46 +113,47 @@ class ModelObject:
 
         if isinstance(obj, datetime):
             return obj.isoformat()
-        if isinstance(obj, float):
-            return f'{obj:g}'
         if isinstance(obj, SbcPermissions):
             return obj.name
         if isinstance(obj, DriverId):
             return str(obj)
 
+        schema = _get_schema(obj.__class__)
+        if not schema.has_dict:
+            try:
+                return {json_key: _strip_float_zeros(getattr(obj, name)) for name, json_key in schema.json_slots}
+            except AttributeError:
+                # Not all slots have been assigned
+                pass
+
         # Convert snake_case class attributes into CamelCase JSON style
         # also convert back 'globals' to 'global'
-        return {snake_to_camel(k if k != '_globals' else '_global'): v for k, v in obj.__dict__.items()}
+        transient_attributes = getattr(obj, '_transient_attributes', ())
+        return {snake_to_camel(k if k != '_globals' else '_global'): _strip_float_zeros(v)
+                for k, v in _instance_attributes(obj).items() if k not in transient_attributes}
 
     def _update_from_json(self, **kwargs) -> 'ModelObject':
         """Update this instance from a given JSON element
         This method iterate over all writeable properties to update them.
         It means classes with get-only properties should override this method in order to update them.
         """
-        # Get the class writeable properties including from inherited classes
-        # (the ones which have a setter -> fset property object attribute)
-        cls_dict = {attr: getattr(self.__class__, attr) for attr in dir(self.__class__)}
-        writeable_properties = [attr for attr, value in cls_dict.items()
-                                if isinstance(value, property) and value.fset is not None]
-        instance_attributes = vars(self)
+        schema = _get_schema(self.__class__)
+        instance_attributes = vars(self) if schema.has_dict else {}
         for json_key, json_value in kwargs.items():
-            # Convert JSON attributes from CamelCase to snake_case to satisfy python PEP8 naming
-            # Remove trailing underscore set by preserve_builtin()
-            json_key_snake = camel_to_snake(json_key.rstrip('_'))
+            attr_name, is_property = schema.get(json_key)
             # Write public attributes by using their setter property
-            if json_key_snake in writeable_properties:
-                attr = getattr(self, json_key_snake)
+            if is_property:
+                attr = getattr(self, attr_name)
                 if is_model_object(attr):
                     new_value = attr.update_from_json(json_value)
-                    setattr(self, json_key_snake, new_value)
+                    setattr(self, attr_name, new_value)
                 else:
-                    setattr(self, json_key_snake, json_value)
+                    setattr(self, attr_name, json_value)
             # Write protected attributes
-            elif f"_{json_key_snake}" in instance_attributes:
-                # Protected (non-writeable) attributes are prefixed by an underscore
-                attr_name = f"_{json_key_snake}"
-                attr = getattr(self, attr_name)
-                if is_model_object(attr):
+            elif attr_name in schema.slots or attr_name in instance_attributes:
+                # Slots are unset until the constructor assigns them
+                attr = getattr(self, attr_name, None)
+                if attr is not None and is_model_object(attr):
                     setattr(self, attr_name, attr.update_from_json(json_value))
                 elif isinstance(attr, list):
                     setattr(self, attr_name, json_value)
@@ -82,14 +163,14 @@ class ModelObject:
     def from_json(cls, data: Union[dict, str]) -> 'ModelObject':
         """Deserialize a new instance of this class from JSON deserialized dictionary"""
         # Deserialize a string object into a JSON (dict) object
-        if isinstance(data, str):
-            data = json.loads(data)
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = json_codec.loads(data)
         return cls()._update_from_json(**preserve_builtin(data))
 
     def update_from_json(self, data: Union[dict, str]):
         """Update the current instance of this class from JSON deserialized dictionary"""
-        if isinstance(data, str):
-            data = json.loads(data)
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = json_codec.loads(data)
         return self._update_from_json(**preserve_builtin(data))
 
     def to_json(self) -> str:
@@ -0,0 +1,60 @@
+from typing import Set
+
+
+def get_changed_paths(patch: dict, prefix: str = "") -> Set[str]:
+    """
+    Get the paths of the values changed by an object model patch
+    Paths use the JSON keys separated by dots and the indices of list items in brackets,
+    e.g. heat.heaters[0].current. Like in DCS patches, empty objects are treated as unchanged
+    and lists that do not contain objects are reported as a single value.
+    Only the patch is walked, so the cost depends on the size of the patch and not on the size of the model.
+    :param patch: Deserialized JSON patch
+    :param prefix: Path of the object the patch applies to
+    :returns: Set of the changed paths
+    """
+    paths: Set[str] = set()
+    _collect_paths(patch, prefix, paths)
+    return paths
+
+
+def _collect_paths(element, path: str, paths: Set[str]):
+    if isinstance(element, dict):
+        for key, value in element.items():
+            _collect_paths(value, f"{path}.{key}" if path else key, paths)
+    elif isinstance(element, list) and any(isinstance(item, dict) for item in element):
+        for index, item in enumerate(element):
+            if isinstance(item, dict):
+                _collect_paths(item, f"{path}[{index}]", paths)
+            else:
+                paths.add(f"{path}[{index}]")
+    else:
+        paths.add(path)
+
+
+def merge_patch(target: dict, patch: dict) -> dict:
+    """
+    Merge an object model patch into another one (or into a deserialized object model) the same way DCS patches
+    are applied, so that the result is equivalent to applying both patches one after another.
+    Objects are merged recursively and the last written value of each path wins. Lists of objects are merged
+    item by item with the length taken from the newer patch, empty objects stand for unchanged items.
+    Any other value replaces the previous one. Values of the newer patch are not copied.
+    :param target: Older patch to update in place
+    :param patch: Newer patch
+    :returns: The updated target
+    """
+    for key, value in patch.items():
+        current = target.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merge_patch(current, value)
+        elif isinstance(value, list) and isinstance(current, list) and any(isinstance(item, dict) for item in value):
+            del current[len(value):]
+            for index, item in enumerate(value):
+                if index < len(current) and isinstance(item, dict) and isinstance(current[index], dict):
+                    merge_patch(current[index], item)
+                elif index < len(current):
+                    current[index] = item
+                else:
+                    current.append(item)
+        else:
+            target[key] = value
+    return target
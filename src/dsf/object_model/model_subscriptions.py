@@ -0,0 +1,140 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Callback invoked with the changed path and the value contained in the patch
+ChangeCallback = Callable[[str, Any], None]
+
+_PATTERN = re.compile(r'[^.\[\]]+(?:\[(?:\d+|\*)\])*(?:\.[^.\[\]]+(?:\[(?:\d+|\*)\])*)*')
+_TOKEN = re.compile(r'\[(\d+|\*)\]|([^.\[\]]+)')
+
+# Wildcards matching any key of an object or any index of a list
+KEY_WILDCARD = '*'
+INDEX_WILDCARD = -1
+
+
+class _PathNode:
+    """Node of the subscription trie, one per key or list index of the subscribed patterns"""
+
+    __slots__ = ('keys', 'indices', 'callbacks')
+
+    def __init__(self):
+        self.keys: Dict[str, '_PathNode'] = {}
+        self.indices: Dict[int, '_PathNode'] = {}
+        self.callbacks: List[ChangeCallback] = []
+
+    def descendants(self):
+        """Iterate over this node and all nodes below it"""
+        yield self
+        for child in self.keys.values():
+            yield from child.descendants()
+        for child in self.indices.values():
+            yield from child.descendants()
+
+
+def _parse_pattern(pattern: str) -> List:
+    """Split a path pattern into keys and list indices"""
+    if not isinstance(pattern, str) or _PATTERN.fullmatch(pattern) is None:
+        raise ValueError(f"Invalid path pattern {pattern!r}")
+    tokens = []
+    for index, key in _TOKEN.findall(pattern):
+        if key:
+            tokens.append(key)
+        else:
+            tokens.append(INDEX_WILDCARD if index == '*' else int(index))
+    return tokens
+
+
+class ModelSubscriptions:
+    """
+    Registry of callbacks invoked when an object model patch touches a path matching their pattern.
+    Patterns use the JSON keys separated by dots and list indices in brackets like the paths
+    returned by get_changed_paths. A '*' matches any key and '[*]' any list index,
+    e.g. state.status, heat.heaters[*].current or global.*
+    A callback is invoked for every matching path of a patch. If a patch replaces a value that
+    contains the subscribed path as a whole (e.g. null or a list of numbers) it is invoked for that value.
+    The registered patterns are stored in a trie so only the subscribed branches of a patch are visited.
+    """
+
+    def __init__(self):
+        self._root = _PathNode()
+        self._count = 0
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __len__(self):
+        return self._count
+
+    def subscribe(self, pattern: str, callback: ChangeCallback):
+        """
+        Register a callback for a path pattern
+        :param pattern: Path pattern, e.g. move.axes[*].machinePosition
+        :param callback: Function called with the changed path and its value in the patch
+        :raises ValueError: if the pattern is invalid
+        """
+        node = self._root
+        for token in _parse_pattern(pattern):
+            children = node.indices if isinstance(token, int) else node.keys
+            child = children.get(token)
+            if child is None:
+                child = children[token] = _PathNode()
+            node = child
+        node.callbacks.append(callback)
+        self._count += 1
+
+    def unsubscribe(self, pattern: str, callback: ChangeCallback):
+        """
+        Unregister a callback from a path pattern
+        :param pattern: Path pattern the callback was registered for
+        :param callback: Callback to remove
+        :raises ValueError: if the callback is not registered for the given pattern
+        """
+        node: Optional[_PathNode] = self._root
+        for token in _parse_pattern(pattern):
+            if node is None:
+                break
+            node = node.indices.get(token) if isinstance(token, int) else node.keys.get(token)
+        if node is None or callback not in node.callbacks:
+            raise ValueError(f"Callback is not subscribed to {pattern}")
+        node.callbacks.remove(callback)
+        self._count -= 1
+
+    def match(self, patch: dict) -> List[Tuple[ChangeCallback, str, Any]]:
+        """
+        Find the callbacks affected by a patch
+        :param patch: Deserialized JSON patch
+        :returns: List of callbacks with the matching path and its value in the patch
+        """
+        matches: List[Tuple[ChangeCallback, str, Any]] = []
+        if self._count > 0:
+            _match(self._root, patch, "", matches)
+        return matches
+
+
+def _match(node: _PathNode, element, path: str, matches: list):
+    if node.callbacks and element != {}:
+        matches.extend((callback, path, element) for callback in node.callbacks)
+
+    if isinstance(element, dict):
+        if node.keys:
+            wildcard = node.keys.get(KEY_WILDCARD)
+            if wildcard is not None:
+                for key, value in element.items():
+                    _match(wildcard, value, f"{path}.{key}" if path else key, matches)
+            for key, child in node.keys.items():
+                if key != KEY_WILDCARD and key in element:
+                    _match(child, element[key], f"{path}.{key}" if path else key, matches)
+    elif isinstance(element, list) and any(isinstance(item, dict) for item in element):
+        if node.indices:
+            wildcard = node.indices.get(INDEX_WILDCARD)
+            if wildcard is not None:
+                for index, item in enumerate(element):
+                    _match(wildcard, item, f"{path}[{index}]", matches)
+            for index, child in node.indices.items():
+                if 0 <= index < len(element):
+                    _match(child, element[index], f"{path}[{index}]", matches)
+    elif node.keys or node.indices:
+        # The patch replaces this value as a whole, so every subscription below it is affected
+        for descendant in node.descendants():
+            if descendant is not node:
+                matches.extend((callback, path, element) for callback in descendant.callbacks)
@@ -52,6 +52,13 @@ class AxisLetter(str, Enum):
 class Axis(ModelObject):
     """Information about a configured axis"""
 
+    __slots__ = (
+        '_acceleration', '_babystep', '_backlash', '_current', '_drivers', '_homed', '_jerk', '_letter',
+        '_machine_position', '_max', '_max_probed', '_microstepping', '_min', '_min_probed', '_percent_current',
+        '_percent_stst_current', '_reduced_acceleration', '_speed', '_steps_per_mm', '_user_position', '_visible',
+        '_workplace_offsets'
+    )
+
     def __init__(self):
         super().__init__()
         # Acceleration of this axis (in mm/s^2)
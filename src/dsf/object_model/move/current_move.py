@@ -5,6 +5,9 @@ from ..model_object import ModelObject
 
 class CurrentMove(ModelObject):
     """Information about the current move"""
+
+    __slots__ = ('_acceleration', '_deceleration', '_extrusion_rate', '_laser_pwm', '_requested_speed', '_top_speed')
+
     def __init__(self):
         super().__init__()
         # Acceleration of the current move (in mm/s^2)
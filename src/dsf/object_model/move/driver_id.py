@@ -15,6 +15,8 @@ class DriverId(ModelObject):
     :param port: Port of this driver identifier
     """
 
+    __slots__ = ('board', 'port')
+
     def __init__(self, as_str: str = None, as_int: int = None, board: int = None, port: int = None):
         super().__init__()
 
@@ -10,6 +10,12 @@ from ..utils import wrap_model_property
 class Extruder(ModelObject):
     """Information about an extruder drive"""
 
+    __slots__ = (
+        '_acceleration', '_current', '_driver', '_factor', '_filament', '_filament_diameter', '_jerk', '_microstepping',
+        '_nonlinear', '_percent_current', '_percent_stst_current', '_position', '_pressure_advance', '_raw_position',
+        '_speed', '_steps_per_mm'
+    )
+
     # Assigned driver
     driver = wrap_model_property('driver', DriverId)
 
@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class ExtruderNonlinear(ModelObject):
     """Nonlinear extrusion parameters (see M592)"""
+
+    __slots__ = ('_a', '_b', '_upper_limit')
+
     def __init__(self):
         super().__init__()
         # A coefficient in the extrusion formula
@@ -34,6 +34,9 @@ class InputShapingType(str, Enum):
 
 class InputShaping(ModelObject):
     """Parameters describing input shaping """
+
+    __slots__ = ('_amplitudes', '_damping', '_durations', '_frequency', '_reduction_limit', '_type')
+
     def __init__(self):
         super().__init__()
         # Amplitudes of the input shaper
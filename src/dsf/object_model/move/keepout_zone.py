@@ -7,6 +7,8 @@ from ..model_object import ModelObject
 class KeepoutZoneCoordinates(ModelObject):
     """Coordinates of a keep-out zone"""
 
+    __slots__ = ('_max', '_min')
+
     def __init__(self):
         super().__init__()
         # Maximum axis coordinate
@@ -36,6 +38,8 @@ class KeepoutZoneCoordinates(ModelObject):
 class KeepoutZone(ModelObject):
     """Information about a configured keep-out zone"""
 
+    __slots__ = ('_active', '_coords')
+
     def __init__(self):
         super().__init__()
         # Indicates if this keep-out zone is enabled
@@ -4,6 +4,8 @@ from .zleadscrew_kinematics import ZLeadscrewKinematics
 
 class CoreKinematics(ZLeadscrewKinematics):
 
+    __slots__ = ('_forward_matrix', '_inverse_matrix')
+
     def __init__(self, name: KinematicsName = KinematicsName.cartesian):
         super(CoreKinematics, self).__init__(name)
         self._forward_matrix = [
@@ -8,6 +8,9 @@ from ...model_collection import ModelCollection
 
 class DeltaKinematics(Kinematics):
     """Delta kinematics"""
+
+    __slots__ = ('_delta_radius', '_homed_height', '_print_radius', '_towers', '_x_tilt', '_y_tilt')
+
     def __init__(self, name: KinematicsName = KinematicsName.delta):
         super().__init__(name)
         # Delta radius (in mm)
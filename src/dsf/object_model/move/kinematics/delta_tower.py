@@ -3,6 +3,9 @@ from ...model_object import ModelObject
 
 class DeltaTower(ModelObject):
     """Delta tower properties"""
+
+    __slots__ = ('_angle_correction', '_diagonal', '_endstop_adjustment', '_x_pos', '_y_pos')
+
     def __init__(self):
         super().__init__()
         # Tower position corrections (in degrees)
@@ -6,6 +6,9 @@ from .kinematics_name import KinematicsName
 
 class HangprinterKinematics(Kinematics):
     """Information about hangprinter kinematics"""
+
+    __slots__ = ('_anchors', '_print_radius')
+
     def __init__(self):
         super(HangprinterKinematics, self).__init__()
         self._name = KinematicsName.hangprinter
@@ -8,6 +8,8 @@ from ...model_object import ModelObject
 class Kinematics(ModelObject):
     """Information about the configured geometry"""
 
+    __slots__ = ('_name', '_segmentation')
+
     def __init__(self, name: KinematicsName = KinematicsName.unknown):
         super().__init__()
         self._name = name
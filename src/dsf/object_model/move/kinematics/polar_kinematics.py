@@ -7,6 +7,8 @@ class PolarKinematics(Kinematics):
     Kinematics class for polar kinematics
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(PolarKinematics, self).__init__()
         self._name = KinematicsName.polar
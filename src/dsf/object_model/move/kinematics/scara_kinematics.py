@@ -7,6 +7,8 @@ class ScaraKinematics(ZLeadscrewKinematics):
     Kinematics class for SCARA kinematics
     """
 
+    __slots__ = ()
+
     def __init__(self, name: KinematicsName):
         super(ScaraKinematics, self).__init__(name)
 
@@ -5,6 +5,9 @@ from ...model_object import ModelObject
 
 class TiltCorrection(ModelObject):
     """Tilt correction parameters for Z leadscrew compensation"""
+
+    __slots__ = ('_correction_factor', '_last_corrections', '_max_correction', '_screw_pitch', '_screw_x', '_screw_y')
+
     def __init__(self):
         super().__init__()
         # Correction factor
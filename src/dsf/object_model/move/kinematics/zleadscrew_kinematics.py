@@ -5,6 +5,9 @@ from .tilt_correction import TiltCorrection
 
 class ZLeadscrewKinematics(Kinematics):
     """Base kinematics class that provides the ability to level the bed using Z leadscrews"""
+
+    __slots__ = ('_tilt_correction',)
+
     def __init__(self, name: KinematicsName):
         super(ZLeadscrewKinematics, self).__init__(name)
         # Parameters describing the tilt correction
@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class MicroStepping(ModelObject):
     """Microstepping configuration"""
+
+    __slots__ = ('_interpolated', '_value')
+
     def __init__(self):
         super().__init__()
         # Indicates if the stepper driver uses interpolation
@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class MotorsIdleControl(ModelObject):
     """Idle factor parameters for automatic motor current reduction"""
+
+    __slots__ = ('_factor', '_timeout')
+
     def __init__(self):
         super().__init__()
         # Motor current reduction factor (0..1)
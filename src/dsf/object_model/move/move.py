@@ -17,6 +17,13 @@ from ..model_object import ModelObject
 
 class Move(ModelObject):
     """Information about the move subsystem"""
+
+    __slots__ = (
+        '_axes', '_backlash_factor', '_calibration', '_compensation', '_current_move', '_extruders', '_idle',
+        '_keepout', '_kinematics', '_limit_axes', '_no_moves_before_homing', '_printing_acceleration', '_queue',
+        '_rotation', '_shaping', '_speed_factor', '_travel_acceleration', '_virtual_e_pos', '_workplace_number'
+    )
+
     def __init__(self):
         super().__init__()
         # List of the configured axes
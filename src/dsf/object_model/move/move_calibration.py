@@ -4,6 +4,9 @@ from ..model_object import ModelObject
 
 class MoveCalibration(ModelObject):
     """Information about configured calibration options"""
+
+    __slots__ = ('_final', '_initial', '_num_factors')
+
     def __init__(self):
         super().__init__()
         # Final calibration results (for Delta calibration)
@@ -21,6 +21,8 @@ class MoveCompensationType(str, Enum):
 class MoveCompensation(ModelObject):
     """Information about the configured compensation options"""
 
+    __slots__ = ('_fade_height', '_file', '_live_grid', '_mesh_deviation', '_probe_grid', '_skew', '_type')
+
     # Grid settings of the loaded heightmap or null if no heightmap is loaded
     live_grid = wrap_model_property('live_grid', ProbeGrid)
     # Deviations of the mesh grid or null if not applicable
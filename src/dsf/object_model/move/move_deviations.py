@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class MoveDeviations(ModelObject):
     """Calibration or mesh grid results"""
+
+    __slots__ = ('_deviation', '_mean')
+
     def __init__(self):
         super().__init__()
         # RMS deviation (in mm)
@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class MoveQueueItem(ModelObject):
     """Information about a DDA ring"""
+
+    __slots__ = ('_grace_period', '_length')
+
     def __init__(self):
         super().__init__()
         # The minimum idle time before we should start a move (in s)
@@ -5,6 +5,9 @@ from ..model_object import ModelObject
 
 class MoveRotation(ModelObject):
     """Information about centre rotation as defined by G68"""
+
+    __slots__ = ('_angle', '_centre')
+
     def __init__(self):
         super().__init__()
         # Angle of the centre rotatation (in deg)
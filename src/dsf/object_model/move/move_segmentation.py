@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class MoveSegmentation(ModelObject):
     """Move segmentation parameters"""
+
+    __slots__ = ('_segments_per_sec', '_min_segment_length')
+
     def __init__(self):
         super().__init__()
         self._segments_per_sec = 0.0
@@ -5,6 +5,9 @@ from ..model_object import ModelObject
 
 class ProbeGrid(ModelObject):
     """Information about the configured probe grid (see M557)"""
+
+    __slots__ = ('_axes', '_maxs', '_mins', '_radius', '_spacings')
+
     def __init__(self):
         super().__init__()
         # Axis letters of this heightmap
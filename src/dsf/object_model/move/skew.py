@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class Skew(ModelObject):
     """Class holding details about orthogonoal axis compensation parameters"""
 
+    __slots__ = ('_compensate_XY', '_tan_XY', '_tan_XZ', '_tan_YZ')
+
     def __init__(self):
         super().__init__()
         # Indicates if the TanXY value is used to compensate X when Y moves (else Y when X moves)
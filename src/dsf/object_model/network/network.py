@@ -8,6 +8,8 @@ from ..model_object import ModelObject
 class Network(ModelObject):
     """Information about the network subsystem"""
 
+    __slots__ = ('_cors_site', '_hostname', '_interfaces', '_name')
+
     # Default name of the machine
     DEFAULT_NAME = "My Duet"
     # Fallback hostname if the <c>Name</c> is invalid
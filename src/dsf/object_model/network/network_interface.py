@@ -9,6 +9,11 @@ from ..model_object import ModelObject
 class NetworkInterface(ModelObject):
     """Information about a network interface"""
 
+    __slots__ = (
+        '_active_protocols', '_actual_IP', '_configured_IP', '_dns_server', '_firmware_version', '_gateway', '_mac',
+        '_num_reconnects', '_signal', '_speed', '_ssid', '_state', '_subnet', '_type', '_wifi_country'
+    )
+
     def __init__(self):
         super().__init__()
         # List of active protocols
@@ -1,8 +1,9 @@
-from typing import List
+from typing import cast, List, Optional, Union
 
 from .model_collection import ModelCollection
 from .model_dictionary import ModelDictionary
 from .model_object import ModelObject
+from .model_subscriptions import ChangeCallback, ModelSubscriptions
 from .boards import Board
 from .directories import Directories
 from .fans import Fan
@@ -23,16 +24,29 @@ from .tools import Tool
 from .volumes import Volume
 
 from .utils import wrap_model_property
+from ..utility import json_codec
 
 
 class ObjectModel(ModelObject):
 
     # Information about the SBC which Duet Software Framework is running on.
     # This is None if the system is operating in standalone mode
+    __slots__ = (
+        '_subscriptions', '_boards', '_directories', '_fans', '_globals', '_heat', '_inputs', '_job', '_led_strips',
+        '_limits', '_messages', '_move', '_network', '_plugins', '_sbc', '_sensors', '_spindles', '_state', '_tools',
+        '_volumes'
+    )
+
     sbc = wrap_model_property('sbc', SBC)
 
-    def __init__(self):
+    _transient_attributes = frozenset(['_subscriptions'])
+
+    def __init__(self, subscriptions: Optional[ModelSubscriptions] = None):
+        """
+        :param subscriptions: Registry of change callbacks to use, e.g. to keep the callbacks of a previous model
+        """
         super(ObjectModel, self).__init__()
+        self._subscriptions = subscriptions if subscriptions is not None else ModelSubscriptions()
         self._boards = ModelCollection(Board)
         self._directories = Directories()
         self._fans = ModelCollection(Fan)
@@ -53,6 +67,27 @@ class ObjectModel(ModelObject):
         self._tools = ModelCollection(Tool)
         self._volumes = ModelCollection(Volume)
 
+    @property
+    def subscriptions(self) -> ModelSubscriptions:
+        """Callbacks invoked when an update touches a subscribed path (see subscribe())"""
+        return self._subscriptions
+
+    def subscribe(self, pattern: str, callback: ChangeCallback):
+        """
+        Register a callback invoked after an update touched a path matching the given pattern
+        :param pattern: Path pattern using JSON keys, e.g. state.status or move.axes[*].machinePosition
+        :param callback: Function called with the changed path and its value in the update
+        :raises ValueError: if the pattern is invalid
+        """
+        self._subscriptions.subscribe(pattern, callback)
+
+    def unsubscribe(self, pattern: str, callback: ChangeCallback):
+        """
+        Unregister a callback registered by subscribe()
+        :raises ValueError: if the callback is not subscribed to the given pattern
+        """
+        self._subscriptions.unsubscribe(pattern, callback)
+
     @property
     def boards(self) -> List[Board]:
         """List of connected boards
@@ -156,6 +191,19 @@ class ObjectModel(ModelObject):
         See also Volume()"""
         return self._volumes
 
+    def update_from_json(self, data: Union[dict, str]) -> 'ObjectModel':
+        """Update the object model from a JSON patch and invoke the callbacks of the touched paths"""
+        if not self._subscriptions:
+            return super(ObjectModel, self).update_from_json(data)
+
+        if isinstance(data, (str, bytes, bytearray, memoryview)):
+            data = json_codec.loads(data)
+        matches = self._subscriptions.match(cast(dict, data))
+        super(ObjectModel, self).update_from_json(data)
+        for callback, path, value in matches:
+            callback(path, value)
+        return self
+
     def _update_from_json(self, **kwargs) -> 'ObjectModel':
         super(ObjectModel, self)._update_from_json(**kwargs)
 
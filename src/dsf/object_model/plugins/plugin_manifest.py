@@ -7,6 +7,14 @@ from ..model_object import ModelObject
 
 class PluginManifest(ModelObject):
     """Information about a third-party plugin"""
+
+    __slots__ = (
+        '_author', '_data', '_dwc_dependencies', '_dwc_version', '_homepage', '_id', '_license', '_name',
+        '_rrf_version', '_sbc_auto_restart', '_sbc_config_files', '_sbc_dsf_version', '_sbc_executable',
+        '_sbc_executable_arguments', '_sbc_extra_executables', '_sbc_output_redirected', '_sbc_package_dependencies',
+        '_sbc_permissions', '_sbc_plugin_dependencies', '_sbc_python_dependencies', '_sbc_required', '_tags',
+        '_version'
+    )
     
     def __init__(self):
         super(PluginManifest, self).__init__()
@@ -6,6 +6,8 @@ from .plugin_manifest import PluginManifest
 class Plugin(PluginManifest):
     """Class representing a loaded plugin"""
 
+    __slots__ = ('_dsf_files', '_dwc_files', '_sd_files', '_pid')
+
     def __init__(self):
         super(Plugin, self).__init__()
         self._dsf_files = []
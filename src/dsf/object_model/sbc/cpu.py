@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class CPU(ModelObject):
     """Information about the SBC's CPU"""
 
+    __slots__ = ('_avg_load', '_hardware', '_num_cores', '_temperature')
+
     def __init__(self):
         super().__init__()
         self._avg_load = None
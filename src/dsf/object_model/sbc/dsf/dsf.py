@@ -9,6 +9,11 @@ from ...model_object import ModelObject
 class DSF(ModelObject):
     """Information about Duet Software Framework"""
 
+    __slots__ = (
+        '_build_date_time', '_http_endpoints', '_is64bit', '_plugin_support', '_root_plugin_support', '_user_sessions',
+        '_version'
+    )
+
     def __init__(self):
         super().__init__()
         self._build_date_time = ""
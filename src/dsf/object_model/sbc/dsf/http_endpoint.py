@@ -5,6 +5,8 @@ from ...model_object import ModelObject
 class HttpEndpoint(ModelObject):
     """Class representing an extra HTTP endpoint"""
 
+    __slots__ = ('_endpoint_type', '_is_upload_request', '_namespace', '_path', '_unix_socket')
+
     def __init__(self):
         super().__init__()
         # HTTP type of this endpoint
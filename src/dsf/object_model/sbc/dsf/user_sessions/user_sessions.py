@@ -7,6 +7,9 @@ from ....model_object import ModelObject
 
 class UserSession(ModelObject):
     """Class representing a user session"""
+
+    __slots__ = ('_access_level', '_id', '_origin', '_origin_id', '_session_type')
+
     def __init__(self):
         super().__init__()
         # Access level of this session
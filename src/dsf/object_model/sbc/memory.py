@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class Memory(ModelObject):
     """Information about the SBC's memory (RAM)"""
 
+    __slots__ = ('_available', '_total')
+
     def __init__(self):
         super().__init__()
         self._available = None
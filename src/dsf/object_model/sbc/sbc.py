@@ -11,6 +11,11 @@ from ..model_object import ModelObject
 class SBC(ModelObject):
     """Information about the SBC in SBC mode"""
 
+    __slots__ = (
+        '_app_armor', '_cpu', '_distribution', '_distribution_build_time', '_dsf', '_memory', '_model', '_serial',
+        '_uptime'
+    )
+
     def __init__(self):
         super().__init__()
         self._app_armor = False
@@ -8,6 +8,11 @@ from ..model_object import ModelObject
 class AnalogSensor(ModelObject):
     """Representation of an analog sensor"""
 
+    __slots__ = (
+        '_beta', '_c', '_last_reading', '_name', '_offset_adj', '_port', '_r_25', '_r_ref', '_slope_adj', '_state',
+        '_type'
+    )
+
     def __init__(self):
         super(AnalogSensor, self).__init__()
         self._beta = None
@@ -7,6 +7,8 @@ from ..model_object import ModelObject
 class Endstop(ModelObject):
     """Information about an endstop"""
 
+    __slots__ = ('_high_end', '_probe', '_triggered', '_type')
+
     def __init__(self):
         super(Endstop, self).__init__()
         self._high_end = None
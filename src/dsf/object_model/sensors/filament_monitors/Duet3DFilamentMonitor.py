@@ -7,6 +7,9 @@ from .filament_monitor_type import FilamentMonitorType
 
 class Duet3DFilamentMonitor(FilamentMonitor):
     """Base class for Duet3D filament monitors"""
+
+    __slots__ = ('_avg_percentage', '_last_percentage', '_max_percentage', '_min_percentage', '_total_extrusion')
+
     def __init__(self, type_: FilamentMonitorType = FilamentMonitorType.Unknown):
         super(Duet3DFilamentMonitor, self).__init__(type_)
         # Average ratio of measured vs. commanded movement
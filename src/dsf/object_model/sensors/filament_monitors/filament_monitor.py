@@ -8,6 +8,8 @@ from ....utils import deprecated
 class FilamentMonitor(ModelObject):
     """Information about a filament monitor"""
 
+    __slots__ = ('_enabled', '_enable_mode', '_status', '_type')
+
     def __init__(self, type_: FilamentMonitorType = FilamentMonitorType.Unknown):
         super(FilamentMonitor, self).__init__()
         self._enabled = False
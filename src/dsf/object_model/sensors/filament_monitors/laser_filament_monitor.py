@@ -9,6 +9,8 @@ from ...utils import wrap_model_property
 class LaserFilamentMonitorCalibrated(ModelObject):
     """Calibrated properties of a laser filament monitor"""
 
+    __slots__ = ('_calibration_factor', '_percent_max', '_percent_min', '_sensivity', '_total_distance')
+
     def __init__(self):
         super(LaserFilamentMonitorCalibrated, self).__init__()
         self._calibration_factor = 0
@@ -66,6 +68,8 @@ class LaserFilamentMonitorCalibrated(ModelObject):
 class LaserFilamentMonitorConfigured(ModelObject):
     """Configured  properties of a laser filament monitor"""
 
+    __slots__ = ('_all_moves', '_percent_max', '_percent_min', '_sample_distance')
+
     def __init__(self):
         super(LaserFilamentMonitorConfigured, self).__init__()
         self._all_moves = False
@@ -113,6 +117,8 @@ class LaserFilamentMonitorConfigured(ModelObject):
 class LaserFilamentMonitor(Duet3DFilamentMonitor):
     """Information about a laser filament monitor"""
 
+    __slots__ = ('_calibrated', '_configured', '_filament_present')
+
     # Calibrated properties of this filament monitor
     calibrated = wrap_model_property('calibrated', LaserFilamentMonitorCalibrated)
 
@@ -7,6 +7,8 @@ from ...utils import wrap_model_property
 class PulsedFilamentMonitorCalibrated(ModelObject):
     """Calibrated properties of a pulsed filament monitor"""
 
+    __slots__ = ('_mm_per_pulse', '_percent_max', '_percent_min', '_total_distance')
+
     def __init__(self):
         super(PulsedFilamentMonitorCalibrated, self).__init__()
         self._mm_per_pulse = 0
@@ -54,6 +56,8 @@ class PulsedFilamentMonitorCalibrated(ModelObject):
 class PulsedFilamentMonitorConfigured(ModelObject):
     """Configured properties of a pulsed filament monitor"""
 
+    __slots__ = ('_mm_per_pulse', '_percent_max', '_percent_min', '_sample_distance')
+
     def __init__(self):
         super(PulsedFilamentMonitorConfigured, self).__init__()
         self._mm_per_pulse = 0
@@ -101,6 +105,8 @@ class PulsedFilamentMonitorConfigured(ModelObject):
 class PulsedFilamentMonitor(FilamentMonitor):
     """Information about a pulsed filament monitor"""
 
+    __slots__ = ('_calibrated', '_configured')
+
     # Calibrated properties of this filament monitor
     calibrated = wrap_model_property('calibrated', PulsedFilamentMonitorCalibrated)
 
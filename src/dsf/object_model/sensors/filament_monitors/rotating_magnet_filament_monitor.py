@@ -7,6 +7,8 @@ from ...utils import wrap_model_property
 class RotatingMagnetFilamentMonitorCalibrated(ModelObject):
     """Calibrated properties of a rotating magnet filament monitor"""
 
+    __slots__ = ('_mm_per_pulse', '_percent_max', '_percent_min', '_total_distance')
+
     def __init__(self):
         super(RotatingMagnetFilamentMonitorCalibrated, self).__init__()
         self._mm_per_pulse = 0
@@ -54,6 +56,8 @@ class RotatingMagnetFilamentMonitorCalibrated(ModelObject):
 class RotatingMagnetFilamentMonitorConfigured(ModelObject):
     """Configured properties of a rotating magnet filament monitor"""
 
+    __slots__ = ('_all_moves', '_mm_per_rev', '_percent_max', '_percent_min', '_sample_distance')
+
     def __init__(self):
         super(RotatingMagnetFilamentMonitorConfigured, self).__init__()
         self._all_moves = False
@@ -111,6 +115,8 @@ class RotatingMagnetFilamentMonitorConfigured(ModelObject):
 class RotatingMagnetFilamentMonitor(Duet3DFilamentMonitor):
     """Information about a rotating magnet filament monitor"""
 
+    __slots__ = ('_calibrated', '_configured')
+
     # Calibrated properties of this filament monitor
     calibrated = wrap_model_property('calibrated', RotatingMagnetFilamentMonitorCalibrated)
 
@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class GpInputPort(ModelObject):
     """Details about a general-purpose input port"""
 
+    __slots__ = ('_value',)
+
     def __init__(self):
         super(GpInputPort, self).__init__()
         self._value = 0
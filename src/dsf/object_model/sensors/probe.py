@@ -8,6 +8,13 @@ from ...utils import deprecated
 class Probe(ModelObject):
     """Information about a configured probe"""
 
+    __slots__ = (
+        '_calib_a', '_calib_b', '_calibration_temperature', '_deployed_by_user', '_disables_heaters', '_dive_height',
+        '_dive_heights', '_is_calibrated', '_last_stop_height', '_max_probe_count', '_measured_height', '_offsets',
+        '_recovery_time', '_scan_coefficients', '_speeds', '_temperature_coefficients', '_threshold', '_tolerance',
+        '_travel_speed', '_trigger_height', '_type', '_value'
+    )
+
     def __init__(self):
         super(Probe, self).__init__()
         self._calib_a = None
@@ -12,6 +12,8 @@ from ..model_object import ModelObject
 class Sensors(ModelObject):
     """Information about sensors"""
 
+    __slots__ = ('_analog', '_endstops', '_filament_monitors', '_gp_in', '_probes')
+
     def __init__(self):
         super(Sensors, self).__init__()
         self._analog = ModelCollection(AnalogSensor)
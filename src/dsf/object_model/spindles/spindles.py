@@ -5,6 +5,11 @@ from ..model_object import ModelObject
 class Spindle(ModelObject):
     """Information about a CNC spindles"""
 
+    __slots__ = (
+        '_active', '_can_reverse', '_current', '_frequency', '_idle_pwm', '_max', '_max_pwm', '_min', '_min_pwm',
+        '_state'
+    )
+
     def __init__(self):
         super().__init__()
         # Active RPM
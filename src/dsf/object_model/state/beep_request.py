@@ -3,6 +3,9 @@ from ..model_object import ModelObject
 
 class BeepRequest(ModelObject):
     """Details about a requested beep"""
+
+    __slots__ = ('_duration', '_frequency')
+
     def __init__(self):
         super(BeepRequest, self).__init__()
         self._duration = 0
@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class GpOutputPort(ModelObject):
     """Details about a general-purpose output port"""
 
+    __slots__ = ('_freq', '_pwm')
+
     def __init__(self):
         super(GpOutputPort, self).__init__()
         # PWM frequency of this port (in Hz)
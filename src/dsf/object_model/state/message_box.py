@@ -33,6 +33,12 @@ class MessageBoxMode(IntEnum):
 
 class MessageBox(ModelObject):
     """Information about the message box to show"""
+
+    __slots__ = (
+        '_axis_controls', '_cancel_button', '_choices', '_default', '_max', '_message', '_min', '_mode', '_seq',
+        '_timeout', '_title'
+    )
+
     def __init__(self):
         super(MessageBox, self).__init__()
         # Bitmap of the axis movement controls to show (indices)
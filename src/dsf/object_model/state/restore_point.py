@@ -7,6 +7,9 @@ class RestorePoint(ModelObject):
     """
     Class holding information about a restore point
     """
+
+    __slots__ = ('_coords', '_extruder_pos', '_fan_pwm', '_feed_rate', '_io_bits', '_laser_pwm', '_tool_number')
+
     def __init__(self):
         super(RestorePoint, self).__init__()
 
@@ -5,6 +5,9 @@ class StartupError(ModelObject):
     """
     Details about the first error on start-up
     """
+
+    __slots__ = ('_file', '_line', '_message')
+
     def __init__(self):
         super().__init__()
 
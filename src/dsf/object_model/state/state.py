@@ -17,6 +17,13 @@ from ..utils import wrap_model_property
 class State(ModelObject):
     """Information about the machine state"""
 
+    __slots__ = (
+        '_atx_power', '_atx_power_port', '_beep', '_current_tool', '_deferred_power_down', '_display_message',
+        '_gp_out', '_laser_pwm', '_log_file', '_log_level', '_message_box', '_machine_mode', '_macro_restarted',
+        '_ms_up_time', '_next_tool', '_plugins_started', '_power_fail_script', '_previous_tool', '_restore_points',
+        '_startup_error', '_status', '_this_active', '_this_input', '_time', '_up_time'
+    )
+
     # Information about a requested beep or null if none is requested
     beep = wrap_model_property('beep', BeepRequest)
     # Details about a requested message box or null if none is requested
@@ -4,6 +4,8 @@ from ..model_object import ModelObject
 class ToolRetraction(ModelObject):
     """Tool retraction parameters"""
 
+    __slots__ = ('_extra_restart', '_length', '_speed', '_unretract_speed', '_z_hop')
+
     def __init__(self):
         super().__init__()
         # Amount of additional filament to extrude when undoing a retraction (in mm)
@@ -8,6 +8,12 @@ from ..model_object import ModelObject
 class Tool(ModelObject):
     """Information about a configured tool"""
 
+    __slots__ = (
+        '_active', '_axes', '_extruders', '_fans', '_feed_forward', '_filament_extruder', '_heaters', '_is_retracted',
+        '_mix', '_name', '_number', '_offsets', '_offsets_probed', '_retraction', '_spindle', '_spindle_rpm',
+        '_standby', '_state'
+    )
+
     def __init__(self):
         super().__init__()
         # Active temperatures of the associated heaters (in C)
@@ -1,10 +1,17 @@
 
+_model_types = ()
+
+
 def is_model_object(o):
-    from .model_object import ModelObject
-    from .model_collection import ModelCollection
-    from .model_dictionary import ModelDictionary
+    global _model_types
+    if not _model_types:
+        from .model_object import ModelObject
+        from .model_collection import ModelCollection
+        from .model_dictionary import ModelDictionary
+
+        _model_types = (ModelObject, ModelCollection, ModelDictionary)
 
-    return isinstance(o, ModelObject) or isinstance(o, ModelCollection) or isinstance(o, ModelDictionary)
+    return isinstance(o, _model_types)
 
 
 def wrap_model_property(name, model_type):
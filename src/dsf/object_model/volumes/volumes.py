@@ -6,6 +6,8 @@ from ..model_object import ModelObject
 class Volume(ModelObject):
     """Information about a storage device"""
 
+    __slots__ = ('_capacity', '_free_space', '_mounted', '_name', '_open_files', '_partition_size', '_path', '_speed')
+
     def __init__(self):
         super().__init__()
         # Total capacity of the storage device (in bytes or null)
@@ -0,0 +1,10 @@
+"""
+testing provides a local mock of the DSF control server (DCS) to test and load-test applications
+built on dsf.connections without a machine, e.g.
+
+    with MockDcs(model=model, patches=PatchGenerator(model), patch_rate=1000) as dcs:
+        connection = SubscribeConnection(SubscriptionMode.PATCH)
+        connection.connect(dcs.socket_file)
+"""
+from .mock_dcs import make_code, MockCommandError, MockDcs
+from .patch_generator import apply_patch, PatchGenerator
@@ -0,0 +1,362 @@
+import copy
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from .patch_generator import apply_patch
+from .. import PROTOCOL_VERSION
+from ..connections.json_framer import JsonFramer
+from ..utility import json_codec
+
+# Commands that complete an intercepted code
+_INTERCEPTION_RESULTS = ("Cancel", "Ignore", "Resolve")
+
+_FILTER = re.compile(r"^([GMT])(\d+|\*)(?:\.(\d+))?$")
+
+
+class MockCommandError(Exception):
+    """Raise this from a command handler of MockDcs to send an error response to the client"""
+
+    def __init__(self, error_type: str, error_message: str):
+        super().__init__(error_message)
+        self.error_type = error_type
+        self.error_message = error_message
+
+
+def make_code(code_type: str, major_number: Optional[int] = None, minor_number: Optional[int] = None,
+              channel: str = "SBC", parameters: Optional[List[dict]] = None, **kwargs) -> dict:
+    """
+    Create a deserialized code like DCS sends it to interceptors
+    :param code_type: Type of the code (G, M, T, Q for comments or C for keywords)
+    :param major_number: Major code number, e.g. 1234 for M1234
+    :param minor_number: Minor code number, e.g. 1 for M122.1
+    :param channel: Name of the channel the code comes from
+    :param parameters: Parameters as list of dicts with letter, value and isString (optional)
+    :param kwargs: Further properties of the code
+    """
+    code = {
+        "connection": None, "sourceConnection": 0, "result": None, "type": code_type, "channel": channel,
+        "lineNumber": None, "indent": 0, "keyword": 0, "keywordArgument": None, "majorNumber": major_number,
+        "minorNumber": minor_number, "flags": 0, "comment": None, "filePosition": None, "length": None,
+        "parameters": parameters if parameters is not None else [], "command": "Code",
+    }
+    code.update(kwargs)
+    return code
+
+
+def _matches_filters(code: dict, filters: Optional[List[str]]) -> bool:
+    """Check if a code matches one of the filters of an interceptor (e.g. M1234, G1, M122.1 or T*)"""
+    if not filters:
+        return True
+    for expression in filters:
+        match = _FILTER.match(expression)
+        if match is None or match.group(1) != code["type"]:
+            continue
+        if match.group(2) == "*":
+            return True
+        if int(match.group(2)) == code["majorNumber"] and \
+                (match.group(3) is None or int(match.group(3)) == code["minorNumber"]):
+            return True
+    return False
+
+
+class MockDcs:
+    """
+    Local control server speaking the DSF protocol on a UNIX socket, e.g. to test or load-test applications
+    built on dsf.connections without a machine.
+
+    Every client goes through the init handshake and is served according to its connection mode:
+    - Command mode: every command is answered by the handler registered for its name (see set_handler()).
+      Commands without handler succeed without a result, Flush succeeds and GetObjectModel returns the
+      current model.
+    - Subscribe mode: the full object model is sent first, followed by the configured patches. Like DCS the
+      next update is only sent once the previous one has been acknowledged. In Full subscription mode the
+      patches are applied to the model and the whole model is sent instead.
+    - Intercept mode: the configured codes that match the filters of the interceptor are sent one after
+      another, each one waiting for Cancel, Ignore or Resolve. Other commands sent in the meantime (e.g. Flush)
+      are answered like in command mode.
+    Received messages are collected in `received`, resolutions of intercepted codes in `resolutions`.
+
+    Use it as context manager or call start() and close().
+
+    Constructor arguments:
+    :param socket_file: Path of the UNIX socket, a temporary file is used if not set
+    :param model: Full object model, either deserialized or as serialized JSON (bytes) to save the time
+    needed to serialize a large model for every subscriber
+    :param patches: Patches to send to subscribers. Either an iterable of deserialized or serialized patches
+    (e.g. a PatchGenerator) or a callable returning such an iterable, which is called for every subscriber
+    :param patch_rate: Maximum number of patches per second and subscriber (None for as fast as they are
+    acknowledged)
+    :param patch_count: Maximum number of patches to send to each subscriber (None for no limit)
+    :param codes: Codes to send to interceptors (see make_code())
+    :param latency: Delay (in s) before every reply, object model update and intercepted code
+    :param version: Protocol version announced to clients
+    :param record_messages: Collect the received messages in `received`, disable it for long load tests
+    """
+
+    def __init__(
+        self,
+        socket_file: Optional[str] = None,
+        model: Union[dict, bytes, None] = None,
+        patches: Union[Iterable, Callable[[], Iterable], None] = None,
+        patch_rate: Optional[float] = None,
+        patch_count: Optional[int] = None,
+        codes: Optional[List[dict]] = None,
+        latency: float = 0.0,
+        version: int = PROTOCOL_VERSION,
+        record_messages: bool = True,
+    ):
+        self._directory = None
+        if socket_file is None:
+            self._directory = tempfile.TemporaryDirectory()
+            socket_file = os.path.join(self._directory.name, "dcs.sock")
+        self.socket_file = socket_file
+        self.model = model if model is not None else {"state": {"status": "idle"}}
+        self.patches = patches
+        self.patch_rate = patch_rate
+        self.patch_count = patch_count
+        self.codes = codes if codes is not None else []
+        self.latency = latency
+        self.version = version
+        self.record_messages = record_messages
+
+        self.received: List[dict] = []
+        self.resolutions: List[dict] = []
+        # Number of object model updates acknowledged by all subscribers
+        self.acknowledged = 0
+        self._handlers: Dict[str, Callable[[dict], object]] = {
+            "Flush": lambda command: True,
+            "GetObjectModel": lambda command: self._deserialized_model(),
+        }
+        self._lock = threading.Lock()
+        self._clients: List[socket.socket] = []
+        self._threads: List[threading.Thread] = []
+        self._next_id = 1
+        self._server: Optional[socket.socket] = None
+        self._closed = threading.Event()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def set_handler(self, command: str, handler: Callable[[dict], object]):
+        """
+        Register the handler of a command in command mode
+        :param command: Name of the command, e.g. SimpleCode
+        :param handler: Callable receiving the deserialized command and returning its result.
+        Raise MockCommandError from it to send an error response
+        """
+        self._handlers[command] = handler
+
+    def _deserialized_model(self) -> dict:
+        return json_codec.loads(self.model) if isinstance(self.model, (bytes, str)) else self.model
+
+    def start(self) -> 'MockDcs':
+        """Start listening for clients"""
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_file)
+        self._server.listen()
+        self._start_thread(self._accept, self._server)
+        return self
+
+    def close(self):
+        """Stop the server and disconnect all clients"""
+        self._closed.set()
+        if self._server is not None:
+            try:
+                # Wake up the thread waiting for new clients
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(5)
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+        elif os.path.exists(self.socket_file):
+            os.unlink(self.socket_file)
+
+    def wait_for_clients(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all clients have disconnected, returns False if the timeout expired"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in list(self._threads[1:]):
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                return False
+        return True
+
+    def _start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _accept(self, server: socket.socket):
+        while not self._closed.is_set():
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
+                client_id = self._next_id
+                self._next_id += 1
+            self._start_thread(self._serve, client, client_id)
+
+    def _serve(self, client: socket.socket, client_id: int):
+        session = _Session(self, client)
+        try:
+            session.send({"version": self.version, "id": client_id})
+            init_message = session.receive()
+            if init_message is None:
+                return
+            mode = init_message.get("mode")
+            if init_message.get("version", 0) > self.version:
+                session.send_error("IncompatibleVersionException",
+                                   f"Incompatible API version (got {init_message.get('version')}, "
+                                   f"need {self.version} or lower)")
+                return
+            if mode not in ("Command", "Subscribe", "Intercept"):
+                session.send_error("ArgumentException", f"Invalid connection mode {mode}")
+                return
+            session.send({"success": True})
+
+            if mode == "Subscribe":
+                self._serve_subscriber(session, init_message)
+            elif mode == "Intercept":
+                self._serve_interceptor(session, init_message)
+            else:
+                while session.handle_command(session.receive()):
+                    pass
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._clients.remove(client)
+            client.close()
+
+    def _serve_subscriber(self, session: '_Session', init_message: dict):
+        full_model = None
+        if init_message.get("subscriptionMode") == "Full":
+            # Patches are applied to a copy of the model, so each subscriber gets its own
+            full_model = copy.deepcopy(self._deserialized_model())
+        if not session.send_update(full_model if full_model is not None else self.model):
+            return
+
+        patches = self.patches() if callable(self.patches) else self.patches
+        started = time.monotonic()
+        for index, patch in enumerate(patches if patches is not None else ()):
+            if self.patch_count is not None and index >= self.patch_count or self._closed.is_set():
+                break
+            if self.patch_rate:
+                delay = started + (index + 1) / self.patch_rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            if full_model is not None:
+                if isinstance(patch, (bytes, bytearray, str)):
+                    patch = json_codec.loads(patch)
+                patch = apply_patch(full_model, patch)
+            if not session.send_update(patch):
+                return
+
+        # Keep the connection open until the client disconnects
+        while session.receive() is not None:
+            pass
+
+    def _serve_interceptor(self, session: '_Session', init_message: dict):
+        filters = init_message.get("filters")
+        channels = init_message.get("channels")
+        for code in self.codes:
+            if not _matches_filters(code, filters) or (channels and code.get("channel") not in channels):
+                continue
+            session.delay()
+            session.send(code)
+            while True:
+                message = session.receive()
+                if message is None:
+                    return
+                if message.get("command") in _INTERCEPTION_RESULTS:
+                    self.resolutions.append(message)
+                    break
+                session.handle_command(message)
+
+        while session.handle_command(session.receive()):
+            pass
+
+
+class _Session:
+    """Connection of a single client to MockDcs"""
+
+    def __init__(self, dcs: MockDcs, client: socket.socket):
+        self.dcs = dcs
+        self.client = client
+        self.framer = JsonFramer()
+
+    def delay(self):
+        if self.dcs.latency > 0:
+            time.sleep(self.dcs.latency)
+
+    def send(self, message):
+        if not isinstance(message, (bytes, bytearray)):
+            message = message.encode("utf8") if isinstance(message, str) else json_codec.dumps(message)
+        self.client.sendall(message)
+
+    def send_error(self, error_type: str, error_message: str):
+        self.send({"success": False, "errorType": error_type, "errorMessage": error_message})
+
+    def receive(self) -> Optional[dict]:
+        """Receive the next message, returns None if the client disconnected"""
+        message = self.framer.next_object()
+        while message is None:
+            data = self.client.recv(64 * 1024)
+            if not data:
+                return None
+            self.framer.feed(data)
+            message = self.framer.next_object()
+        message = json_codec.loads(message)
+        if self.dcs.record_messages:
+            self.dcs.received.append(message)
+        return message
+
+    def send_update(self, update) -> bool:
+        """Send an object model update and wait for its acknowledgement"""
+        self.delay()
+        self.send(update)
+        while True:
+            message = self.receive()
+            if message is None:
+                return False
+            if message.get("command") == "Acknowledge":
+                with self.dcs._lock:
+                    self.dcs.acknowledged += 1
+                return True
+            self.handle_command(message)
+
+    def handle_command(self, command: Optional[dict]) -> bool:
+        """Reply to a command, returns False if the client disconnected"""
+        if command is None:
+            return False
+        self.delay()
+        handler = self.dcs._handlers.get(command.get("command", ""))
+        try:
+            result = handler(command) if handler is not None else None
+        except MockCommandError as e:
+            self.send_error(e.error_type, e.error_message)
+        else:
+            self.send({"success": True, "result": result})
+        return True
@@ -0,0 +1,87 @@
+import copy
+import random
+from typing import Iterator, List, Optional, Tuple, Union
+
+from ..object_model.model_patch import merge_patch
+
+# Path to a value in the object model, e.g. ("heat", "heaters", 0, "current")
+_Path = Tuple[Union[str, int], ...]
+
+
+def apply_patch(model: dict, patch: dict) -> dict:
+    """
+    Apply an object model patch to a deserialized object model the way DCS merges its patches (see merge_patch())
+    :param model: Deserialized object model to update in place
+    :param patch: Deserialized patch, it is copied so it can be applied again
+    :returns: The updated model
+    """
+    return merge_patch(model, copy.deepcopy(patch))
+
+
+def _numeric_paths(value, path: _Path, paths: List[Tuple[_Path, bool]]):
+    """Collect the paths of all numeric values below the given value and whether they are integers"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _numeric_paths(item, path + (key,), paths)
+    elif isinstance(value, list):
+        # Only lists of objects are patched item by item
+        if any(isinstance(item, dict) for item in value):
+            for index, item in enumerate(value):
+                _numeric_paths(item, path + (index,), paths)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        paths.append((path, isinstance(value, int)))
+
+
+class PatchGenerator:
+    """
+    Generate object model patches that change random numeric values of a model, like the readings
+    and positions DCS reports while a machine is running. Lists of objects are patched the way DCS does it,
+    i.e. the list is sent in full with empty objects for the items that did not change.
+
+    Constructor arguments:
+    :param model: Deserialized object model to derive the patches from. It is not modified
+    :param values_per_patch: Number of values changed by each patch, use it to control the patch size
+    :param seed: Seed of the random number generator, patches are reproducible if it is set
+    """
+
+    def __init__(self, model: dict, values_per_patch: int = 10, seed: Optional[int] = None):
+        if values_per_patch < 1:
+            raise ValueError("values_per_patch must be at least 1")
+        self.model = model
+        self.values_per_patch = values_per_patch
+        self._random = random.Random(seed)
+        self._paths: List[Tuple[_Path, bool]] = []
+        _numeric_paths(model, (), self._paths)
+        if not self._paths:
+            raise ValueError("model does not contain any numeric values to patch")
+
+    def __iter__(self) -> Iterator[dict]:
+        while True:
+            yield self.next_patch()
+
+    def next_patch(self) -> dict:
+        """Generate the next patch"""
+        patch: dict = {}
+        count = min(self.values_per_patch, len(self._paths))
+        for path, is_integer in self._random.sample(self._paths, count):
+            value = self._random.randrange(1000) if is_integer else round(self._random.random() * 300, 3)
+            self._set(patch, self.model, path, value)
+        return patch
+
+    def patches(self, count: int) -> List[dict]:
+        """Generate the given number of patches"""
+        return [self.next_patch() for _ in range(count)]
+
+    @staticmethod
+    def _set(patch: dict, model: dict, path: _Path, value):
+        """Set a value in a patch and create the parent objects and lists on the way"""
+        for key in path[:-1]:
+            model = model[key]
+            if isinstance(model, list):
+                if not isinstance(patch.get(key) if isinstance(patch, dict) else patch[key], list):
+                    # Unchanged items of a list of objects are sent as empty objects
+                    patch[key] = [{} if isinstance(item, dict) else copy.deepcopy(item) for item in model]
+            elif isinstance(patch, dict) and key not in patch:
+                patch[key] = {}
+            patch = patch[key]
+        patch[path[-1]] = value
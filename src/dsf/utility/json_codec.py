@@ -0,0 +1,107 @@
+"""
+jsoncodec serializes and deserializes the JSON messages exchanged with the control server.
+
+The fastest available backend is selected on import: orjson, msgspec and ujson are used if installed,
+otherwise the json module of the standard library is used. A backend may be forced by setting
+the DSF_JSON_BACKEND environment variable or by calling use_backend().
+"""
+import json
+import os
+from typing import Callable, Optional, Union
+
+# Supported backends in order of preference
+BACKENDS = ("orjson", "msgspec", "ujson", "json")
+
+
+def _orjson_backend():
+    import orjson  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+    def dumps(obj, default: Optional[Callable] = None) -> bytes:
+        return orjson.dumps(obj, default=default)
+
+    return orjson.loads, dumps
+
+
+def _msgspec_backend():
+    import msgspec  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+    def dumps(obj, default: Optional[Callable] = None) -> bytes:
+        return msgspec.json.encode(obj, enc_hook=default)
+
+    return msgspec.json.decode, dumps
+
+
+def _ujson_backend():
+    import ujson  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+    def loads(data):
+        return ujson.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def dumps(obj, default: Optional[Callable] = None) -> bytes:
+        return ujson.dumps(obj, default=default, ensure_ascii=False, escape_forward_slashes=False).encode("utf8")
+
+    return loads, dumps
+
+
+def _json_backend():
+    def loads(data):
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def dumps(obj, default: Optional[Callable] = None) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=default).encode("utf8")
+
+    return loads, dumps
+
+
+_BACKEND_FACTORIES = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "ujson": _ujson_backend,
+    "json": _json_backend,
+}
+
+backend = "json"
+_loads, _dumps = _json_backend()
+
+
+def use_backend(name: Optional[str] = None) -> str:
+    """
+    Select the JSON backend to use
+    :param name: Name of the backend (see BACKENDS) or None to select the fastest installed one
+    :returns: Name of the selected backend
+    :raises ValueError: if the backend is unknown
+    :raises ImportError: if the requested backend is not installed
+    """
+    global backend, _loads, _dumps
+    if name is None:
+        for candidate in BACKENDS:
+            try:
+                _loads, _dumps = _BACKEND_FACTORIES[candidate]()
+            except ImportError:
+                continue
+            backend = candidate
+            return backend
+
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(f"Unsupported JSON backend {name}, expected one of {', '.join(BACKENDS)}")
+    _loads, _dumps = _BACKEND_FACTORIES[name]()
+    backend = name
+    return backend
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]):
+    """Deserialize a JSON document
+    orjson and msgspec parse a memoryview in place, the other backends copy it first"""
+    return _loads(data)
+
+
+def dumps(obj, default: Optional[Callable] = None) -> bytes:
+    """
+    Serialize an object into compact UTF-8 encoded JSON
+    :param obj: Object to serialize
+    :param default: Function called for objects that cannot be serialized natively
+    """
+    return _dumps(obj, default)
+
+
+use_backend(os.environ.get("DSF_JSON_BACKEND") or None)
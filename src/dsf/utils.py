@@ -1,18 +1,25 @@
+import functools
 import inspect
 import re
 import warnings
 
+# Maximum number of memoized key translations per function.
+# The object model only uses a few hundred distinct keys, this bounds the cache for arbitrary input
+KEY_CACHE_SIZE = 4096
+
 
 # We don't want our deprecations to be ignored by default, so create our own type.
 class DeprecatedWarning(UserWarning):
     pass
 
 
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
 def camel_to_snake(s: str, keep_acronyms: bool = True) -> str:
     """Convert a camel case string to snake case string
     :param s: The string to convert from
     :param keep_acronyms: Wheter acronyms should be kept uppercase or not
-    :returns: The string in snake_case format"""
+    :returns: The string in snake_case format
+    Results are memoized since the same keys are converted over and over again"""
     # Added a look-behind (?!^) so initials like SBC are not getting snake-cased
     snake = re.sub(r'((?<=[a-z])[A-Z0-9]|(?!^)[A-Z0-9](?=[a-z]))', r'_\1', s)
     return '_'.join(w if w.isupper() else w.lower() for w in snake.split('_')) if keep_acronyms else snake.lower()
@@ -35,21 +42,25 @@ def deprecated(instructions: str):
     return decorator
 
 
+_RESERVED_KEYS = frozenset(['format', 'global', 'id', 'license', 'max', 'min', 'None', 'type'])
+
+
 def preserve_builtin(data: dict) -> dict:
     """Add a trailing underscore to parameters using built-in name
     when unpacking parameters directly from JSON imported data
     to avoid name shadowing. e.g: type => type_"""
     if data is None:
         return {}
-    reserved_keys = ['format', 'global', 'id', 'license', 'max', 'min', 'None', 'type']
-    return {f"{k}_" if k in reserved_keys else k: v for k, v in data.items()}
+    return {f"{k}_" if k in _RESERVED_KEYS else k: v for k, v in data.items()}
 
 
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
 def snake_to_camel(s: str, first_lower=True, keep_acronyms: bool = True) -> str:
     """Convert a snake case string to camel case string
     :param s: The string to convert from
     :param first_lower: Wheter the first character is returned as lower case or not
     :param keep_acronyms: Wheter acronyms should be kept uppercase or not
-    :returns: The string in CamelCase format"""
+    :returns: The string in CamelCase format
+    Results are memoized since the same keys are converted over and over again"""
     res = ''.join(w if w.isupper() and keep_acronyms else w.title() for w in s.split('_'))
     return f'{res[0].lower()}{res[1:]}' if first_lower and len(res) else res
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from src.dsf.connections import AsyncCommandConnection, AsyncInterceptConnection, AsyncSubscribeConnection, \
+    InterceptionMode, InternalServerException, SubscriptionMode, TaskCanceledException
+from src.dsf.connections.json_framer import JsonFramer
+from src.dsf.commands import generic
+from src.dsf.commands.code import CodeType
+from src.dsf.commands.code_channel import CodeChannel
+
+
+class MockDcs:
+    """Minimal control server replying to every received message with the next queued reply"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.received = []
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_file = os.path.join(self.directory.name, "dcs.sock")
+        self.server = None
+        self.finished = None
+
+    async def __aenter__(self):
+        self.finished = asyncio.Event()
+        self.server = await asyncio.start_unix_server(self.handle_connection, self.socket_file)
+        return self
+
+    async def __aexit__(self, *args):
+        # Wait for the client to close its connection so that every message has been received
+        await asyncio.wait_for(self.finished.wait(), 5)
+        self.server.close()
+        await self.server.wait_closed()
+        self.directory.cleanup()
+
+    async def handle_connection(self, reader, writer):
+        writer.write(b'{"version":12,"id":42}')
+        framer = JsonFramer()
+        while True:
+            data = await reader.read(1024)
+            if not data:
+                break
+            framer.feed(data)
+            message = framer.next_object()
+            while message is not None:
+                self.received.append(json.loads(message))
+                while self.replies:
+                    reply = self.replies.pop(0)
+                    if reply is None:
+                        # Wait for the next message before sending further replies
+                        break
+                    writer.write(reply)
+                await writer.drain()
+                message = framer.next_object()
+        writer.close()
+        self.finished.set()
+
+
+class AsyncConnectionsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_command_connection(self):
+        replies = [b'{"success":true}', None, b'{"result":"FIRMWARE_NAME: RepRapFirmware","success":true}', None,
+                   b'{"success":false,"errorType":"TaskCanceledException","errorMessage":"cancelled"}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncCommandConnection()
+            await connection.connect(dcs.socket_file)
+            self.assertEqual(connection.id, 42)
+            self.assertEqual(await connection.perform_simple_code("M115"), "FIRMWARE_NAME: RepRapFirmware")
+            with self.assertRaises(TaskCanceledException):
+                await connection.perform_simple_code("G4 S10")
+            await connection.close()
+
+        self.assertEqual(dcs.received[0], {"mode": "Command", "version": 12})
+        self.assertEqual(dcs.received[1]["command"], "SimpleCode")
+        self.assertEqual(dcs.received[1]["code"], "M115")
+
+    async def test_perform_commands(self):
+        replies = [b'{"success":true}', None, b'{"result":"1","success":true}', None,
+                   b'{"success":false,"errorType":"InvalidOperationException","errorMessage":"failed"}', None,
+                   b'{"result":"3","success":true}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncCommandConnection()
+            await connection.connect(dcs.socket_file)
+            results = await connection.perform_commands(
+                [generic.evaluate_expression(CodeChannel.SBC, str(i)) for i in range(1, 4)], window=2
+            )
+            await connection.close()
+
+        self.assertEqual(results[0].result, "1")
+        self.assertIsInstance(results[1], InternalServerException)
+        self.assertEqual(results[1].error_message, "failed")
+        self.assertEqual(results[2].result, "3")
+        self.assertEqual([message["expression"] for message in dcs.received[1:]], ["1", "2", "3"])
+
+    async def test_not_connected(self):
+        connection = AsyncCommandConnection()
+        with self.assertRaisesRegex(RuntimeError, "not established"):
+            await connection.perform_simple_code("M115")
+        with self.assertRaisesRegex(RuntimeError, "not established"):
+            await connection.perform_commands([generic.evaluate_expression(CodeChannel.SBC, "1")])
+        with self.assertRaisesRegex(RuntimeError, "not established"):
+            await connection.get_serialized_object_model()
+
+    async def test_subscribe_connection(self):
+        replies = [b'{"success":true}', b'{"state":{"status":"idle"}}', None, b'{"state":{"status":"busy"}}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncSubscribeConnection(SubscriptionMode.PATCH)
+            await connection.connect(dcs.socket_file)
+            model = await connection.get_object_model()
+            self.assertEqual(model.state.status, "idle")
+            self.assertEqual(json.loads(await connection.get_object_model_patch()), {"state": {"status": "busy"}})
+            await connection.close()
+
+        self.assertEqual([message["command"] for message in dcs.received[1:]], ["Acknowledge", "Acknowledge"])
+
+    async def test_update_object_model(self):
+        replies = [b'{"success":true}', b'{"state":{"status":"idle"},"heat":{"heaters":[{"current":20}]}}', None,
+                   b'{"heat":{"heaters":[{"current":21.5}]}}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncSubscribeConnection(SubscriptionMode.PATCH)
+            await connection.connect(dcs.socket_file)
+            metrics = connection.enable_metrics()
+            self.assertEqual(await connection.update_object_model(), {"state.status", "heat.heaters[0].current"})
+            model = connection.model
+            self.assertEqual(model.heat.heaters[0].current, 20)
+            self.assertEqual(await connection.update_object_model(), {"heat.heaters[0].current"})
+            self.assertIs(connection.model, model)
+            self.assertEqual(model.heat.heaters[0].current, 21.5)
+            self.assertEqual(model.state.status, "idle")
+            self.assertEqual(metrics.patch_apply.count, 2)
+            self.assertEqual(metrics.messages_received, 2)
+            await connection.close()
+
+    async def test_coalesced_patches(self):
+        replies = [b'{"success":true}', b'{"state":{"status":"idle"},"heat":{"heaters":[{"current":20}]}}', None,
+                   b'{"heat":{"heaters":[{"current":21}]}}{"state":{"status":"busy"}}'
+                   b'{"heat":{"heaters":[{"current":22}]}}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncSubscribeConnection(SubscriptionMode.PATCH)
+            await connection.connect(dcs.socket_file)
+            await connection.update_object_model()
+            patch, count = await connection.get_coalesced_object_model_patch()
+            await connection.close()
+
+        self.assertEqual(count, 3)
+        self.assertEqual(patch, {"heat": {"heaters": [{"current": 22}]}, "state": {"status": "busy"}})
+        # Merged patches are acknowledged only once
+        self.assertEqual([message["command"] for message in dcs.received[1:]], ["Acknowledge"] * 2)
+
+    async def test_intercept_connection(self):
+        replies = [b'{"success":true}',
+                   b'{"type":"M","channel":"HTTP","majorNumber":1234,"parameters":[],"result":null,"command":"Code"}']
+        async with MockDcs(replies) as dcs:
+            connection = AsyncInterceptConnection(InterceptionMode.PRE, filters=["M1234"])
+            await connection.connect(dcs.socket_file)
+            code = await connection.receive_code()
+            self.assertEqual(code.type, CodeType.MCode)
+            self.assertEqual(code.majorNumber, 1234)
+            await connection.resolve_code()
+            await connection.close()
+
+        self.assertEqual(dcs.received[0]["filters"], ["M1234"])
+        self.assertEqual(dcs.received[1]["command"], "Resolve")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 import json
 
-from src.dsf.commands.code import Code, CodeChannel, CodeFlags, CodeType, KeywordType
+from src.dsf.commands.code import Code, CodeChannel, CodeFlags, CodeParameter, CodeType, KeywordType
+from src.dsf.connections.base_connection import encode_message
 
 
 class Model(unittest.TestCase):
@@ -35,3 +36,91 @@ class Model(unittest.TestCase):
         c = Code.from_json(json.loads(json_str))
         self.assertEqual(c.type, CodeType.Keyword)
         self.assertEqual(c.keyword, KeywordType.Echo)
+
+    def test_code_parameter_lookup(self):
+        c = Code.from_json({
+            "sourceConnection": 30, "result": None, "type": "G", "channel": "HTTP", "lineNumber": None, "indent": 0,
+            "keyword": 0, "keywordArgument": None, "majorNumber": 1, "minorNumber": None, "flags": 0,
+            "comment": None, "filePosition": None, "length": 22, "command": "Code",
+            "parameters": [
+                {"letter": "X", "value": "12.5", "isString": False},
+                {"letter": "y", "value": "3", "isString": False},
+                {"letter": "X", "value": "1", "isString": False},
+                {"letter": "E", "value": "1:2:3", "isString": False},
+                {"letter": "S", "value": "{move.axes[0].max}", "isString": False},
+            ],
+        })
+        self.assertEqual(c.parameter("x").as_float(), 12.5)
+        self.assertEqual(c.parameter("Y").as_int(), 3)
+        self.assertEqual(c.parameter("E").as_int_array(), [1, 2, 3])
+        self.assertTrue(c.parameter("S").is_expression)
+        self.assertIsNone(c.parameter("Z"))
+        self.assertEqual(c.parameter("Z", 7).as_int(), 7)
+
+        # The index follows changes of the parameter list
+        c.parameters.append(CodeParameter("Z", "4", isString=False))
+        self.assertEqual(c.parameter("Z").as_int(), 4)
+        c.parameters = []
+        self.assertIsNone(c.parameter("X"))
+
+    def test_code_parameter_lookup_in_place(self):
+        c = Code(type=CodeType.GCode, majorNumber=1,
+                 parameters=[CodeParameter("X", "10", isString=False), CodeParameter("F", "600", isString=False)])
+        self.assertEqual(c.parameter("X").as_int(), 10)
+
+        # Interceptors may replace parameters without changing the length of the list
+        c.parameters[0] = CodeParameter("Y", "5", isString=False)
+        self.assertIsNone(c.parameter("X"))
+        self.assertEqual(c.parameter("Y").as_int(), 5)
+
+        c.parameters[1].letter = "E"
+        self.assertIsNone(c.parameter("F"))
+        self.assertEqual(c.parameter("E").as_int(), 600)
+
+        c.parameters.reverse()
+        c.parameters.append(CodeParameter("E", "1", isString=False))
+        c.parameters.pop(0)
+        self.assertEqual(c.parameter("E").as_int(), 1)
+
+    def test_code_parameter_driver_id(self):
+        param = CodeParameter("P", "1.2:3", isString=False, isDriverId=True)
+        self.assertEqual([str(driver) for driver in param.as_driver_id_array()], ["1.2", "0.3"])
+
+    def test_code_serialization(self):
+        data = {
+            "sourceConnection": 30, "result": None, "type": "M", "channel": "HTTP", "lineNumber": 12, "indent": 2,
+            "keyword": 0, "keywordArgument": None, "majorNumber": 98, "minorNumber": 1, "flags": 2048,
+            "comment": "test", "filePosition": 100, "length": 22, "command": "Code", "connection": None,
+            "parameters": [
+                {"letter": "P", "value": "0:/macros/test", "isString": True, "isDriverId": False},
+                {"letter": "S", "value": "1.5", "isString": False, "isDriverId": False},
+                {"letter": "D", "value": "1.2", "isString": False, "isDriverId": True},
+            ],
+        }
+        json_str = json.dumps(data)
+        c = Code.from_json(json.loads(json_str))
+        self.assertFalse(hasattr(c, "__dict__"))
+        self.assertFalse(hasattr(c.parameters[0], "__dict__"))
+        self.assertEqual(json.loads(encode_message(c)), json.loads(json_str))
+
+        c = Code(type=CodeType.GCode, majorNumber=1, parameters=[CodeParameter.simple_param("X", 10)])
+        self.assertEqual(json.loads(encode_message(c))["parameters"],
+                         [{"letter": "X", "value": "10", "isString": False, "isDriverId": False}])
+        self.assertEqual(str(c), "G1 X10")
+
+    def test_code_wire_format(self):
+        # Codes and their parameters are sent with the keys DCS and from_json() use
+        c = Code(type=CodeType.MCode, majorNumber=98, channel=CodeChannel.SBC, parameters=[
+            CodeParameter("P", "0:/macros/test", isString=True),
+            CodeParameter.simple_param("S", 1.5),
+            CodeParameter("D", "1.2", isString=False, isDriverId=True),
+        ])
+        self.assertEqual(
+            encode_message(c),
+            b'{"command":"Code","sourceConnection":0,"result":null,"type":"M","channel":"SBC","lineNumber":null,'
+            b'"indent":0,"keyword":0,"keywordArgument":null,"majorNumber":98,"minorNumber":null,"flags":0,'
+            b'"comment":null,"filePosition":null,"length":null,"parameters":['
+            b'{"letter":"P","value":"0:/macros/test","isString":true,"isDriverId":false},'
+            b'{"letter":"S","value":"1.5","isString":false,"isDriverId":false},'
+            b'{"letter":"D","value":"1.2","isString":false,"isDriverId":true}]}'
+        )
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from src.dsf.commands.code import Code, CodeType
+from src.dsf.connections import AsyncCodeDispatcher, CodeDispatcher, CodeOutcome
+from src.dsf.object_model import MessageType
+from src.dsf.testing import make_code, MockDcs
+
+
+class RecordingConnection:
+    """Stand-in for an intercept connection that records how codes are completed"""
+
+    def __init__(self):
+        self.outcomes = []
+
+    def ignore_code(self):
+        self.outcomes.append("Ignore")
+
+    def cancel_code(self):
+        self.outcomes.append("Cancel")
+
+    def resolve_code(self, rtype=MessageType.Success, content=None):
+        self.outcomes.append(("Resolve", rtype, content))
+
+
+def code(code_type: str, major: int, minor: int = None) -> Code:
+    return Code.from_json(make_code(code_type, major, minor))
+
+
+class CodeDispatcherTest(unittest.TestCase):
+
+    def test_registry(self):
+        dispatcher = CodeDispatcher()
+
+        @dispatcher.handler(CodeType.MCode, 1234)
+        def m1234(cde, connection):
+            return "M1234 done"
+
+        dispatcher.register(CodeType.MCode, 122, lambda cde, connection: (MessageType.Warning, "minor"), 1)
+        dispatcher.register(CodeType.TCode, None, lambda cde, connection: CodeOutcome.CANCEL)
+
+        @dispatcher.handler(CodeType.GCode, 29)
+        def g29(cde, connection):
+            raise RuntimeError("probe failed")
+
+        self.assertEqual(dispatcher.filters, ["M1234", "M122.1", "T*", "G29"])
+        with self.assertRaises(ValueError):
+            dispatcher.register(CodeType.MCode, 1234, m1234)
+
+        connection = RecordingConnection()
+        for cde in (code("M", 1234), code("M", 122, 1), code("M", 122), code("T", 3), code("G", 29), code("G", 1)):
+            dispatcher.dispatch(connection, cde)
+        self.assertEqual(connection.outcomes, [
+            ("Resolve", MessageType.Success, "M1234 done"),
+            ("Resolve", MessageType.Warning, "minor"),
+            "Ignore",
+            "Cancel",
+            ("Resolve", MessageType.Error, "probe failed"),
+            "Ignore",
+        ])
+        self.assertEqual(sorted(dispatcher.snapshot()), ["G29", "M122.1", "M1234", "T*"])
+        self.assertEqual(dispatcher.handler_latency["M1234"].count, 1)
+
+    def test_channels(self):
+        codes = [make_code("M", 1234, channel="HTTP"), make_code("M", 1000, channel="SBC"),
+                 make_code("M", 1001, channel="SBC"), make_code("M", 1235, channel="HTTP"),
+                 make_code("G", 1, channel="SBC")]
+        handled = []
+
+        dispatcher = CodeDispatcher(channels=["HTTP", "SBC"])
+
+        @dispatcher.handler(CodeType.MCode, 1234)
+        def slow(cde, connection):
+            time.sleep(0.2)
+            handled.append(cde.majorNumber)
+
+        for major in (1000, 1001, 1235):
+            dispatcher.register(CodeType.MCode, major, lambda cde, connection: handled.append(cde.majorNumber))
+
+        with MockDcs(codes=codes) as dcs:
+            dispatcher.socket_file = dcs.socket_file
+            with dispatcher:
+                deadline = time.monotonic() + 5
+                while len(dcs.resolutions) < 4 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        # The slow handler does not hold up the SBC channel, but the codes of each channel stay in order
+        self.assertEqual(handled, [1000, 1001, 1234, 1235])
+        self.assertEqual(len(dcs.resolutions), 4)
+        self.assertEqual({message["channels"][0] for message in dcs.received if "mode" in message}, {"HTTP", "SBC"})
+        self.assertGreaterEqual(dispatcher.handler_latency["M1234"].max, 0.2)
+
+    def test_asyncio(self):
+        codes = [make_code("M", 1234, channel="HTTP"), make_code("M", 1000, channel="SBC")]
+        handled = []
+
+        async def run():
+            dispatcher = AsyncCodeDispatcher(channels=["HTTP", "SBC"])
+
+            @dispatcher.handler(CodeType.MCode, 1234)
+            async def m1234(cde, connection):
+                await asyncio.sleep(0.1)
+                handled.append(threading.current_thread() is threading.main_thread())
+
+            @dispatcher.handler(CodeType.MCode, 1000)
+            def m1000(cde, connection):
+                handled.append(threading.current_thread() is threading.main_thread())
+                return "blocking handlers run in the executor"
+
+            with MockDcs(codes=codes) as dcs:
+                dispatcher.socket_file = dcs.socket_file
+                task = asyncio.ensure_future(dispatcher.run())
+                while len(dcs.resolutions) < 2:
+                    await asyncio.sleep(0.01)
+                dispatcher.stop()
+                await asyncio.wait_for(task, 5)
+            return dcs.resolutions
+
+        resolutions = asyncio.run(run())
+        self.assertEqual(sorted(handled), [False, True])
+        self.assertEqual([message["content"] for message in resolutions],
+                         ["blocking handlers run in the executor", None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import os
+import tempfile
+import unittest
+
+from src.dsf.commands.code_parser import CodeParser, parse_codes, parse_file
+from src.dsf.commands.code import CodeChannel, CodeFlags, CodeType, KeywordType
+from src.dsf.exceptions import CodeParserException
+
+
+class CodeParserTest(unittest.TestCase):
+
+    def test_parameters(self):
+        code, = parse_codes('N10 G1 X10 Y-2.5 E{move.extruders[0].factor} F3000 *71\n')
+        self.assertEqual(code.type, CodeType.GCode)
+        self.assertEqual(code.majorNumber, 1)
+        self.assertEqual(code.lineNumber, 10)
+        self.assertEqual(code.parameter("X").as_int(), 10)
+        self.assertEqual(code.parameter("Y").as_float(), -2.5)
+        self.assertTrue(code.parameter("E").is_expression)
+        self.assertEqual(code.parameter("F").as_int(), 3000)
+        self.assertEqual(str(code), "G1 X10 Y-2.5 E{move.extruders[0].factor} F3000")
+
+    def test_strings_and_comments(self):
+        codes = parse_codes('; header\nM32 "0:/gcodes/a""b.g"\nG28 (Do homing) ; via G28\nM117 Hello world ; hi\n')
+        self.assertEqual(codes[0].type, CodeType.Comment)
+        self.assertEqual(codes[0].comment, " header")
+        self.assertEqual(codes[1].parameter("@").string_value, '0:/gcodes/a"b.g')
+        self.assertTrue(codes[1].parameter("@").is_string)
+        self.assertEqual(codes[2].comment, "Do homing via G28")
+        self.assertEqual(codes[3].parameter("@").string_value, "Hello world")
+        self.assertEqual(codes[3].comment, " hi")
+
+    def test_keywords_and_indentation(self):
+        codes = parse_codes('if move.axes[0].homed ; check\n  echo "homed"\nelse\n  abort\n')
+        self.assertEqual([code.keyword for code in codes],
+                         [KeywordType.If, KeywordType.Echo, KeywordType.Else, KeywordType.Abort])
+        self.assertEqual([code.indent for code in codes], [0, 2, 0, 2])
+        self.assertEqual(codes[0].keywordArgument, "move.axes[0].homed")
+        self.assertEqual(codes[1].keywordArgument, '"homed"')
+        self.assertIsNone(codes[2].keywordArgument)
+
+    def test_multiple_codes_per_line(self):
+        codes = parse_codes("T0 M3 S100\nG53 G0 Z10\nG1X1Y2\n")
+        self.assertEqual([code.short_str() for code in codes], ["T0", "M3", "G53 G0", "G1"])
+        self.assertEqual(codes[0].flags, CodeFlags.CodeFlagsNone)
+        self.assertEqual(codes[1].flags, CodeFlags.IsLastCode)
+        self.assertEqual(codes[2].flags, CodeFlags.EnforceAbsolutePosition | CodeFlags.IsLastCode)
+        self.assertEqual([(code.filePosition, code.length) for code in codes], [(0, 3), (3, 8), (11, 11), (22, 7)])
+        self.assertEqual([param.letter for param in codes[3].parameters], ["X", "Y"])
+
+    def test_tool_deselection(self):
+        codes = parse_codes("T-1\nT-1 P0\nT1\nT\n")
+        self.assertEqual([(code.type, code.majorNumber) for code in codes],
+                         [(CodeType.TCode, -1), (CodeType.TCode, -1), (CodeType.TCode, 1), (CodeType.TCode, None)])
+        self.assertEqual(codes[1].parameter("P").as_int(), 0)
+        self.assertEqual([code.short_str() for code in codes], ["T-1", "T-1", "T1", "T"])
+        with self.assertRaises(CodeParserException):
+            parse_codes("G-1\n")
+
+    def test_file_positions(self):
+        data = "G1 X1 ; héllo\r\n\nM400\n".encode("utf8")
+        codes = list(CodeParser(CodeChannel.File).parse_stream(io.BytesIO(data)))
+        self.assertEqual([(code.lineNumber, code.filePosition, code.length) for code in codes],
+                         [(1, 0, 16), (3, 17, 5)])
+        self.assertEqual(codes[0].channel, CodeChannel.File)
+
+    def test_parse_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "job.g")
+            with open(path, "w") as file:
+                for index in range(1000):
+                    file.write(f"G1 X{index} Y{index / 2}\n")
+            codes = parse_file(path)
+            self.assertEqual(sum(1 for _ in codes), 1000)
+
+    def test_errors(self):
+        for text in ('G1 X"abc\n', "X10 Y10\n", "G1 X{1 + 2\n"):
+            with self.subTest(text=text):
+                with self.assertRaises(CodeParserException):
+                    parse_codes(text)
+        with self.assertRaises(CodeParserException):
+            list(CodeParser(max_line_length=10).parse_stream(io.BytesIO(b"G1 X1 Y2 Z3 E4\n")))
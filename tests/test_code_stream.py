@@ -0,0 +1,73 @@
+import unittest
+
+from src.dsf.commands.code_channel import CodeChannel
+from src.dsf.commands.code_parser import parse_codes
+from src.dsf.connections import CommandConnection, InternalServerException, TaskCanceledException
+from src.dsf.testing import MockCommandError, MockDcs
+
+
+def simple_code(command):
+    if command["code"] == "M999":
+        raise MockCommandError("InvalidOperationException", "not allowed")
+    if command["code"] == "M25":
+        raise MockCommandError("TaskCanceledException", "cancelled")
+    if command["code"] == "G1 X-1":
+        return "Error: G1: target position outside machine limits"
+    return f"ok {command['code']}"
+
+
+class CodeStreamTest(unittest.TestCase):
+
+    def stream(self, codes, **kwargs):
+        with MockDcs() as dcs:
+            dcs.set_handler("SimpleCode", simple_code)
+            dcs.set_handler("Code", lambda command: {"type": 0, "content": "", "time": "2024-01-01T00:00:00"})
+            connection = CommandConnection()
+            connection.connect(dcs.socket_file)
+            try:
+                results = []
+                report = connection.stream_codes(codes, on_result=lambda line, result: results.append((line, result)),
+                                                 **kwargs)
+            finally:
+                connection.close()
+        return report, results, dcs.received[1:]
+
+    def test_stream(self):
+        lines = [f"G1 X{index}\n" for index in range(100)]
+        lines.insert(10, "\n")
+        report, results, received = self.stream(lines, channel=CodeChannel.File, window=8)
+        self.assertTrue(report.succeeded)
+        self.assertEqual((report.sent, report.completed), (100, 100))
+        self.assertGreater(report.codes_per_second, 0)
+        self.assertEqual(results[10], (12, "ok G1 X10"))
+        self.assertEqual({message["channel"] for message in received}, {"File"})
+
+    def test_parsed_codes(self):
+        report, results, received = self.stream(parse_codes("G28\nG1 X10 Y20\n"))
+        self.assertTrue(report.succeeded)
+        self.assertEqual([line for line, _ in results], [1, 2])
+        self.assertEqual([message["command"] for message in received], ["Code", "Code"])
+        self.assertEqual(received[1]["parameters"][1], {"letter": "Y", "value": "20", "isString": False,
+                                                        "isDriverId": False})
+
+    def test_stop_on_error(self):
+        lines = ["G1 X1", "M999"] + ["G1 X2"] * 50
+        report, results, received = self.stream(lines, window=4)
+        self.assertIsInstance(report.error, InternalServerException)
+        self.assertEqual(report.error_line, 2)
+        self.assertFalse(report.cancelled)
+        # The codes in flight are awaited, but no further codes are sent
+        self.assertLessEqual(report.sent, 2 + 4)
+        self.assertEqual(report.completed, report.sent)
+        self.assertEqual(len(received), report.sent)
+
+        report, _, _ = self.stream(["G1 X1", "G1 X-1", "G1 X2"], window=1)
+        self.assertEqual((report.error_line, report.sent), (2, 2))
+        report, _, _ = self.stream(["G1 X1", "G1 X-1", "G1 X2"], window=1, stop_on_error=False)
+        self.assertTrue(report.succeeded)
+
+    def test_cancelled(self):
+        report, _, _ = self.stream(["G1 X1", "M25", "G1 X2"], window=1)
+        self.assertTrue(report.cancelled)
+        self.assertIsInstance(report.error, TaskCanceledException)
+        self.assertEqual(report.error_line, 2)
@@ -0,0 +1,132 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from src.dsf.commands import generic
+from src.dsf.connections import CommandConnection, InternalServerException
+from src.dsf.connections.json_framer import JsonFramer
+
+
+class BatchingDcs:
+    """Control server that only replies once `batch` commands have been received or no more commands arrive"""
+
+    def __init__(self, batch: int):
+        self.batch = batch
+        self.batch_sizes = []
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_file = os.path.join(self.directory.name, "dcs.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_file)
+        self.server.listen()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        client, _ = self.server.accept()
+        client.settimeout(0.2)
+        framer = JsonFramer()
+        client.sendall(b'{"version":12,"id":1}')
+        received = []
+        while True:
+            message = framer.next_object()
+            if message is None:
+                try:
+                    data = client.recv(4096)
+                except socket.timeout:
+                    self.flush(client, received)
+                    continue
+                if not data:
+                    break
+                framer.feed(data)
+                continue
+
+            received.append(json.loads(message))
+            if len(received) >= self.batch or "mode" in received[0]:
+                self.flush(client, received)
+        client.close()
+
+    def flush(self, client: socket.socket, received: list):
+        if not received:
+            return
+        if "mode" not in received[0]:
+            self.batch_sizes.append(len(received))
+        for message in received:
+            client.sendall(self.reply(message))
+        received.clear()
+
+    @staticmethod
+    def reply(message) -> bytes:
+        if message.get("mode") is not None:
+            return b'{"success":true}'
+        if message["code"] == "M999":
+            return b'{"success":false,"errorType":"InvalidOperationException","errorMessage":"not allowed"}'
+        return json.dumps({"success": True, "result": message["code"]}).encode("utf8")
+
+    def close(self):
+        self.thread.join(5)
+        self.server.close()
+        self.directory.cleanup()
+
+
+class CommandPipelineTest(unittest.TestCase):
+
+    def test_pipeline(self):
+        dcs = BatchingDcs(4)
+        connection = CommandConnection()
+        try:
+            connection.connect(dcs.socket_file)
+            with connection.pipeline(window=4) as pipeline:
+                futures = [pipeline.submit(generic.simple_code(f"G1 X{i}")) for i in range(10)]
+                failed = pipeline.submit(generic.simple_code("M999"))
+                last = pipeline.submit(generic.simple_code("M115"))
+                # Waiting for a result reads the responses up to that command
+                self.assertEqual(futures[0].result().result, "G1 X0")
+            self.assertEqual([future.result().result for future in futures], [f"G1 X{i}" for i in range(10)])
+            with self.assertRaises(InternalServerException):
+                failed.result()
+            self.assertEqual(last.result().result, "M115")
+
+            results = connection.perform_commands([generic.simple_code("M999"), generic.simple_code("M114")])
+            self.assertIsInstance(results[0], InternalServerException)
+            self.assertEqual(results[0].error_message, "not allowed")
+            self.assertEqual(results[1].result, "M114")
+
+            # Regular commands are still matched to their responses
+            self.assertEqual(connection.perform_simple_code("M105"), "M105")
+        finally:
+            connection.close()
+            dcs.close()
+
+        # The commands must have been in flight together
+        self.assertEqual(dcs.batch_sizes[0], 4)
+        self.assertEqual(max(dcs.batch_sizes), 4)
+
+    def test_metrics(self):
+        dcs = BatchingDcs(2)
+        connection = CommandConnection()
+        commands = []
+        try:
+            connection.connect(dcs.socket_file)
+            metrics = connection.enable_metrics()
+            metrics.on_command = lambda name, seconds: commands.append(name)
+            connection.perform_commands([generic.simple_code("G1 X1"), generic.simple_code("G1 X2")], window=2)
+            self.assertEqual(connection.perform_simple_code("M115"), "M115")
+        finally:
+            connection.close()
+            dcs.close()
+
+        self.assertEqual(commands, ["SimpleCode"] * 3)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["commands"]["SimpleCode"]["count"], 3)
+        self.assertEqual((snapshot["messages_sent"], snapshot["messages_received"]), (3, 3))
+        self.assertGreater(snapshot["bytes_sent"], 0)
+        self.assertGreater(snapshot["bytes_received"], 0)
+        self.assertEqual(snapshot["framing"]["count"], 3)
+        self.assertEqual(snapshot["parsing"]["count"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+
+from src.dsf.connections import AsyncCommandConnection, CommandConnection, ConnectionMetrics, LatencyHistogram
+from src.dsf.connections.connection_metrics import LATENCY_BUCKETS
+from src.dsf.testing import MockDcs
+
+
+class ConnectionMetricsTest(unittest.TestCase):
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.mean)
+        self.assertIsNone(histogram.percentile(50))
+
+        for value in (0.0002, 0.0002, 0.003, 0.04, 20.0):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual((histogram.min, histogram.max), (0.0002, 20.0))
+        self.assertAlmostEqual(histogram.mean, 20.0434 / 5)
+        self.assertEqual(sum(histogram.buckets), 5)
+        self.assertEqual(histogram.buckets[LATENCY_BUCKETS.index(0.00025)], 2)
+        self.assertEqual(histogram.buckets[-1], 1)
+        self.assertEqual(histogram.percentile(50), 0.005)
+        self.assertEqual(histogram.percentile(100), 20.0)
+
+    def test_hooks_and_reset(self):
+        metrics = ConnectionMetrics()
+        events = []
+        metrics.on_receive = lambda size, seconds: events.append(("receive", size))
+        metrics.on_patch = lambda seconds, count: events.append(("patch", count))
+
+        metrics.record_received(128, 0.001, 0.01)
+        metrics.record_patch(0.002, 3)
+        metrics.record_command(object(), 0.005)
+        self.assertEqual(events, [("receive", 128), ("patch", 3)])
+        self.assertEqual(list(metrics.snapshot()["commands"]), ["object"])
+
+        metrics.reset()
+        snapshot = metrics.snapshot()
+        self.assertEqual((snapshot["bytes_received"], snapshot["patch_apply"]["count"]), (0, 0))
+        self.assertIsNotNone(metrics.on_patch)
+
+    def check_connection_metrics(self, metrics: ConnectionMetrics):
+        snapshot = metrics.snapshot()
+        # Server init message, init response and two command responses
+        self.assertEqual(snapshot["messages_received"], 4)
+        self.assertEqual(snapshot["framing"]["count"], 4)
+        self.assertGreater(snapshot["bytes_received"], 0)
+        self.assertGreater(snapshot["receive_wait"], 0)
+        self.assertEqual(snapshot["commands"]["SimpleCode"]["count"], 2)
+
+    def test_connection(self):
+        with MockDcs(latency=0.01) as dcs:
+            connection = CommandConnection()
+            metrics = connection.enable_metrics()
+            connection.connect(dcs.socket_file)
+            try:
+                connection.perform_simple_code("M115")
+                connection.perform_simple_code("M115")
+            finally:
+                connection.close()
+        self.check_connection_metrics(metrics)
+
+    def test_async_connection(self):
+        async def run(socket_file: str) -> ConnectionMetrics:
+            connection = AsyncCommandConnection()
+            metrics = connection.enable_metrics()
+            await connection.connect(socket_file)
+            try:
+                await connection.perform_simple_code("M115")
+                await connection.perform_simple_code("M115")
+            finally:
+                await connection.close()
+            return metrics
+
+        with MockDcs(latency=0.01) as dcs:
+            metrics = asyncio.run(run(dcs.socket_file))
+        self.check_connection_metrics(metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from src.dsf.connections import AsyncConnectionPool, ConnectionPool
+from src.dsf.connections.json_framer import JsonFramer
+
+
+class EchoDcs:
+    """Control server accepting any number of command connections and replying with the code of each command"""
+
+    def __init__(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_file = os.path.join(self.directory.name, "dcs.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_file)
+        self.server.listen()
+        self.clients = []
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            self.clients.append(client)
+            threading.Thread(target=self.handle, args=(client,), daemon=True).start()
+
+    @staticmethod
+    def handle(client: socket.socket):
+        framer = JsonFramer()
+        try:
+            client.sendall(b'{"version":12,"id":1}')
+            while True:
+                message = framer.next_object()
+                if message is None:
+                    data = client.recv(4096)
+                    if not data:
+                        break
+                    framer.feed(data)
+                    continue
+                message = json.loads(message)
+                if "mode" in message:
+                    client.sendall(b'{"success":true}')
+                else:
+                    client.sendall(json.dumps({"success": True, "result": message["code"]}).encode("utf8"))
+        except OSError:
+            pass
+        finally:
+            client.close()
+
+    def drop_clients(self):
+        for client in self.clients:
+            client.shutdown(socket.SHUT_RDWR)
+        self.clients.clear()
+
+    def close(self):
+        self.server.close()
+        self.directory.cleanup()
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dcs = EchoDcs()
+
+    def tearDown(self):
+        self.dcs.close()
+
+    def test_threads(self):
+        with ConnectionPool(self.dcs.socket_file, max_size=2) as pool:
+            results = []
+
+            def worker(index):
+                for i in range(5):
+                    with pool.connection(timeout=5) as connection:
+                        results.append(connection.perform_simple_code(f"M{index}{i}") == f"M{index}{i}")
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+            self.assertEqual(results, [True] * 20)
+            metrics = pool.metrics
+            self.assertLessEqual(metrics.created, 2)
+            self.assertEqual(metrics.created + metrics.reused, 20)
+            self.assertEqual(metrics.in_use, 0)
+            self.assertEqual(metrics.peak_in_use, 2)
+            self.assertEqual(metrics.idle, pool.size)
+
+    def test_health_check_and_timeout(self):
+        with ConnectionPool(self.dcs.socket_file, max_size=1) as pool:
+            with pool.connection() as connection:
+                self.assertEqual(connection.perform_simple_code("M115"), "M115")
+                with self.assertRaises(TimeoutError):
+                    pool.acquire(timeout=0.05)
+
+            # Connections closed by the server are replaced
+            self.dcs.drop_clients()
+            with pool.connection() as replacement:
+                self.assertIsNot(replacement, connection)
+                self.assertEqual(replacement.perform_simple_code("M114"), "M114")
+
+            metrics = pool.metrics
+            self.assertEqual((metrics.created, metrics.discarded, metrics.timeouts), (2, 1, 1))
+
+    def test_asyncio_tasks(self):
+        async def run():
+            async with AsyncConnectionPool(self.dcs.socket_file, max_size=2) as pool:
+                async def task(index):
+                    async with pool.connection() as connection:
+                        return await connection.perform_simple_code(f"M{index}")
+
+                results = await asyncio.gather(*(task(index) for index in range(6)))
+                return results, pool.metrics
+
+        results, metrics = asyncio.run(run())
+        self.assertEqual(results, [f"M{index}" for index in range(6)])
+        self.assertEqual(metrics.created, 2)
+        self.assertEqual(metrics.reused, 4)
+        self.assertGreater(metrics.waits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
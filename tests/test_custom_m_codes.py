@@ -1,9 +1,7 @@
-import threading
-import os
-import pathlib
-import socket
-import time
 import importlib.util
+import pathlib
+
+from src.dsf.testing import make_code, MockDcs
 
 here = pathlib.Path(__file__).parent.parent.resolve()
 example_path = here / "examples/custom_m_codes.py"
@@ -12,59 +10,20 @@ custom_m_codes = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(custom_m_codes)
 
 
-def test_custom_m_codes(monkeypatch, tmp_path):
-    mock_dcs_socket_file = os.path.join(tmp_path, "dsf.socket")
-    monkeypatch.setattr(
-        "dsf.connections.InterceptConnection.connect.__defaults__",
-        (mock_dcs_socket_file,),
-    )
-
-    dcs_passed = threading.Event()
-
-    def mock_dcs():
-        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        server.bind(mock_dcs_socket_file)
-        server.listen(1)
-        conn, _ = server.accept()
-        print("send all")
-        conn.sendall(b'{"version":11, "id":"foobar"}')
-        assert (
-            conn.recv(1024) == b"{"
-            b'"mode":"Intercept","version":11,"InterceptionMode":"Pre","Channels":["HTTP","Telnet",'
-            b'"File","USB","Aux","Trigger","Queue","LCD","SBC","Daemon","Aux2","AutoPause","Unknown"],'
-            b'"Filters":null,"PriorityCodes":false'
-            b"}"
-        )
-        conn.sendall(b'{"success":true}')
-        conn.sendall(
-            b"{"
-            b'"connection":{"id":12,"apiVersion":10,"isConnected":true},"sourceConnection":12,'
-            b'"result":null,"type":"M","channel":"HTTP","lineNumber":null,"indent":0,"keyword":0,'
-            b'"keywordArgument":null,"majorNumber":1234,"minorNumber":null,"flags":2048,"comment":null,'
-            b'"filePosition":null,"length":6,"parameters":[],"command":"Code"'
-            b"}"
+def test_custom_m_codes(monkeypatch):
+    codes = [make_code("M", 1234, channel="HTTP", flags=2048), make_code("G", 1, channel="HTTP"),
+             make_code("M", 5678, channel="HTTP", flags=2048)]
+    with MockDcs(codes=codes) as dcs:
+        monkeypatch.setattr(
+            "dsf.connections.InterceptConnection.connect.__defaults__",
+            (dcs.socket_file,),
         )
-        assert conn.recv(1024) == b'{"command":"Flush","Channel":"HTTP"}'
-        conn.sendall(b'{"result":true,"success":true}')
-        assert conn.recv(1024) == b'{"command":"Resolve","Type":0,"Content":null}'
-        conn.sendall(
-            b"{"
-            b'"connection":{"id":12,"apiVersion":10,"isConnected":true},"sourceConnection":12,'
-            b'"result":null,"type":"M","channel":"HTTP","lineNumber":null,"indent":0,"keyword":0,'
-            b'"keywordArgument":null,"majorNumber":5678,"minorNumber":null,"flags":2048,"comment":null,'
-            b'"filePosition":null,"length":6,"parameters":[],"command":"Code"'
-            b"}"
-        )
-        assert conn.recv(1024) == b'{"command":"Resolve","Type":0,"Content":null}'
-        conn.close()
-        dcs_passed.set()  # indicate that all asserts passed and the mock_dcs is shutting down
-
-    thread = threading.Thread(target=mock_dcs, daemon=True)
-    thread.start()
-    time.sleep(1)
-
-    custom_m_codes.start_intercept()
-
-    thread.join()
-
-    assert dcs_passed.is_set()
+        custom_m_codes.start_intercept()
+        assert dcs.wait_for_clients(5)
+
+    init_message = dcs.received[0]
+    assert (init_message["mode"], init_message["interceptionMode"]) == ("Intercept", "Pre")
+    assert init_message["filters"] == ["M1234", "M5678", "M7722"]
+    # G1 is not passed to the interceptor because of its filters, M1234 and M5678 are resolved
+    assert [message["command"] for message in dcs.resolutions] == ["Resolve", "Resolve"]
+    assert dcs.resolutions[0]["type"] == 0
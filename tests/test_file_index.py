@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+
+from src.dsf.files import GCodeFileIndex
+
+PRUSA = """; generated by PrusaSlicer 2.6.0
+M83
+G28
+M486 T2
+;LAYER_CHANGE
+;Z:0.2
+G1 Z0.2 F720
+M486 S0 A"cube"
+G1 X10 Y10 E1.5
+M486 S1 A"cylinder"
+G1 X20 Y10 E2.5
+M486 S-1
+;LAYER_CHANGE
+;Z:0.4
+G1 Z0.4
+M486 S0
+G1 X10 Y20 E1
+M486 S1
+G1 X20 Y20 E1
+M486 S-1
+G1 Z10
+"""
+
+# No layer comments, absolute extrusion with a reset and a Z hop between the layers
+PLAIN = """G90
+M82
+G1 Z0.3 F600
+G1 X10 E1
+G1 X20 E2
+G92 E0
+G1 Z0.5
+G1 X10
+G1 Z0.3
+G1 X30 E3
+G1 Z0.6
+G1 X10 E4
+"""
+
+# Compact codes without whitespace and object names containing spaces and semicolons
+COMPACT = """M83
+G1Z.2F720
+M486S0A"Shape Box id:0 copy 0"
+G1X10Y10E1.5
+M486S1 A"part; with semicolon" ; comment
+G1X20Y10E2.5
+G1Z.4
+G1X10Y20E1
+"""
+
+
+class FileIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content: str) -> str:
+        path = os.path.join(self.directory.name, "test.gcode")
+        with open(path, "w", newline="\n") as file:
+            file.write(content)
+        return path
+
+    def test_layers_from_comments(self):
+        path = self.write(PRUSA)
+        index = GCodeFileIndex.build(path)
+        self.assertEqual(index.num_layers, 2)
+        self.assertEqual(list(index.layer_z), [0.2, 0.4])
+        self.assertEqual(list(index.layer_extrusion), [0.0, 4.0])
+        layer_offset = PRUSA.index(";LAYER_CHANGE\n;Z:0.4")
+        self.assertEqual(index.layer_offset(1), layer_offset)
+        self.assertEqual(index.layer_at(layer_offset - 1), 0)
+        self.assertEqual(index.layer_at(layer_offset), 1)
+        self.assertEqual(index.layer_at(0), -1)
+        self.assertEqual(index.layer_for_z(0.3), 1)
+        self.assertEqual(index.layer_for_z(0.4), 1)
+        self.assertEqual(index.layer_for_z(5), 2)
+
+    def test_layers_from_moves(self):
+        path = self.write(PLAIN)
+        index = GCodeFileIndex.build(path)
+        self.assertEqual(list(index.layer_z), [0.3, 0.6])
+        self.assertEqual(list(index.layer_extrusion), [0.0, 5.0])
+        self.assertEqual(index.layer_offset(0), PLAIN.index("G1 Z0.3 F600"))
+        self.assertEqual(index.layer_offset(1), PLAIN.index("G1 Z0.6"))
+
+    def test_objects(self):
+        path = self.write(PRUSA)
+        index = GCodeFileIndex.build(path)
+        self.assertEqual(index.object_names, {0: "cube", 1: "cylinder"})
+        self.assertEqual(list(index.object_ids), [0, 1, -1, 0, 1, -1])
+        self.assertEqual(index.object_at(0), -1)
+        self.assertEqual(index.object_at(PRUSA.index("G1 X10 Y10")), 0)
+        self.assertEqual(index.object_at(PRUSA.index("G1 X20 Y20")), 1)
+        self.assertEqual(index.object_at(PRUSA.index("G1 Z10")), -1)
+
+        segments = index.object_segments(1)
+        self.assertEqual(len(segments), 2)
+        start, end = segments[0]
+        self.assertEqual(PRUSA[start:end], 'M486 S1 A"cylinder"\nG1 X20 Y10 E2.5\n')
+
+        # Skip the cancelled object
+        cube = PRUSA.index("G1 X10 Y20")
+        self.assertEqual(index.next_offset(cube, []), cube)
+        self.assertEqual(index.next_offset(cube, [0]), PRUSA.index("M486 S1\n"))
+        self.assertEqual(index.next_offset(cube, {0, 1}), PRUSA.rindex("M486 S-1"))
+
+    def test_compact_codes(self):
+        path = self.write(COMPACT)
+        index = GCodeFileIndex.build(path)
+        self.assertEqual(list(index.layer_z), [0.2, 0.4])
+        self.assertEqual(list(index.layer_extrusion), [0.0, 4.0])
+        self.assertEqual(index.object_names, {0: "Shape Box id:0 copy 0", 1: "part; with semicolon"})
+        self.assertEqual(list(index.object_ids), [0, 1])
+
+    def test_sidecar(self):
+        path = self.write(PRUSA)
+        index = GCodeFileIndex.load_or_build(path)
+        index_path = path + ".dsfidx"
+        self.assertTrue(os.path.exists(index_path))
+
+        loaded = GCodeFileIndex.load(index_path)
+        self.assertTrue(loaded.is_current(path))
+        for name in ("layer_offsets", "layer_z", "layer_extrusion", "object_offsets", "object_ids", "object_names"):
+            self.assertEqual(getattr(loaded, name), getattr(index, name), name)
+
+        # The index is rebuilt when the file changes
+        path = self.write(PLAIN)
+        os.utime(path, ns=(0, 0))
+        self.assertFalse(loaded.is_current(path))
+        self.assertEqual(list(GCodeFileIndex.load_or_build(path).layer_z), [0.3, 0.6])
+        self.assertTrue(GCodeFileIndex.load(index_path).is_current(path))
+
+        with open(index_path, "wb") as file:
+            file.write(b"DSFI")
+        with self.assertRaises(ValueError):
+            GCodeFileIndex.load(index_path)
+        self.assertEqual(GCodeFileIndex.load_or_build(path).num_layers, 2)
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from src.dsf.files import FileInfoCache, get_file_info
+
+CONTENT = ";Generated with Cura_SteamEngine 5.3.0\n;Layer height: 0.1\n;MAXZ:5.1\n;TIME:{}\nG1 Z0.1\nG1 X1 E1\n"
+
+
+class FileInfoCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for index in range(5):
+            path = os.path.join(self.directory.name, f"job{index}.gcode")
+            with open(path, "w") as file:
+                file.write(CONTENT.format(index))
+            self.paths.append(path)
+        self.loaded = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def loader(self, file_name, read_thumbnail_content):
+        self.loaded.append(file_name)
+        return get_file_info(file_name, read_thumbnail_content)
+
+    def test_invalidation(self):
+        cache = FileInfoCache(self.loader, max_entries=3)
+        self.assertEqual(cache.get_file_info(self.paths[0]).print_time, 0)
+        self.assertIs(cache.get_file_info(self.paths[0]), cache.get_file_info(self.paths[0]))
+        self.assertEqual(self.loaded, [self.paths[0]])
+
+        # Changing the file invalidates the entry
+        with open(self.paths[0], "w") as file:
+            file.write(CONTENT.format(1234))
+        self.assertEqual(cache.get_file_info(self.paths[0]).print_time, 1234)
+        # Thumbnail content has not been read yet
+        cache.get_file_info(self.paths[0], read_thumbnail_content=True)
+        self.assertEqual(len(self.loaded), 3)
+
+        # Least recently used entries are evicted
+        for path in self.paths:
+            cache.get_file_info(path)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 7)
+
+    def test_database(self):
+        database = os.path.join(self.directory.name, "cache.sqlite")
+        with FileInfoCache(self.loader, database=database) as cache:
+            infos = cache.get_file_infos(self.paths + [os.path.join(self.directory.name, "missing.gcode")])
+            self.assertEqual(list(infos), self.paths)
+            self.assertEqual(len(self.loaded), 5)
+
+        with FileInfoCache(self.loader, database=database) as cache:
+            infos = cache.get_file_infos(self.paths)
+            self.assertEqual([info.print_time for info in infos.values()], [0, 1, 2, 3, 4])
+            self.assertEqual(len(self.loaded), 5)
+            self.assertEqual(cache.stats()["database_hits"], 5)
+
+            cache.invalidate(self.paths[0])
+            cache.get_file_info(self.paths[0])
+            self.assertEqual(len(self.loaded), 6)
+
+    def test_local_analyzer(self):
+        cache = FileInfoCache()
+        infos = cache.get_file_infos(self.paths, max_workers=2)
+        self.assertEqual([info.print_time for info in infos.values()], [0, 1, 2, 3, 4])
+        cache.get_file_infos(self.paths)
+        self.assertEqual((cache.hits, cache.misses), (5, 5))
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from src.dsf import http
+from src.dsf.http import HttpEndpointConnection, HttpEndpointUnixSocket
+from src.dsf.object_model import HttpEndpointType
+
+REQUEST = b'{"sessionId": 1, "queries": {}, "headers": {}, "contentType": "text/plain", "body": ""}'
+
+
+async def echo_path(connection: HttpEndpointConnection):
+    request = await connection.read_request()
+    await connection.send_response(200, f"session {request.session_id}")
+
+
+def request(socket_file: str) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(5)
+        client.connect(socket_file)
+        client.sendall(REQUEST)
+        return json.loads(client.recv(4096))
+
+
+class HttpEndpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def socket_file(self, index: int = 0) -> str:
+        return os.path.join(self.directory.name, f"endpoint-{index}.sock")
+
+    def test_shared_loop(self):
+        threads = threading.active_count()
+        endpoints = [HttpEndpointUnixSocket(HttpEndpointType.GET, "test", f"path{index}", self.socket_file(index))
+                     for index in range(20)]
+        try:
+            # All endpoints are served by a single background thread
+            self.assertEqual(threading.active_count(), threads + 1)
+            self.assertEqual(len({endpoint.loop for endpoint in endpoints}), 1)
+            for endpoint in endpoints:
+                endpoint.set_endpoint_handler(echo_path)
+            for index in (0, 7, 19):
+                self.assertEqual(request(self.socket_file(index))["Response"], "session 1")
+
+            endpoints.pop().close()
+            self.assertFalse(os.path.exists(self.socket_file(19)))
+            self.assertEqual(request(self.socket_file(0))["StatusCode"], 200)
+        finally:
+            for endpoint in endpoints:
+                endpoint.close()
+        self.assertIsNone(http._shared_loop.loop)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_no_handler(self):
+        endpoint = HttpEndpointUnixSocket(HttpEndpointType.GET, "test", "path", self.socket_file())
+        try:
+            self.assertEqual(request(self.socket_file())["StatusCode"], 500)
+        finally:
+            endpoint.close()
+        # Closing twice does nothing
+        endpoint.close()
+
+    def test_socket_error(self):
+        with self.assertRaises(OSError):
+            HttpEndpointUnixSocket(HttpEndpointType.GET, "test", "path", os.path.join(self.directory.name, "x", "y"))
+        self.assertIsNone(http._shared_loop.loop)
+
+    def test_running_loop(self):
+        socket_file = self.socket_file()
+
+        async def main():
+            endpoint = HttpEndpointUnixSocket(HttpEndpointType.GET, "test", "path", socket_file)
+            self.assertIs(endpoint.loop, asyncio.get_running_loop())
+            await endpoint.wait_started()
+            endpoint.set_endpoint_handler(echo_path)
+
+            reader, writer = await asyncio.open_unix_connection(socket_file)
+            writer.write(REQUEST)
+            response = json.loads(await reader.read(4096))
+            writer.close()
+            endpoint.close()
+            return response
+
+        self.assertEqual(asyncio.run(main())["Response"], "session 1")
+        self.assertIsNone(http._shared_loop.loop)
+
+    def test_loop_of_caller(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            endpoint = HttpEndpointUnixSocket(HttpEndpointType.GET, "test", "path", self.socket_file(), loop=loop)
+            endpoint.set_endpoint_handler(echo_path)
+            self.assertEqual(request(self.socket_file())["Response"], "session 1")
+            endpoint.close()
+            self.assertIsNone(http._shared_loop.loop)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,81 @@
+import base64
+import os
+import tempfile
+import unittest
+
+from src.dsf.files import get_file_info, get_file_infos
+from src.dsf.object_model.job import ThumbnailInfoFormat
+
+THUMBNAIL = base64.b64encode(bytes(range(256)) * 3).decode("ascii")
+
+PRUSA_SLICER = (
+    "; generated by PrusaSlicer 2.6.0+linux on 2024-01-01 at 10:00:00 UTC\n;\n"
+    f"; thumbnail begin 16x16 {len(THUMBNAIL)}\n"
+    + "".join(f"; {THUMBNAIL[i:i + 78]}\n" for i in range(0, len(THUMBNAIL), 78))
+    + "; thumbnail end\n;\n\nG21\nG90\nG1 Z0.3 F720\nG1 X10 Y10 E1.5\n"
+    + "G1 Z0.5\nG1 X20 Y10 E2\n" * 2000
+    + "G1 Z12.3\nG1 X1 Y1 E1\nG1 Z20 F600 ; lift\nM84\n"
+    "; filament used [mm] = 1234.56, 10.5\n"
+    "; estimated printing time (normal mode) = 1h 2m 3s\n"
+    "; layer_height = 0.2\n; first_layer_height = 0.3\n"
+)
+
+CURA = (
+    ";FLAVOR:RepRap\n;TIME:4321\n;Filament used: 1.5m, 0.25m\n;Layer height: 0.1\n;MAXZ:5.1\n"
+    ";Generated with Cura_SteamEngine 5.3.0\n;LAYER_COUNT:51\nG1 Z0.1\nG1 X1 E1\n"
+)
+
+SIMPLIFY3D = (
+    "; G-Code generated by Simplify3D(R) Version 4.1.2\n;   layerHeight,0.25\nG1 Z0.25\nG1 X1 E1\nG1 Z2.5\n"
+    "G1 X2 E2\n;   Build time: 1 hour 20 minutes\n;   Filament length: 987.6 mm (0.99 m)\n"
+)
+
+
+class InfoParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = {}
+        for name, content in (("prusa", PRUSA_SLICER), ("cura", CURA), ("s3d", SIMPLIFY3D)):
+            self.paths[name] = os.path.join(self.directory.name, f"{name}.gcode")
+            with open(self.paths[name], "w") as file:
+                file.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_prusa_slicer(self):
+        info = get_file_info(self.paths["prusa"], read_thumbnail_content=True, header_size=1024, footer_size=1024)
+        self.assertEqual(info.generated_by, "PrusaSlicer 2.6.0+linux")
+        self.assertEqual(info.size, len(PRUSA_SLICER))
+        self.assertEqual(info.height, 12.3)
+        self.assertEqual(info.layer_height, 0.2)
+        self.assertEqual(info.num_layers, 61)
+        self.assertEqual(info.filament, [1234.56, 10.5])
+        self.assertEqual(info.print_time, 3723)
+
+        thumbnail, = info.thumbnails
+        self.assertEqual((thumbnail.format, thumbnail.width, thumbnail.height, thumbnail.size),
+                         (ThumbnailInfoFormat.PNG, 16, 16, len(THUMBNAIL)))
+        self.assertEqual(thumbnail.data, THUMBNAIL)
+        self.assertEqual(PRUSA_SLICER[thumbnail.offset:thumbnail.offset + 10], f"; {THUMBNAIL[:8]}")
+
+    def test_other_slicers(self):
+        info = get_file_info(self.paths["cura"])
+        self.assertEqual((info.generated_by, info.height, info.layer_height, info.num_layers, info.print_time),
+                         ("Cura_SteamEngine 5.3.0", 5.1, 0.1, 51, 4321))
+        self.assertEqual(info.filament, [1500, 250])
+        self.assertEqual(len(info.thumbnails), 0)
+
+        info = get_file_info(self.paths["s3d"])
+        self.assertEqual((info.generated_by, info.height, info.layer_height, info.num_layers, info.print_time),
+                         ("Simplify3D(R) Version 4.1.2", 2.5, 0.25, 10, 4800))
+        self.assertEqual(info.filament, [987.6])
+
+    def test_process_pool(self):
+        paths = [self.paths["cura"], os.path.join(self.directory.name, "missing.gcode"), self.paths["s3d"]]
+        results = list(get_file_infos(paths, max_workers=2, chunksize=1))
+        self.assertEqual([path for path, _ in results], paths)
+        self.assertEqual(results[0][1].layer_height, 0.1)
+        self.assertIsInstance(results[1][1], FileNotFoundError)
+        self.assertEqual(results[2][1].layer_height, 0.25)
@@ -0,0 +1,52 @@
+import importlib.util
+import json
+import unittest
+
+from src.dsf.commands import generic
+from src.dsf.commands.code_channel import CodeChannel
+from src.dsf.object_model import ObjectModel
+from src.dsf.utility import json_codec
+
+
+class JsonCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = json_codec.backend
+
+    def tearDown(self):
+        json_codec.use_backend(self.backend)
+
+    @staticmethod
+    def installed_backends():
+        return [name for name in json_codec.BACKENDS if name == "json" or importlib.util.find_spec(name) is not None]
+
+    def test_commands(self):
+        command = generic.simple_code("M115", CodeChannel.HTTP)
+        for name in self.installed_backends():
+            with self.subTest(backend=name):
+                json_codec.use_backend(name)
+                json_bytes = json_codec.dumps(command, default=lambda o: o.__dict__)
+                self.assertEqual(
+                    json_bytes,
+                    b'{"command":"SimpleCode","code":"M115","channel":"HTTP","executeAsynchronously":false}'
+                )
+                self.assertEqual(json_codec.loads(json_bytes)["channel"], "HTTP")
+                self.assertEqual(json_codec.loads(json_bytes.decode("utf8"))["code"], "M115")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            json_codec.use_backend("foobar")
+
+    def test_float_formatting(self):
+        model = ObjectModel.from_json('{"job":{"file":{"height":2,"layerHeight":0.2,"filament":[1.0,28081.97]}}}')
+        data = json.loads(str(model))
+        self.assertIn('"height": 2,', str(model))
+        self.assertIn('"filament": [1, 28081.97]', str(model))
+        self.assertEqual(data["job"]["file"]["layerHeight"], 0.2)
+        # The float formatting of the json module must not be altered process-wide
+        self.assertIsNotNone(json.encoder.c_make_encoder)
+        self.assertEqual(json.dumps(1.0), "1.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
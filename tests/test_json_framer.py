@@ -0,0 +1,92 @@
+import json
+import unittest
+
+from src.dsf.connections.json_framer import JsonFramer
+
+
+class JsonFramerTest(unittest.TestCase):
+
+    def test_single_object(self):
+        framer = JsonFramer()
+        framer.feed(b'{"success":true}')
+        self.assertEqual(framer.next_object(), b'{"success":true}')
+        self.assertIsNone(framer.next_object())
+        self.assertEqual(len(framer), 0)
+
+    def test_multiple_objects_in_one_chunk(self):
+        framer = JsonFramer()
+        framer.feed(b'{"a":1}\n{"b":{"c":2}} {"d"')
+        self.assertEqual(framer.next_object(), b'{"a":1}')
+        self.assertEqual(framer.next_object(), b'{"b":{"c":2}}')
+        self.assertIsNone(framer.next_object())
+        framer.feed(b':3}')
+        self.assertEqual(framer.next_object(), b'{"d":3}')
+
+    def test_braces_in_strings(self):
+        framer = JsonFramer()
+        payload = b'{"code":"echo \\"{\\"","comment":"}}}"}'
+        framer.feed(payload + b'{"success":true}')
+        self.assertEqual(framer.next_object(), payload)
+        self.assertEqual(json.loads(payload)["code"], 'echo "{"')
+        self.assertEqual(framer.next_object(), b'{"success":true}')
+
+    def test_byte_by_byte(self):
+        payload = json.dumps({"content": 'a \\"{" b', "nested": {"list": [{"x": "}"}, {}]}, "é": "ü"}).encode("utf8")
+        framer = JsonFramer()
+        objects = []
+        for i in range(len(payload)):
+            framer.feed(payload[i:i + 1])
+            json_object = framer.next_object()
+            if json_object is not None:
+                objects.append(json_object)
+        self.assertEqual(objects, [payload])
+
+    def test_large_object_in_chunks(self):
+        payload = json.dumps({"objects": [{"name": f"object {{{i}}}", "x": [i, i + 1]} for i in range(20000)]})
+        data = payload.encode("utf8") * 2
+        framer = JsonFramer()
+        objects = []
+        for i in range(0, len(data), 4096):
+            framer.feed(data[i:i + 4096])
+            json_object = framer.next_object()
+            while json_object is not None:
+                objects.append(json_object)
+                json_object = framer.next_object()
+        self.assertEqual(len(objects), 2)
+        self.assertEqual(json.loads(objects[1]), json.loads(payload))
+
+    def test_views_and_buffer_reuse(self):
+        framer = JsonFramer(16)
+        framer.feed(b' {"a":1}{"b":')
+        with framer.next_view() as view:
+            self.assertEqual(view.tobytes(), b'{"a":1}')
+        self.assertIsNone(framer.next_view())
+        # The pending data is moved to the front before the buffer is grown
+        framer.feed(b'"0123456789"}')
+        self.assertEqual(framer.capacity, 32)
+        self.assertEqual(framer.next_object(), b'{"b":"0123456789"}')
+        self.assertEqual(len(framer), 0)
+        framer.clear()
+        self.assertEqual(framer.capacity, 16)
+
+    def test_recv_into(self):
+        import socket
+
+        payload = json.dumps({"objects": [{"name": f"object {i}"} for i in range(5000)]}).encode("utf8")
+        left, right = socket.socketpair()
+        with left, right:
+            right.sendall(payload + b'{"success":true}')
+            right.close()
+            framer = JsonFramer(1024)
+            objects = []
+            while framer.recv_into(left, 1024):
+                view = framer.next_view()
+                while view is not None:
+                    with view:
+                        objects.append(json.loads(view.tobytes()))
+                    view = framer.next_view()
+        self.assertEqual(objects, [json.loads(payload), {"success": True}])
+
+
+if __name__ == '__main__':
+    unittest.main()
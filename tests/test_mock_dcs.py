@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+import unittest
+
+from src.dsf.commands.code import CodeType
+from src.dsf.connections import CommandConnection, InterceptConnection, InterceptionMode, \
+    InternalServerException, SubscribeConnection, SubscriptionMode
+from src.dsf.connections.exceptions import IncompatibleVersionException
+from src.dsf.object_model import MessageType
+from src.dsf.testing import apply_patch, make_code, MockCommandError, MockDcs, PatchGenerator
+
+MODEL = {
+    "heat": {"heaters": [{"current": 20.5, "active": 0}, {"current": 21.5, "active": 0}]},
+    "job": {"layer": 3, "filePosition": 1200},
+    "state": {"status": "idle", "upTime": 100},
+}
+
+
+class PatchGeneratorTest(unittest.TestCase):
+
+    def test_patches(self):
+        generator = PatchGenerator(MODEL, values_per_patch=3, seed=1)
+        self.assertEqual(generator.patches(5), PatchGenerator(MODEL, values_per_patch=3, seed=1).patches(5))
+
+        for patch in generator.patches(20):
+            heaters = patch.get("heat", {}).get("heaters")
+            if heaters is not None:
+                # Lists of objects are sent in full with empty objects for unchanged items
+                self.assertEqual(len(heaters), 2)
+            model = apply_patch(json.loads(json.dumps(MODEL)), patch)
+            self.assertEqual(model["state"]["status"], "idle")
+            self.assertEqual(len(model["heat"]["heaters"]), 2)
+
+
+class MockDcsTest(unittest.TestCase):
+
+    def test_command_mode(self):
+        def simple_code(command):
+            if command["code"] == "M999":
+                raise MockCommandError("InvalidOperationException", "not allowed")
+            return f"ok {command['code']}"
+
+        with MockDcs(model=MODEL, latency=0.01) as dcs:
+            dcs.set_handler("SimpleCode", simple_code)
+            connection = CommandConnection()
+            connection.connect(dcs.socket_file)
+            try:
+                started = time.monotonic()
+                self.assertEqual(connection.perform_simple_code("M115"), "ok M115")
+                self.assertGreaterEqual(time.monotonic() - started, 0.01)
+                with self.assertRaises(InternalServerException):
+                    connection.perform_simple_code("M999")
+                self.assertEqual(connection.get_object_model().job.layer, 3)
+                # Commands without handler succeed
+                connection.set_update_status(False)
+            finally:
+                connection.close()
+
+        self.assertEqual(dcs.received[0]["mode"], "Command")
+        self.assertEqual([message["command"] for message in dcs.received[1:]],
+                         ["SimpleCode", "SimpleCode", "GetObjectModel", "SetUpdateStatus"])
+
+    def test_subscribe_mode(self):
+        with MockDcs(model=MODEL, patches=lambda: PatchGenerator(MODEL, seed=2), patch_count=50,
+                     patch_rate=2000) as dcs:
+            connection = SubscribeConnection(SubscriptionMode.PATCH)
+            connection.connect(dcs.socket_file)
+            try:
+                started = time.monotonic()
+                for _ in range(51):
+                    connection.update_object_model()
+                # 50 patches at 2000 patches/s take at least 25ms
+                self.assertGreaterEqual(time.monotonic() - started, 0.024)
+            finally:
+                connection.close()
+
+            expected = json.loads(json.dumps(MODEL))
+            for patch in PatchGenerator(MODEL, seed=2).patches(50):
+                apply_patch(expected, patch)
+            self.assertEqual(connection.model.heat.heaters[1].current, expected["heat"]["heaters"][1]["current"])
+            self.assertEqual(connection.model.job.file_position, expected["job"]["filePosition"])
+            self.assertTrue(dcs.wait_for_clients(5))
+            self.assertEqual(dcs.acknowledged, 51)
+
+    def test_coalesced_subscription(self):
+        with MockDcs(model=MODEL, patches=lambda: PatchGenerator(MODEL, seed=3), patch_count=20) as dcs:
+            connection = SubscribeConnection(SubscriptionMode.PATCH)
+            connection.connect(dcs.socket_file)
+            try:
+                connection.update_object_model()
+                # The next update is only sent once the previous one has been acknowledged
+                counts = [connection.get_coalesced_object_model_patch()[1] for _ in range(20)]
+            finally:
+                connection.close()
+            self.assertTrue(dcs.wait_for_clients(5))
+
+        self.assertEqual(counts, [1] * 20)
+        self.assertEqual(dcs.acknowledged, 21)
+        self.assertEqual([message["command"] for message in dcs.received[1:]], ["Acknowledge"] * 21)
+
+    def test_full_subscription(self):
+        patches = [{"state": {"status": "busy"}}, {"heat": {"heaters": [{}, {"current": 80}]}}]
+        with MockDcs(model=MODEL, patches=patches) as dcs:
+            connection = SubscribeConnection(SubscriptionMode.FULL)
+            connection.connect(dcs.socket_file)
+            try:
+                models = [json.loads(connection.get_serialized_object_model()) for _ in range(3)]
+            finally:
+                connection.close()
+
+        self.assertEqual([model["state"]["status"] for model in models], ["idle", "busy", "busy"])
+        self.assertEqual(models[2]["heat"]["heaters"][1]["current"], 80)
+        self.assertEqual(MODEL["heat"]["heaters"][1]["current"], 21.5)
+
+    def test_intercept_mode(self):
+        codes = [make_code("M", 1234), make_code("G", 1), make_code("M", 5678, channel="HTTP")]
+        with MockDcs(codes=codes) as dcs:
+            connection = InterceptConnection(InterceptionMode.PRE, filters=["M1234", "M5678"])
+            connection.connect(dcs.socket_file)
+            try:
+                code = connection.receive_code()
+                self.assertEqual((code.type, code.majorNumber), (CodeType.MCode, 1234))
+                self.assertTrue(connection.flush(code.channel).result)
+                connection.resolve_code(MessageType.Warning, "done")
+                code = connection.receive_code()
+                self.assertEqual(code.majorNumber, 5678)
+                connection.ignore_code()
+            finally:
+                connection.close()
+            self.assertTrue(dcs.wait_for_clients(5))
+
+        self.assertEqual([message["command"] for message in dcs.resolutions], ["Resolve", "Ignore"])
+        self.assertEqual(dcs.resolutions[0]["content"], "done")
+
+    def test_handshake_errors(self):
+        with MockDcs(version=11) as dcs:
+            with self.assertRaises(IncompatibleVersionException):
+                CommandConnection().connect(dcs.socket_file)
+
+        with MockDcs(version=13) as dcs:
+            connection = CommandConnection()
+            connection.connect(dcs.socket_file)
+            connection.close()
+
+    def test_concurrent_subscribers(self):
+        with MockDcs(model=MODEL, patches=lambda: PatchGenerator(MODEL), patch_count=200) as dcs:
+            def subscribe():
+                connection = SubscribeConnection(SubscriptionMode.PATCH)
+                connection.connect(dcs.socket_file)
+                try:
+                    for _ in range(201):
+                        connection.update_object_model()
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=subscribe) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+            self.assertTrue(dcs.wait_for_clients(5))
+            self.assertEqual(dcs.acknowledged, 4 * 201)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,6 +27,38 @@ class Model(unittest.TestCase):
         self.assertEqual(model.boards[0].v_in.min, 19.3)
         self.assertEqual(model.boards[0].v_in.max, 19.4)
 
+    def test_changed_paths(self):
+        from src.dsf.object_model.model_patch import get_changed_paths
+
+        patch = {"heat": {"heaters": [{}, {"current": 21.5, "monitors": [{}, {"limit": 300}]}], "bedHeaters": [0, -1]},
+                 "job": {"file": None, "layers": [{}, {}, {"height": 0.4}]},
+                 "state": {"status": "busy"}}
+        self.assertEqual(get_changed_paths(patch), {"heat.heaters[1].current", "heat.heaters[1].monitors[1].limit",
+                                                    "heat.bedHeaters", "job.file", "job.layers[2].height",
+                                                    "state.status"})
+        self.assertEqual(get_changed_paths({"current": 20}, "heat.heaters[0]"), {"heat.heaters[0].current"})
+        self.assertEqual(get_changed_paths({}), set())
+
+    def test_merge_patch(self):
+        from src.dsf.object_model.model_patch import merge_patch
+
+        patches = ['{"heat":{"heaters":[{"current":20},{"current":21}]},"state":{"status":"idle"}}',
+                   '{"heat":{"heaters":[{},{"current":22,"active":200}]},"job":{"layer":1}}',
+                   '{"heat":{"heaters":[{"current":23},{}]},"state":{"status":"busy"},"job":{"layer":2}}']
+        merged = {}
+        for patch in patches:
+            merge_patch(merged, json.loads(patch))
+        self.assertEqual(merged, {"heat": {"heaters": [{"current": 23}, {"current": 22, "active": 200}]},
+                                  "state": {"status": "busy"}, "job": {"layer": 2}})
+
+        # Applying the merged patch is equivalent to applying the patches one after another
+        model = ObjectModel()
+        for patch in patches:
+            model.update_from_json(patch)
+        merged_model = ObjectModel()
+        merged_model.update_from_json(merged)
+        self.assertEqual(merged_model.to_json(), model.to_json())
+
     def test_http_endpoints(self):
         from src.dsf.object_model import HttpEndpointType
         model = ObjectModel()
@@ -135,6 +167,75 @@ class Model(unittest.TestCase):
         self.assertEqual(len(model.sensors.filament_monitors), 1)
         self.assertEqual(model.sensors.filament_monitors[0].type, FilamentMonitorType.Pulsed)
 
+    def test_slots(self):
+        from src.dsf.object_model.model_object import ModelObject
+
+        def subclasses(cls):
+            for subclass in cls.__subclasses__():
+                yield subclass
+                yield from subclasses(subclass)
+
+        # Model classes must declare their attributes in __slots__, otherwise every instance gets a __dict__
+        for cls in subclasses(ModelObject):
+            with self.subTest(cls=cls.__name__):
+                self.assertEqual(cls.__dictoffset__, 0)
+
+        model = ObjectModel.from_json('{"move":{"axes":[{"letter":"X","machinePosition":12.5}]}}')
+        self.assertFalse(hasattr(model.move.axes[0], "__dict__"))
+        self.assertEqual(json.loads(model.to_json())["move"]["axes"][0]["machinePosition"], 12.5)
+
+    def test_subscriptions(self):
+        model = ObjectModel()
+        changes = []
+
+        def on_change(path, value):
+            changes.append((path, value, model.state.status))
+
+        model.subscribe("state.status", on_change)
+        model.subscribe("move.axes[*].machinePosition", on_change)
+        model.subscribe("heat.heaters[1]", on_change)
+        model.subscribe("global.*", on_change)
+        model.subscribe("heat.bedHeaters[0]", on_change)
+        with self.assertRaises(ValueError):
+            model.subscribe("move..axes", on_change)
+
+        model.update_from_json('{"state":{"status":"busy"},"move":{"axes":[{"machinePosition":1},{},'
+                               '{"machinePosition":3,"userPosition":3}]},"heat":{"heaters":[{"current":20}]}}')
+        self.assertEqual(changes, [("state.status", "busy", "busy"), ("move.axes[0].machinePosition", 1, "busy"),
+                                   ("move.axes[2].machinePosition", 3, "busy")])
+
+        changes.clear()
+        model.update_from_json({"heat": {"heaters": [{}, {"current": 21}]}, "global": {"foo": 1}})
+        model.update_from_json({"heat": {"bedHeaters": [1, -1]}, "fans": []})
+        self.assertEqual(changes, [("heat.heaters[1]", {"current": 21}, "busy"), ("global.foo", 1, "busy"),
+                                   ("heat.bedHeaters", [1, -1], "busy")])
+        self.assertNotIn("subscriptions", json.loads(model.to_json()))
+
+        changes.clear()
+        model.unsubscribe("state.status", on_change)
+        model.update_from_json({"state": {"status": "idle"}})
+        self.assertEqual(changes, [])
+        with self.assertRaises(ValueError):
+            model.unsubscribe("state.status", on_change)
+
+    def test_subscriptions_patch(self):
+        model = ObjectModel()
+        subscriptions = model.subscriptions
+        changes = []
+        model.subscribe("state.status", lambda path, value: changes.append(value))
+
+        # Patches must not replace the registry of the callbacks
+        model.update_from_json({"subscriptions": {"x": 1}, "state": {"status": "busy"}})
+        model.update_from_json('{"subscriptions": null, "_subscriptions": []}')
+        self.assertIs(model.subscriptions, subscriptions)
+        model.update_from_json({"state": {"status": "idle"}})
+        self.assertEqual(changes, ["busy", "idle"])
+
+        # The callbacks can be passed on to a new model
+        model = ObjectModel(subscriptions)
+        model.update_from_json({"state": {"status": "paused"}})
+        self.assertEqual(changes, ["busy", "idle", "paused"])
+
     def test_user_sessions(self):
         from src.dsf.object_model import AccessLevel, SessionType
 
@@ -1,9 +1,7 @@
-import threading
-import os
-import pathlib
-import socket
-import time
 import importlib.util
+import pathlib
+
+from src.dsf.testing import MockDcs
 
 here = pathlib.Path(__file__).parent.parent.resolve()
 example_path = here / "examples/send_simple_code.py"
@@ -13,34 +11,16 @@ send_simple_code = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(send_simple_code)
 
 
-def test_send_simple_code(monkeypatch, tmp_path):
-    mock_dcs_socket_file = os.path.join(tmp_path, "dsf.socket")
-    monkeypatch.setattr(
-        "dsf.connections.CommandConnection.connect.__defaults__",
-        (mock_dcs_socket_file,),
-    )
-
-    dcs_passed = threading.Event()
-
-    def mock_dcs():
-        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        server.bind(mock_dcs_socket_file)
-        server.listen(1)
-        conn, _ = server.accept()
-        conn.sendall('{"version":11, "id":"foobar"}'.encode())
-        assert conn.recv(1024) == b'{"mode":"Command","version":11}'
-        conn.sendall('{"success":true}'.encode())
-        assert conn.recv(1024) == b'{"command":"SimpleCode","Code":"M115","Channel":"SBC"}'
-        conn.sendall('{"result":"fake code executed", "success":true}'.encode())
-        conn.close()
-        dcs_passed.set()  # indicate that all asserts passed and the mock_dcs is shutting down
-
-    thread = threading.Thread(target=mock_dcs, daemon=True)
-    thread.start()
-    time.sleep(1)
-
-    send_simple_code.send_simple_code()
-
-    thread.join()
+def test_send_simple_code(monkeypatch):
+    with MockDcs() as dcs:
+        dcs.set_handler("SimpleCode", lambda command: "fake code executed")
+        monkeypatch.setattr(
+            "dsf.connections.CommandConnection.connect.__defaults__",
+            (dcs.socket_file,),
+        )
+        send_simple_code.send_simple_code()
+        assert dcs.wait_for_clients(5)
 
-    assert dcs_passed.is_set()
+    assert dcs.received[0] == {"mode": "Command", "version": 12}
+    assert dcs.received[1] == {"command": "SimpleCode", "code": "M115", "channel": "SBC",
+                               "executeAsynchronously": False}
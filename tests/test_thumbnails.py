@@ -0,0 +1,57 @@
+import base64
+import os
+import tempfile
+import unittest
+
+from src.dsf.files import get_file_info, read_thumbnail, ThumbnailCache
+from src.dsf.object_model.job import ThumbnailInfoFormat
+
+PNG = bytes(range(256)) * 40
+JPEG = b"\xff\xd8" + bytes(range(100)) * 3
+
+
+def thumbnail_block(kind: str, image: bytes) -> str:
+    data = base64.b64encode(image).decode("ascii")
+    lines = "".join(f"; {data[i:i + 78]}\n" for i in range(0, len(data), 78))
+    return f"; {kind} begin 32x24 {len(data)}\n{lines}; {kind} end\n;\n"
+
+
+class ThumbnailsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "job.gcode")
+        with open(self.path, "w") as file:
+            file.write("; generated by PrusaSlicer 2.6.0\n;\n" + thumbnail_block("thumbnail", PNG)
+                       + thumbnail_block("thumbnail_JPG", JPEG) + "G1 Z0.2\nG1 X1 E1\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_thumbnail(self):
+        png, jpeg = get_file_info(self.path).thumbnails
+        self.assertIsNone(png.data)
+        self.assertEqual(jpeg.format, ThumbnailInfoFormat.JPEG)
+        self.assertEqual(read_thumbnail(self.path, png), PNG)
+        self.assertEqual(read_thumbnail(self.path, jpeg), JPEG)
+
+        png.size += 4
+        with self.assertRaises(ValueError):
+            read_thumbnail(self.path, png)
+
+    def test_cache(self):
+        cache = ThumbnailCache(os.path.join(self.directory.name, "thumbnails"))
+        png, jpeg = get_file_info(self.path).thumbnails
+        self.assertEqual(cache.get(self.path, png), PNG)
+        self.assertTrue(cache.get_path(self.path, jpeg).endswith(".jpg"))
+        self.assertEqual(cache.get(self.path, png), PNG)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        # Images of modified files are read again
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertEqual(cache.get(self.path, png), PNG)
+        self.assertEqual(cache.misses, 3)
+
+        cache.clear()
+        self.assertEqual(os.listdir(cache.directory), [])